@@ -0,0 +1,107 @@
+# backend/cache.py
+"""In-process TTL + LRU cache for read-heavy JSON endpoints (/jobs, /stats).
+
+Entries are invalidated wholesale whenever job_post is written through this
+process (create/delete endpoints, repo.upsert_jobs, repo.deactivate_*).
+Writers in other processes (CLI crawlers) are only picked up once the TTL
+expires, so keep RESPONSE_CACHE_TTL short.
+"""
+import os, time, hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from starlette.requests import Request
+from starlette.responses import Response
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires: float
+    headers: dict = field(default_factory=dict)
+
+class ResponseCache:
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        # bumped on every invalidation so in-flight builds can't store stale data
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, body: bytes, headers: dict | None = None, generation: int | None = None) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            etag='"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+            expires=time.monotonic() + self.ttl,
+            headers=headers or {},
+        )
+        if self.maxsize <= 0 or (generation is not None and generation != self.generation):
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self):
+        self.generation += 1
+        self.invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+response_cache = ResponseCache()
+
+def cache_key(name: str, **params) -> str:
+    """Key on the parsed endpoint parameters, so `?page=1` and `` share an entry."""
+    return name + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params) if params[k] is not None)
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+async def cached_json(request: Request, key: str, build) -> Response:
+    """Serve `key` from the cache, or await build() -> (json_bytes, headers) and store it.
+
+    Answers 304 when the client's If-None-Match matches the entry's ETag.
+    """
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
+        body, headers = await build()
+        entry = response_cache.set(key, body, headers, generation=generation)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", **entry.headers}
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,92 @@
+# backend/crawl.py
+"""Crawl lifecycle: record each ingest run and retire the jobs it stops seeing.
+
+    async with Crawl("JSearch", query="python developer") as crawl:
+        crawl.record(await repo.upsert_jobs(session, rows))
+        await crawl.touch(known_hash_keys)
+
+Entering inserts a crawl_run row and keeps its started_at, taken from the
+database clock that also sets last_seen. Upserts already bump last_seen;
+touch() bumps it for jobs the crawler skipped because they were already
+stored, with one UPDATE per batch. When a *full* crawl (one that saw
+everything the source currently lists) exits cleanly, a single indexed UPDATE
+deactivates the source's rows with last_seen < started_at. Partial crawls
+(search queries) can't tell a delisted job from one they didn't ask for, so
+they expire by age instead: with `expire_after`, a clean exit deactivates the
+source's rows not seen within that interval. An email sync does neither.
+
+A crawl that raised, or that reported errors with error() (a page that
+failed, a record that didn't parse), is recorded as failed and never
+deactivates anything: it may not have seen what it would retire.
+"""
+import os, traceback
+from datetime import timedelta
+
+from backend.db import async_sessionmaker
+from backend import repo
+
+# search-query crawls retire a source's jobs not seen for this long
+CRAWL_EXPIRE_DAYS = float(os.getenv("CRAWL_EXPIRE_DAYS", "14"))
+
+class Crawl:
+    def __init__(self, source: str, query: str | None = None, full: bool = False,
+                 expire_after: timedelta | None = None):
+        self.source = source
+        self.query = query
+        self.full = full
+        self.expire_after = expire_after
+        self.run_id = None
+        self.started_at = None
+        self.errors: list[str] = []
+        self.counts = {"rows_seen": 0, "rows_inserted": 0, "rows_updated": 0,
+                       "rows_touched": 0, "rows_deactivated": 0}
+
+    async def __aenter__(self):
+        async with async_sessionmaker() as session:
+            self.run_id, self.started_at = await repo.start_crawl_run(session, self.source, self.query, self.full)
+        return self
+
+    def record(self, written):
+        """Count the (id, hash_key, inserted) rows returned by repo.upsert_jobs."""
+        inserted = sum(1 for r in written if r.inserted)
+        self.counts["rows_seen"] += len(written)
+        self.counts["rows_inserted"] += inserted
+        self.counts["rows_updated"] += len(written) - inserted
+
+    def error(self, message: str):
+        """Note a part of the crawl that failed; the run is then recorded as failed."""
+        self.errors.append(message)
+
+    async def touch(self, hash_keys) -> int:
+        """Bump last_seen for stored jobs seen but not re-upserted in this crawl."""
+        hash_keys = list(hash_keys)
+        if not hash_keys:
+            return 0
+        async with async_sessionmaker() as session:
+            touched = await repo.touch_last_seen(session, hash_keys)
+        self.counts["rows_seen"] += len(hash_keys)
+        self.counts["rows_touched"] += touched
+        return touched
+
+    async def __aexit__(self, exc_type, exc, tb):
+        status, error = "succeeded", None
+        if exc is not None:
+            status, error = "failed", "".join(traceback.format_exception_only(exc_type, exc)).strip()
+        elif self.errors:
+            status = "failed"
+            error = f"{len(self.errors)} errors, first: {self.errors[0]}"
+            if self.full or self.expire_after:
+                print(f"Crawl of {self.source} had {len(self.errors)} errors; not deactivating anything.")
+        elif (self.full or self.expire_after) and self.counts["rows_seen"] == 0:
+            # an empty result is far more likely an upstream outage than an empty source
+            print(f"Crawl of {self.source} saw no jobs; not deactivating anything.")
+        elif self.full or self.expire_after:
+            cutoff = self.started_at if self.full else self.started_at - self.expire_after
+            async with async_sessionmaker() as session:
+                self.counts["rows_deactivated"] = await repo.deactivate_missing_for_source(
+                    session, self.source, cutoff)
+            print(f"Deactivated {self.counts['rows_deactivated']} {self.source} jobs not seen since {cutoff}.")
+
+        async with async_sessionmaker() as session:
+            await repo.finish_crawl_run(session, self.run_id, status, self.counts, error)
+        return False
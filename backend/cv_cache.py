@@ -0,0 +1,88 @@
+# backend/cv_cache.py
+"""Content-addressed on-disk cache for CV text extraction and LLM title inference.
+
+Keys are SHA-256 digests: of the PDF bytes for extracted text, and of
+(text, model, prompt, temperature) for job titles, so a re-uploaded resume
+skips both PyPDF2 and the LLM call. The directory is bounded by
+CV_CACHE_MAX_BYTES and evicts least recently used entries first (reads
+refresh an entry's mtime). Text and titles live in separate
+subdirectories, each with its own bound and hit/miss counters.
+"""
+import os, json, time, hashlib, tempfile
+from pathlib import Path
+
+CV_CACHE_DIR = Path(os.getenv("CV_CACHE_DIR", str(Path(__file__).parent / ".cache" / "cv")))
+CV_CACHE_MAX_BYTES = int(os.getenv("CV_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def pdf_key(pdf_bytes: bytes) -> str:
+    return sha256_hex(pdf_bytes)
+
+def title_key(text: str, model: str, prompt: str, temperature: float) -> str:
+    parts = json.dumps([text, model, prompt, temperature], ensure_ascii=False)
+    return sha256_hex(parts.encode("utf-8"))
+
+class DiskCache:
+    def __init__(self, directory: Path, max_bytes: int = CV_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # LRU: mark as recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_seconds += entry.get("seconds", 0.0)
+        return entry["value"]
+
+    def set(self, key: str, value: str, seconds: float):
+        """Store `value`, which took `seconds` to compute (reported as time saved on hits)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"value": value, "seconds": round(seconds, 4), "created_at": time.time()})
+        # write-then-rename so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        files = []
+        with os.scandir(self.directory) as it:
+            for de in it:
+                if de.name.endswith(".json"):
+                    st = de.stat()
+                    files.append((st.st_mtime, st.st_size, de.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+text_cache = DiskCache(CV_CACHE_DIR / "text")
+title_cache = DiskCache(CV_CACHE_DIR / "title")
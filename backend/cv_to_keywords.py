@@ -1,8 +1,6 @@
 import sys
-import os
 import json
-import httpx
-import PyPDF2
+import time
 import asyncio
 from pathlib import Path
 
@@ -10,47 +8,97 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parents[1]
 sys.path.append(str(project_root))
 
-from backend.rapidapi_jobs import search_jobs
+from backend.extract_cv_text import extract_text, PDFExtractionError
+from backend.cv_cache import text_cache, title_cache, pdf_key, title_key
 
-LMSTUDIO_URL = "http://localhost:1234/v1/chat/completions"
+UPLOAD_DIR = project_root / "frontend" / "uploads"
+
+SYSTEM_PROMPT = "You are an expert HR assistant. Your task is to extract the most likely job title from the provided CV. Respond with only the job title and nothing else."
+TEMPERATURE = 0.2
 
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extracts text from a PDF file."""
     try:
-        with open(pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            text = "".join(page.extract_text() for page in reader.pages)
-        return text
-    except Exception as e:
+        return extract_text(pdf_path)
+    except (OSError, PDFExtractionError) as e:
         print(f"Error reading PDF: {e}", file=sys.stderr)
         return ""
 
-def get_job_title_from_lmstudio(cv_text: str) -> str:
+async def get_job_titles_from_lmstudio(cv_texts: list[str]) -> list[str]:
+    """Asks LM Studio for each CV's job title, concurrently; "" where a call fails.
+
+    Goes through the shared client in backend/llm_client.py, which pools the
+    connection, caps concurrent requests and truncates long CVs."""
+    from backend.llm_client import get_llm_client, LLMError
+
+    client = get_llm_client()
+    results = await client.complete_many(SYSTEM_PROMPT, cv_texts, TEMPERATURE)
+    titles = []
+    for result in results:
+        if isinstance(result, LLMError):
+            print(f"Error calling LMStudio: {result}. Is LMStudio running at {client.url}?", file=sys.stderr)
+            titles.append("")
+        else:
+            titles.append(result.text.strip())
+    return titles
+
+async def get_job_title_from_lmstudio(cv_text: str) -> str:
     """Sends CV text to LMStudio to extract a job title."""
     if not cv_text:
         return ""
+    return (await get_job_titles_from_lmstudio([cv_text]))[0]
 
+def extract_text_cached(pdf_path: str) -> str:
+    """extract_text_from_pdf, keyed by the SHA-256 of the PDF bytes."""
     try:
-        client = httpx.Client()
-        payload = {
-            "model": "mistralai/mistral-7b-instruct-v0.3",
-            "messages": [
-                {"role": "system", "content": "You are an expert HR assistant. Your task is to extract the most likely job title from the provided CV. Respond with only the job title and nothing else."},
-                {"role": "user", "content": cv_text}
-            ],
-            "temperature": 0.2,
-        }
-        response = client.post(LMSTUDIO_URL, json=payload, timeout=120)
-        response.raise_for_status()
-        data = response.json()
-        job_title = data['choices'][0]['message']['content'].strip()
-        return job_title
-    except httpx.RequestError as e:
-        print(f"Error calling LMStudio: {e}. Is LMStudio running at {LMSTUDIO_URL}?", file=sys.stderr)
-        return ""
-    except Exception as e:
-        print(f"An error occurred while processing LMStudio response: {e}", file=sys.stderr)
+        key = pdf_key(Path(pdf_path).read_bytes())
+    except OSError as e:
+        print(f"Error reading PDF: {e}", file=sys.stderr)
         return ""
+    text = text_cache.get(key)
+    if text is not None:
+        print(f"CV text cache hit: {text_cache.stats()}", file=sys.stderr)
+        return text
+    t0 = time.perf_counter()
+    text = extract_text_from_pdf(pdf_path)
+    if text:
+        text_cache.set(key, text, time.perf_counter() - t0)
+    return text
+
+def _title_key(cv_text: str) -> str:
+    from backend.llm_client import LMSTUDIO_MODEL, truncate_to_budget
+
+    # keyed by what is actually sent, so changing LLM_MAX_INPUT_TOKENS invalidates long CVs only
+    return title_key(truncate_to_budget(cv_text)[0], LMSTUDIO_MODEL, SYSTEM_PROMPT, TEMPERATURE)
+
+async def get_job_titles_cached(cv_texts: list[str]) -> list[str]:
+    """get_job_titles_from_lmstudio, keyed by (text, model, prompt, temperature);
+    only the cache misses go to the LLM."""
+    titles = [""] * len(cv_texts)
+    keys = {}
+    for i, cv_text in enumerate(cv_texts):
+        if not cv_text:
+            continue
+        key = _title_key(cv_text)
+        job_title = await asyncio.to_thread(title_cache.get, key)
+        if job_title is not None:
+            print(f"Job title cache hit: {title_cache.stats()}", file=sys.stderr)
+            titles[i] = job_title
+        else:
+            keys[i] = key
+    if keys:
+        t0 = time.perf_counter()
+        inferred = await get_job_titles_from_lmstudio([cv_texts[i] for i in keys])
+        seconds = (time.perf_counter() - t0) / len(keys)
+        for (i, key), job_title in zip(keys.items(), inferred):
+            titles[i] = job_title
+            if job_title:
+                await asyncio.to_thread(title_cache.set, key, job_title, seconds)
+    return titles
+
+async def get_job_title_cached(cv_text: str) -> str:
+    """get_job_title_from_lmstudio with the title cache."""
+    return (await get_job_titles_cached([cv_text]))[0]
 
 async def main():
     if len(sys.argv) < 2:
@@ -59,17 +107,21 @@ async def main():
 
     filename = sys.argv[1]
     # The file is saved by Next.js in `frontend/uploads`
-    cv_path = project_root / "frontend" / "uploads" / filename
+    cv_path = UPLOAD_DIR / filename
 
     print(f"Processing CV: {cv_path}")
-    cv_text = extract_text_from_pdf(str(cv_path))
+    cv_text = extract_text_cached(str(cv_path))
     
     if not cv_text:
         print("Could not extract text from CV.", file=sys.stderr)
         sys.exit(1)
 
     print("Extracting job title from CV using LMStudio...")
-    job_title = get_job_title_from_lmstudio(cv_text)
+    from backend.llm_client import close_llm_client
+    try:
+        job_title = await get_job_title_cached(cv_text)
+    finally:
+        await close_llm_client()
 
     if not job_title:
         print("Could not determine job title from CV.", file=sys.stderr)
@@ -79,6 +131,7 @@ async def main():
     
     # Use the extracted job title to search for jobs
     # The search_jobs function will save the results to the database
+    from backend.rapidapi_jobs import search_jobs
     await search_jobs(query=job_title, num_pages=1)
 
     print(json.dumps({"success": True, "message": f"Job search for '{job_title}' completed successfully."}))
@@ -0,0 +1,183 @@
+# backend/cv_worker.py
+"""Long-lived CV processing worker for the API process.
+
+Replaces spawning `python -m backend.cv_to_keywords` per upload: the PDF
+parser, LM Studio client and JSearch/DB clients stay warm between uploads.
+POST /cv enqueues a job and returns its id at once. GET /cv/jobs/{id} polls
+its status, and GET /cv/jobs/{id}/events streams every status change.
+At most CV_QUEUE_MAX uploads wait at once; the uploaded PDF is deleted as
+soon as its job finishes.
+"""
+import os, asyncio, time, uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+CV_WORKER_CONCURRENCY = int(os.getenv("CV_WORKER_CONCURRENCY", "2"))
+CV_QUEUE_MAX = int(os.getenv("CV_QUEUE_MAX", "20"))  # waiting uploads; more are refused
+CV_JOB_RETENTION = float(os.getenv("CV_JOB_RETENTION", "3600"))  # seconds to keep finished jobs
+CV_SEARCH_PAGES = int(os.getenv("CV_SEARCH_PAGES", "1"))
+CV_MATCH = os.getenv("CV_MATCH", "1") == "1"  # rank stored jobs against each CV (backend/matching.py)
+
+FINISHED = ("done", "failed")
+
+@dataclass
+class CVJob:
+    id: str
+    filename: str
+    status: str = "queued"  # queued -> extracting -> inferring -> searching -> matching -> done | failed
+    job_title: str | None = None
+    cv_id: str | None = None  # sha256 of the PDF; GET /matches/{cv_id}
+    message: str | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    timings: dict = field(default_factory=dict)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "job_title": self.job_title,
+            "cv_id": self.cv_id,
+            "message": self.message,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "timings": self.timings,
+        }
+
+    def update(self, **changes):
+        for k, v in changes.items():
+            setattr(self, k, v)
+        self.updated_at = time.time()
+        # wake everyone waiting on this job, then arm a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+class CVWorker:
+    def __init__(self, concurrency: int = CV_WORKER_CONCURRENCY, max_queued: int = CV_QUEUE_MAX):
+        self.concurrency = concurrency
+        self.jobs: dict[str, CVJob] = {}
+        self._queue: asyncio.Queue[CVJob] = asyncio.Queue(maxsize=max_queued)
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._loop()) for _ in range(self.concurrency)]
+        # Pay the heavy imports once, in the background, instead of on the first upload
+        self._tasks.append(asyncio.create_task(asyncio.to_thread(self._warm_up)))
+
+    @staticmethod
+    def _warm_up():
+        try:
+            import PyPDF2, httpx  # noqa: F401
+            from backend import cv_to_keywords, llm_client, rapidapi_jobs  # noqa: F401
+        except Exception as e:
+            print(f"CV worker: warm-up import failed, uploads will fail until fixed: {e}")
+
+    async def stop(self):
+        from backend.llm_client import close_llm_client
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await close_llm_client()
+
+    async def submit(self, filename: str, data: bytes) -> CVJob:
+        """Queue a CV. Raises asyncio.QueueFull when CV_QUEUE_MAX uploads are already waiting."""
+        self._expire()
+        if self._queue.full():
+            raise asyncio.QueueFull
+        job = CVJob(id=uuid.uuid4().hex, filename=Path(filename).name or "cv.pdf")
+        path = self._upload_path(job)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(path.write_bytes, data)
+        try:
+            self._queue.put_nowait(job)  # the queue may have filled while the file was written
+        except asyncio.QueueFull:
+            path.unlink(missing_ok=True)
+            raise
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> CVJob | None:
+        return self.jobs.get(job_id)
+
+    async def events(self, job_id: str):
+        """Yields a snapshot now and after every change until the job finishes."""
+        job = self.jobs[job_id]
+        while True:
+            changed = job._changed
+            yield job.snapshot()
+            if job.status in FINISHED:
+                return
+            await changed.wait()
+
+    @staticmethod
+    def _upload_path(job: CVJob) -> Path:
+        from backend.cv_to_keywords import UPLOAD_DIR
+
+        return UPLOAD_DIR / f"{job.id}_{job.filename}"
+
+    def _expire(self):
+        cutoff = time.time() - CV_JOB_RETENTION
+        for job in [j for j in self.jobs.values() if j.status in FINISHED and j.updated_at < cutoff]:
+            del self.jobs[job.id]
+            self._upload_path(job).unlink(missing_ok=True)  # normally already gone, see _loop
+
+    async def _loop(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+            except Exception as e:
+                job.update(status="failed", error=str(e))
+            finally:
+                self._upload_path(job).unlink(missing_ok=True)
+                self._queue.task_done()
+
+    async def _process(self, job: CVJob):
+        from backend.cv_to_keywords import extract_text_cached, get_job_title_cached
+        from backend.cv_cache import pdf_key
+        from backend.rapidapi_jobs import search_jobs
+
+        path = self._upload_path(job)
+        t0 = time.perf_counter()
+        job.update(status="extracting", cv_id=pdf_key(await asyncio.to_thread(path.read_bytes)))
+        cv_text = await asyncio.to_thread(extract_text_cached, str(path))
+        job.timings["extract_seconds"] = round(time.perf_counter() - t0, 3)
+        if not cv_text:
+            job.update(status="failed", error="Could not extract text from CV.")
+            return
+
+        t0 = time.perf_counter()
+        job.update(status="inferring")
+        job_title = await get_job_title_cached(cv_text)
+        job.timings["llm_seconds"] = round(time.perf_counter() - t0, 3)
+        if not job_title:
+            job.update(status="failed", error="Could not determine job title from CV.")
+            return
+
+        t0 = time.perf_counter()
+        job.update(status="searching", job_title=job_title)
+        stats = await search_jobs(query=job_title, num_pages=CV_SEARCH_PAGES)
+        job.timings["search_seconds"] = round(time.perf_counter() - t0, 3)
+        message = f"Job search for '{job_title}' completed successfully: {stats.jobs_saved} new jobs."
+
+        if CV_MATCH:
+            from backend.matching import match_cv
+
+            t0 = time.perf_counter()
+            job.update(status="matching")
+            try:
+                matches = await match_cv(job.cv_id, cv_text)
+                message += f" {len(matches)} matches ranked."
+            except Exception as e:
+                # the search results are still useful without a ranking
+                print(f"CV worker: matching failed for {job.id}: {e}")
+            job.timings["match_seconds"] = round(time.perf_counter() - t0, 3)
+        job.update(status="done", message=message)
+
+cv_worker = CVWorker()
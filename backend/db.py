@@ -1,23 +1,22 @@
 # backend/db.py
-import os, ssl
+"""Engine, sessions and the declarative Base.
+
+Nothing connects, and nothing requires DATABASE_URL, until the first session
+or get_engine() call, so helpers and CLIs that never touch the database
+import without one. `engine` is still importable (module __getattr__).
+"""
+import os, ssl, time, uuid
 from pathlib import Path
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event, exc
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 
 # Load .env next to this file (works with uvicorn --reload)
 env_path = Path(__file__).parent / ".env"
 load_dotenv(env_path, override=True)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise RuntimeError(f"DATABASE_URL missing. Expected .env at {env_path}")
-
-# ---- Secure SSL context (verify certs, check hostname) ----
-ssl_ctx = ssl.create_default_context()
-ssl_ctx.check_hostname = False
-ssl_ctx.verify_mode = ssl.CERT_NONE
 
 # ---- Declarative base ----
 class Base(DeclarativeBase):
@@ -27,21 +26,161 @@ class Base(DeclarativeBase):
 # This ensures models are registered with the Base.metadata
 from backend import models # noqa
 
-# ---- Async engine (PgBouncer transaction pooler safe) ----
-# Re-enabling echo to see all SQL commands
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-    connect_args={
-        "ssl": ssl_ctx,
-        "statement_cache_size": 0,
-        "prepared_statement_cache_size": 0
-    },
-    pool_pre_ping=True,
-    poolclass=NullPool
-)
-
-AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+# ---- Engine profile ----
+# pgbouncer-transaction: behind a transaction pooler (e.g. Supabase :6543), so
+#                        no server-side prepared statement reuse
+# direct:                straight to Postgres, asyncpg statement cache on
+# dev:                   direct + SQL echo and a small pool
+DB_PROFILE = os.getenv("DB_PROFILE", "pgbouncer-transaction")
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+DB_ECHO = _env_flag("DB_ECHO", DB_PROFILE == "dev")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "2" if DB_PROFILE == "dev" else "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5" if DB_PROFILE == "dev" else "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", True)
+# DB_POOL_SIZE=0 falls back to one connection per checkout (the old behaviour)
+DB_USE_POOL = DB_POOL_SIZE > 0
+
+class PoolStats:
+    """Counters for pool checkouts; read through pool_status()."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.connect_seconds_total = 0.0
+
+    def record_checkout(self, seconds: float):
+        self.checkouts += 1
+        self.checkout_seconds_total += seconds
+        self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+
+pool_stats = PoolStats()
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that times each checkout through the public Pool.connect().
+
+    A checkout covers waiting for a free slot, opening a new connection when
+    the pool grows, and the pre-ping; connect_seconds (timed by the engine's
+    do_connect/connect events) is the part spent opening connections.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        finally:
+            pool_stats.record_checkout(time.perf_counter() - start)
+
+# ---- Async engine (created on first use) ----
+_engine = None
+_session_factory = None
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = _create_engine()
+    return _engine
+
+def _create_engine():
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from backend.metrics import instrument_engine
+
+    if not DATABASE_URL:
+        raise RuntimeError(f"DATABASE_URL missing. Expected .env at {env_path}")
+    if DB_PROFILE not in ("pgbouncer-transaction", "direct", "dev"):
+        raise RuntimeError(f"Unknown DB_PROFILE {DB_PROFILE!r}")
+
+    # ---- SSL context (encrypted, certificate not verified) ----
+    ssl_ctx = ssl.create_default_context()
+    ssl_ctx.check_hostname = False
+    ssl_ctx.verify_mode = ssl.CERT_NONE
+
+    connect_args = {"ssl": ssl_ctx}
+    if DB_PROFILE == "pgbouncer-transaction":
+        connect_args.update({
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # unique names so statements never collide on a shared server connection
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        })
+
+    pool_args = dict(
+        poolclass=TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    ) if DB_USE_POOL else dict(poolclass=NullPool)
+
+    engine = create_async_engine(
+        DATABASE_URL,
+        echo=DB_ECHO,
+        connect_args=connect_args,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        **pool_args,
+    )
+
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def _start_connect(dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _count_connect(dbapi_connection, connection_record):
+        pool_stats.connects += 1
+        started = connection_record.info.pop("connect_started", None)
+        if started is not None:
+            pool_stats.connect_seconds_total += time.perf_counter() - started
+
+    # Per-statement timing and the slow-query log (GET /metrics)
+    instrument_engine(engine)
+    return engine
+
+def __getattr__(name):
+    # `from backend.db import engine` keeps working, without creating it at import
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def pool_status() -> dict:
+    """Pool gauges and checkout timings, for /poolz and metrics."""
+    pool = get_engine().sync_engine.pool
+    status = {
+        "profile": DB_PROFILE,
+        "pool": type(pool).__name__,
+        "checkouts": pool_stats.checkouts,
+        "connects": pool_stats.connects,
+        "timeouts": pool_stats.timeouts,
+        "checkout_seconds_total": round(pool_stats.checkout_seconds_total, 6),
+        "checkout_seconds_max": round(pool_stats.checkout_seconds_max, 6),
+        "connect_seconds_total": round(pool_stats.connect_seconds_total, 6),
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    return status
+
+def AsyncSessionLocal(**kw):
+    """A new AsyncSession on the shared engine (the sessionmaker is built on first call)."""
+    global _session_factory
+    if _session_factory is None:
+        from sqlalchemy.ext.asyncio import AsyncSession
+        _session_factory = sessionmaker(bind=get_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _session_factory(**kw)
+
 async_sessionmaker = AsyncSessionLocal
 
 # FastAPI dependency
@@ -55,7 +194,7 @@ async def reset_database():
     from backend.models import JobPost
     print(f"--- Resetting database at URL: {DATABASE_URL} ---")
     try:
-        async with engine.begin() as conn:
+        async with get_engine().begin() as conn:
             print("--- Dropping dependent table 'job_match' with CASCADE... ---")
             await conn.execute(text("DROP TABLE IF EXISTS job_match CASCADE"))
             
@@ -67,6 +206,10 @@ async def reset_database():
             await conn.run_sync(
                 lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[JobPost.__table__])
             )
+            await conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+        # Bring the fresh schema up to date (triggers, extensions, ...)
+        from backend.migrate import apply_migrations
+        await apply_migrations()
         print("--- Database reset complete. ---")
     except Exception as e:
         print("--- AN ERROR OCCURRED DURING DATABASE RESET: ---")
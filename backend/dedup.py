@@ -0,0 +1,384 @@
+# backend/dedup.py
+"""Near-duplicate detection across sources with MinHash + LSH.
+
+Each job gets a NUM_PERM-value MinHash signature over word 3-shingles of
+title + company + description. Signatures are split into BANDS bands. Two
+jobs become candidates when any band hashes identically, and a candidate
+counts as a duplicate when its estimated Jaccard similarity is at least
+DEDUP_THRESHOLD. A new job is therefore compared against a handful of
+bucket hits, never against every stored job.
+
+Clusters are star-shaped: the first job seen (oldest created_at) is the
+canonical one and keeps canonical_job_id NULL; later near-duplicates point at
+it. Signatures are stored in job_post.minhash. The index stays resident in
+the process: the first dedup_pending() loads it from those bytes, and later
+calls only read rows clustered since (by any process) and the pending rows
+with deduped_at IS NULL, so a call costs O(new rows), not O(table).
+
+A trigger (migrations/0006) clears deduped_at when a job's title, company or
+description changes, so edited jobs are clustered again. Writers call
+dedup_pending() after saving (the scheduler, Gmail sync and importer), and
+the API batches its writes through request_dedup().
+
+    python -m backend.dedup [--rebuild] [--batch-size 5000]
+"""
+import os, sys, time, zlib, string, asyncio, argparse, resource
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: ~99% of pairs at 0.7 similarity become candidates
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+DEDUP_BATCH_SIZE = int(os.getenv("DEDUP_BATCH_SIZE", "5000"))
+DESCRIPTION_CHARS = 2000
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_rng = np.random.default_rng(20240601)  # fixed: stored signatures must stay comparable
+# h(x) = a*x + b mod 2**32 with odd a is a permutation of the 32-bit space;
+# uint32 wraparound does the mod for free (about 4x faster than a prime modulus)
+_A = (_rng.integers(0, 2**32, NUM_PERM, dtype=np.uint64) | np.uint64(1)).astype(np.uint32)[:, None]
+_B = _rng.integers(0, 2**32, NUM_PERM, dtype=np.uint64).astype(np.uint32)[:, None]
+_SHINGLE_MULT = np.array([0x9E3779B1, 0x85EBCA77], dtype=np.uint64)
+_BAND_MULT = _rng.integers(1, 2**63, ROWS, dtype=np.uint64) | np.uint64(1)
+_MAX_CHUNK_SHINGLES = 200_000  # bounds the (NUM_PERM x shingles) temporary to ~50MB
+
+# str.translate + split is ~3x faster than re.findall(r"\w+")
+_PUNCTUATION = str.maketrans({c: " " for c in string.punctuation})
+_token_hashes: dict[str, int] = {}
+
+def token_hash(token: str) -> int:
+    h = _token_hashes.get(token)
+    if h is None:
+        if len(_token_hashes) > 500_000:
+            _token_hashes.clear()
+        h = _token_hashes[token] = zlib.crc32(token.encode())
+    return h
+
+def tokenize(text: str) -> list[str]:
+    return text.lower().translate(_PUNCTUATION).split()
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """32-bit hashes of the word 3-shingles in `text` (at least one value)."""
+    tokens = tokenize(text)
+    hashes = list(map(_token_hashes.get, tokens))
+    if None in hashes:
+        hashes = [token_hash(t) for t in tokens]
+    th = np.array(hashes, dtype=np.uint64)
+    if len(th) >= SHINGLE:
+        m1, m2 = _SHINGLE_MULT
+        return ((th[:-2] * m1 + th[1:-1] * m2 + th[2:]) & _MASK32).astype(np.uint32)
+    return np.array([(th * _SHINGLE_MULT[:len(th)]).sum() & _MASK32], dtype=np.uint32)
+
+def signatures(texts: list[str]) -> np.ndarray:
+    """MinHash signatures, shape (len(texts), NUM_PERM), dtype uint32."""
+    out = np.empty((len(texts), NUM_PERM), dtype=np.uint32)
+    parts = [shingle_hashes(t) for t in texts]
+    start = 0
+    while start < len(parts):
+        # as many documents as fit in one chunk, at least one
+        end, total = start, 0
+        while end < len(parts) and (end == start or total + len(parts[end]) <= _MAX_CHUNK_SHINGLES):
+            total += len(parts[end])
+            end += 1
+        x = np.concatenate(parts[start:end])
+        offsets = np.cumsum([0] + [len(p) for p in parts[start:end - 1]])
+        hashed = _A * x + _B
+        out[start:end] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+    return out
+
+def band_keys(sigs: np.ndarray) -> np.ndarray:
+    """One uint64 bucket key per band, shape (n, BANDS)."""
+    bands = sigs.astype(np.uint64).reshape(len(sigs), BANDS, ROWS)
+    return (bands * _BAND_MULT).sum(axis=2)  # wraps mod 2**64, which is fine for hashing
+
+def job_text(title: str | None, company: str | None, snippet: str | None, sections: dict | None) -> str:
+    parts = [title or "", company or ""]
+    if sections:
+        parts.extend(item for items in sections.values() if isinstance(items, list)
+                     for item in items if isinstance(item, str))
+    elif snippet:
+        parts.append(snippet)
+    return " ".join(parts)[:DESCRIPTION_CHARS]
+
+class LSHIndex:
+    """Band bucket -> canonical slot, first writer wins.
+
+    Each band is a sorted uint64 key array with a parallel int32 slot array
+    (about 12 bytes per entry), plus a dict of recent inserts that is merged
+    in bulk every `merge_every` additions.
+    """
+
+    def __init__(self, bands: int = BANDS, merge_every: int = 50_000):
+        self.merge_every = merge_every
+        self._keys = [np.empty(0, dtype=np.uint64) for _ in range(bands)]
+        self._slots = [np.empty(0, dtype=np.int32) for _ in range(bands)]
+        self._pending: list[dict[int, int]] = [{} for _ in range(bands)]
+
+    def _find(self, band: int, key: int) -> int | None:
+        slot = self._pending[band].get(key)
+        if slot is not None:
+            return slot
+        keys = self._keys[band]
+        i = int(keys.searchsorted(np.uint64(key)))
+        if i < len(keys) and int(keys[i]) == key:
+            return int(self._slots[band][i])
+        return None
+
+    def candidates(self, keys: np.ndarray) -> set[int]:
+        found = set()
+        for band, key in enumerate(keys.tolist()):
+            slot = self._find(band, key)
+            if slot is not None:
+                found.add(slot)
+        return found
+
+    def add(self, slot: int, keys: np.ndarray, is_live=None):
+        """Claim each free bucket for `slot`; buckets held by a slot that fails
+        `is_live` are taken over."""
+        for band, key in enumerate(keys.tolist()):
+            existing = self._find(band, key)
+            if existing is None:
+                self._pending[band][key] = slot
+            elif is_live is not None and not is_live(existing):
+                self._replace(band, key, slot)
+        if len(self._pending[0]) >= self.merge_every:
+            self.merge()
+
+    def _replace(self, band: int, key: int, slot: int):
+        if key in self._pending[band]:
+            self._pending[band][key] = slot
+        else:
+            self._slots[band][int(self._keys[band].searchsorted(np.uint64(key)))] = slot
+
+    def merge(self):
+        for band, pending in enumerate(self._pending):
+            if not pending:
+                continue
+            keys = np.concatenate([self._keys[band], np.fromiter(pending.keys(), np.uint64, len(pending))])
+            slots = np.concatenate([self._slots[band], np.fromiter(pending.values(), np.int32, len(pending))])
+            order = keys.argsort(kind="stable")
+            self._keys[band], self._slots[band] = keys[order], slots[order]
+            pending.clear()
+
+    def nbytes(self) -> int:
+        return sum(k.nbytes + s.nbytes for k, s in zip(self._keys, self._slots))
+
+class Deduper:
+    """In-memory clusters: canonical job ids, their signatures and the LSH index.
+
+    A canonical that is re-clustered (its text changed) or becomes a duplicate
+    is retired: its slot stays allocated but is skipped, and its buckets go to
+    the next canonical that hashes there.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self.index = LSHIndex()
+        self.job_ids: list = []  # slot -> canonical job id, None once retired
+        self.slots: dict = {}    # live canonical job id -> slot
+        self._sigs = np.empty((1024, NUM_PERM), dtype=np.uint32)
+        self.comparisons = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _is_live(self, slot: int) -> bool:
+        return self.job_ids[slot] is not None
+
+    def add_canonical(self, job_id, sig: np.ndarray, keys: np.ndarray | None = None) -> int:
+        slot = self.slots.get(job_id)
+        if slot is not None:
+            if np.array_equal(self._sigs[slot], sig):
+                return slot
+            self.retire(job_id)
+        slot = len(self.job_ids)
+        if slot == len(self._sigs):
+            self._sigs = np.resize(self._sigs, (slot * 2, NUM_PERM))
+        self._sigs[slot] = sig
+        self.job_ids.append(job_id)
+        self.slots[job_id] = slot
+        self.index.add(slot, band_keys(sig[None])[0] if keys is None else keys, self._is_live)
+        return slot
+
+    def retire(self, job_id):
+        slot = self.slots.pop(job_id, None)
+        if slot is not None:
+            self.job_ids[slot] = None
+
+    def assign(self, job_id, sig: np.ndarray, keys: np.ndarray):
+        """Canonical job id for a near-duplicate, or None (the job becomes canonical)."""
+        self.retire(job_id)  # re-clustering a job: don't match its old self
+        best, best_sim = None, self.threshold
+        for slot in self.index.candidates(keys):
+            if self.job_ids[slot] is None:
+                continue
+            self.comparisons += 1
+            sim = np.count_nonzero(self._sigs[slot] == sig) / NUM_PERM
+            if sim >= best_sim:
+                best, best_sim = slot, sim
+        if best is None:
+            self.add_canonical(job_id, sig, keys)
+            return None
+        return self.job_ids[best]
+
+    def assign_batch(self, job_ids: list, texts: list[str]) -> tuple[np.ndarray, list]:
+        """Signatures and canonical ids (None for new canonicals) for a batch, in order."""
+        sigs = signatures(texts)
+        keys = band_keys(sigs)
+        return sigs, [self.assign(job_id, sigs[i], keys[i]) for i, job_id in enumerate(job_ids)]
+
+# ---- Database ----
+
+DEDUP_CATCHUP_MARGIN = 300  # seconds; deduped_at is a transaction's start time, so re-read a little overlap
+
+_resident: Deduper | None = None
+_loaded_until = None  # deduped_at up to which other processes' clusters have been read
+_lock: asyncio.Lock | None = None
+_lock_loop = None
+
+def _get_lock() -> asyncio.Lock:
+    global _lock, _lock_loop
+    loop = asyncio.get_running_loop()
+    if _lock is None or _lock_loop is not loop:
+        _lock, _lock_loop = asyncio.Lock(), loop
+    return _lock
+
+async def _load(session, deduper: Deduper, since=None):
+    """Add canonicals clustered since `since` (all of them if None) and retire
+    the ones that have since become duplicates. Returns the newest deduped_at."""
+    from sqlalchemy import text
+
+    if since is None:
+        stmt = text("select id, minhash, canonical_job_id, deduped_at from job_post "
+                    "where deduped_at is not null and canonical_job_id is null order by created_at, id")
+        params = {}
+    else:
+        stmt = text("select id, minhash, canonical_job_id, deduped_at from job_post "
+                    "where deduped_at > :since - make_interval(secs => :margin) order by created_at, id")
+        params = {"since": since, "margin": DEDUP_CATCHUP_MARGIN}
+    newest = since
+    result = await session.stream(stmt.execution_options(yield_per=10_000), params)
+    async for job_id, minhash, canonical_job_id, deduped_at in result:
+        if canonical_job_id is None:
+            deduper.add_canonical(job_id, np.frombuffer(minhash, dtype=np.uint32))
+        else:
+            deduper.retire(job_id)
+        newest = deduped_at if newest is None else max(newest, deduped_at)
+    deduper.index.merge()
+    return newest
+
+async def dedup_pending(batch_size: int = DEDUP_BATCH_SIZE, rebuild: bool = False) -> dict:
+    """Cluster every job not yet deduplicated. Returns counts and timings."""
+    async with _get_lock():
+        return await _dedup_pending(batch_size, rebuild)
+
+async def _dedup_pending(batch_size: int, rebuild: bool) -> dict:
+    global _resident, _loaded_until
+    from sqlalchemy import text
+    from backend.db import async_sessionmaker
+    from backend.cache import response_cache
+
+    started = time.perf_counter()
+    stats = {"canonical_loaded": 0, "processed": 0, "duplicates": 0}
+    async with async_sessionmaker() as session:
+        if rebuild:
+            await session.execute(text(
+                "update job_post set minhash = null, canonical_job_id = null, deduped_at = null"))
+            await session.commit()
+            _resident = None
+        if _resident is None:
+            _resident, _loaded_until = Deduper(), None
+            _loaded_until = await _load(session, _resident)
+            stats["canonical_loaded"] = len(_resident)
+        else:
+            # clusters other processes wrote since the last call
+            _loaded_until = await _load(session, _resident, _loaded_until)
+    deduper = _resident
+
+    while True:
+        async with async_sessionmaker() as session:
+            rows = (await session.execute(
+                text("""
+                    select id, title, company, description_snippet, description_sections
+                      from job_post
+                     where deduped_at is null
+                     order by created_at, id
+                     limit :limit
+                """),
+                {"limit": batch_size},
+            )).all()
+            if not rows:
+                break
+            ids = [r.id for r in rows]
+            sigs, canonical = deduper.assign_batch(
+                ids, [job_text(r.title, r.company, r.description_snippet, r.description_sections) for r in rows])
+            await session.execute(
+                text("""
+                    update job_post j
+                       set minhash = v.minhash, canonical_job_id = v.canonical_job_id, deduped_at = now()
+                      from unnest(cast(:ids as uuid[]), cast(:sigs as bytea[]), cast(:canonical as uuid[]))
+                           as v(id, minhash, canonical_job_id)
+                     where j.id = v.id
+                """),
+                {"ids": ids, "sigs": [s.tobytes() for s in sigs], "canonical": canonical},
+            )
+            await session.commit()
+        stats["processed"] += len(rows)
+        stats["duplicates"] += sum(c is not None for c in canonical)
+        print(f"... {stats['processed']} jobs deduplicated, {stats['duplicates']} near-duplicates")
+
+    if stats["processed"]:
+        response_cache.invalidate()
+    stats["canonical"] = len(deduper)
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    stats["index_mb"] = round(deduper.index.nbytes() / 2**20, 1)
+    stats["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return stats
+
+# ---- Background runs (API) ----
+
+_task: asyncio.Task | None = None
+_again = False
+
+def request_dedup():
+    """Cluster new or edited jobs soon, in the background. Calls made while a
+    run is in progress are folded into one more run after it."""
+    global _task, _again
+    if _task is not None and not _task.done():
+        _again = True
+        return
+    _task = asyncio.get_running_loop().create_task(_run_requested())
+
+async def _run_requested():
+    global _again
+    while True:
+        _again = False
+        try:
+            stats = await dedup_pending()
+            if stats["processed"]:
+                print(f"Dedup: {stats}")
+        except Exception as e:
+            print(f"Dedup failed: {e}")
+        if not _again:
+            return
+
+async def stop():
+    if _task is not None and not _task.done():
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rebuild", action="store_true", help="forget all clusters and recompute them")
+    parser.add_argument("--batch-size", type=int, default=DEDUP_BATCH_SIZE)
+    args = parser.parse_args()
+    stats = asyncio.run(dedup_pending(args.batch_size, args.rebuild))
+    print(stats, file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
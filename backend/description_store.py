@@ -0,0 +1,108 @@
+# backend/description_store.py
+"""In-memory index over backend/job_descriptions/*.json.
+
+The index maps filename -> (mtime, size, summary) and is refreshed
+incrementally: a refresh stats every file but only re-parses the ones whose
+mtime or size changed. Refreshes are throttled and, like all file reads,
+run in a worker thread so the event loop never blocks on disk.
+"""
+import os, json, asyncio, time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+JOB_DESC_DIR = Path(__file__).parent / "job_descriptions"
+DESC_REFRESH_INTERVAL = float(os.getenv("DESC_REFRESH_INTERVAL", "2"))
+PREVIEW_CHARS = 200
+
+# Fields a list request may project with ?fields=
+SUMMARY_FIELDS = ("filename", "mtime", "size", "title", "company", "location", "sections", "preview", "error")
+
+@dataclass
+class DescriptionEntry:
+    filename: str
+    mtime: float
+    size: int
+    summary: dict = field(default_factory=dict)
+    error: str | None = None
+
+    def project(self, fields) -> dict:
+        full = {"filename": self.filename, "mtime": self.mtime, "size": self.size,
+                "error": self.error, **self.summary}
+        return {f: full.get(f) for f in fields}
+
+def summarize(job: dict) -> dict:
+    """Small, list-friendly view of a description file."""
+    sections = job.get("description_sections") or {}
+    preview = next((items[0] for items in sections.values() if isinstance(items, list) and items), None)
+    return {
+        "title": job.get("title"),
+        "company": job.get("company"),
+        "location": job.get("location"),
+        "sections": {name: len(items) if isinstance(items, list) else 1 for name, items in sections.items()},
+        "preview": preview[:PREVIEW_CHARS] if isinstance(preview, str) else None,
+    }
+
+def read_json(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+class DescriptionStore:
+    def __init__(self, directory: Path = JOB_DESC_DIR, refresh_interval: float = DESC_REFRESH_INTERVAL):
+        self.directory = Path(directory)
+        self.refresh_interval = refresh_interval
+        # (filename -> entry, sorted filenames), swapped as one object
+        self._index: tuple[dict[str, DescriptionEntry], list[str]] = ({}, [])
+        self._last_refresh = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def _scan(self) -> int:
+        """Blocking incremental rescan. Returns how many files were (re)parsed.
+
+        Builds new index objects and swaps them in at the end, so readers on
+        the event loop never see a half-updated index.
+        """
+        self.directory.mkdir(exist_ok=True)
+        old = self._index[0]
+        entries, parsed = {}, 0
+        with os.scandir(self.directory) as it:
+            for de in it:
+                if not de.name.endswith(".json") or not de.is_file():
+                    continue
+                st = de.stat()
+                entry = old.get(de.name)
+                if entry and entry.mtime == st.st_mtime and entry.size == st.st_size:
+                    entries[de.name] = entry
+                    continue
+                entry = DescriptionEntry(de.name, st.st_mtime, st.st_size)
+                try:
+                    entry.summary = summarize(read_json(Path(de.path)))
+                except Exception as e:
+                    print(f"Error reading {de.name}: {e}")
+                    entry.error = str(e)
+                entries[de.name] = entry
+                parsed += 1
+        if parsed or entries.keys() != old.keys():
+            self._index = (entries, sorted(entries))
+        return parsed
+
+    async def refresh(self, force: bool = False):
+        if not force and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        async with self._lock:
+            if force or time.monotonic() - self._last_refresh >= self.refresh_interval:
+                await asyncio.to_thread(self._scan)
+                self._last_refresh = time.monotonic()
+
+    async def list(self, offset: int = 0, limit: int = 50, fields=SUMMARY_FIELDS) -> tuple[int, list[dict]]:
+        await self.refresh()
+        entries, order = self._index
+        return len(order), [entries[n].project(fields) for n in order[offset:offset + limit]]
+
+    async def read(self, filename: str) -> dict | None:
+        """Full JSON for an indexed file, or None if it isn't in the index."""
+        await self.refresh()
+        if filename not in self._index[0]:
+            return None
+        return await asyncio.to_thread(read_json, self.directory / filename)
+
+description_store = DescriptionStore()
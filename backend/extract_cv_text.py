@@ -0,0 +1,125 @@
+# backend/extract_cv_text.py
+"""PDF text extraction for CVs.
+
+iter_pages() memory-maps the file and yields page text lazily, stopping at
+CV_MAX_PAGES pages or CV_MAX_TEXT_CHARS characters. Files larger than
+CV_MAX_PDF_BYTES are rejected before PyPDF2 parses anything, so one
+pathological upload can't stall a worker. extract_many() spreads a batch of
+files over a process pool.
+
+    python -m backend.extract_cv_text FILE_OR_DIR [...] [--workers N]
+"""
+import os, sys, mmap, json, time, argparse, resource
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+CV_MAX_PDF_BYTES = int(os.getenv("CV_MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+CV_MAX_PAGES = int(os.getenv("CV_MAX_PAGES", "20"))
+CV_MAX_TEXT_CHARS = int(os.getenv("CV_MAX_TEXT_CHARS", "200000"))
+
+class PDFExtractionError(Exception):
+    """The PDF is too large, unreadable or encrypted."""
+
+def _reader(stream):
+    import PyPDF2  # ~50ms; deferred so importers that never parse a PDF don't pay it
+
+    try:
+        reader = PyPDF2.PdfReader(stream)
+    except Exception as e:
+        raise PDFExtractionError(f"unreadable PDF: {e}") from e
+    if reader.is_encrypted:
+        raise PDFExtractionError("encrypted PDF")
+    return reader
+
+def iter_pages(
+    pdf_path: str | Path,
+    max_pages: int = CV_MAX_PAGES,
+    max_bytes: int = CV_MAX_PDF_BYTES,
+    max_chars: int = CV_MAX_TEXT_CHARS,
+):
+    """Yields the text of each page, memory-mapping the file instead of reading it."""
+    with open(pdf_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise PDFExtractionError("empty file")
+        if size > max_bytes:
+            raise PDFExtractionError(f"PDF is {size} bytes, limit is {max_bytes}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter_pages_from(mm, max_pages, max_chars)
+
+def iter_pages_from(stream, max_pages: int = CV_MAX_PAGES, max_chars: int = CV_MAX_TEXT_CHARS):
+    """iter_pages() over an already open, seekable stream (file, BytesIO, mmap)."""
+    reader = _reader(stream)
+    chars = 0
+    for i in range(max_pages):
+        if chars >= max_chars:
+            return
+        # a broken page tree fails while the pages are counted or looked up, not only when read
+        try:
+            if i >= len(reader.pages):
+                return
+            text = reader.pages[i].extract_text() or ""
+        except Exception as e:
+            raise PDFExtractionError(f"page {i + 1}: {e}") from e
+        text = text[:max_chars - chars]
+        chars += len(text)
+        yield text
+
+def extract_text(pdf_path: str | Path, **limits) -> str:
+    """All page text joined, within the page/byte/char limits. Raises PDFExtractionError."""
+    return "".join(iter_pages(pdf_path, **limits))
+
+def _extract_one(pdf_path: str) -> tuple[str, str | None, str | None, int]:
+    """Process-pool worker. Returns (path, text, error, pages)."""
+    pages = []
+    try:
+        for text in iter_pages(pdf_path):
+            pages.append(text)
+    except (OSError, PDFExtractionError) as e:
+        return pdf_path, None, str(e), len(pages)
+    return pdf_path, "".join(pages), None, len(pages)
+
+def extract_many(paths, workers: int | None = None, chunksize: int = 4):
+    """Yields (path, text, error, pages) for each PDF, in input order, using a process pool."""
+    paths = [str(p) for p in paths]
+    if not paths:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers == 1:
+        yield from map(_extract_one, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_extract_one, paths, chunksize=chunksize)
+
+def expand_paths(args) -> list[Path]:
+    paths = []
+    for arg in map(Path, args):
+        paths.extend(sorted(arg.glob("*.pdf")) if arg.is_dir() else [arg])
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="PDF files or directories of *.pdf")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    stats = {"files": 0, "pages": 0, "errors": 0}
+    for path, text, error, pages in extract_many(expand_paths(args.paths), args.workers):
+        stats["files"] += 1
+        stats["pages"] += pages
+        if error:
+            stats["errors"] += 1
+            print(f"Skipping {path}: {error}", file=sys.stderr)
+        else:
+            print(json.dumps({"path": path, "pages": pages, "chars": len(text)}))
+    elapsed = time.perf_counter() - t0
+    stats["seconds"] = round(elapsed, 2)
+    stats["pages_per_sec"] = round(stats["pages"] / elapsed, 1) if elapsed else 0.0
+    # children's RSS counts too: the pool does the parsing
+    stats["peak_rss_mb"] = round(max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                                     resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024, 1)
+    print(json.dumps(stats), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
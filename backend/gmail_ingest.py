@@ -0,0 +1,403 @@
+# backend/gmail_ingest.py
+"""Incremental Gmail ingestion of job-alert emails into job_post.
+
+The first sync lists messages matching GMAIL_QUERY. After that, each sync
+reads the mailbox history from the historyId checkpoint stored in
+gmail_sync_state and keeps the added messages that GMAIL_QUERY also matches
+(listed with an `after:` bound just before the checkpoint), so only new
+job-alert mail is fetched. If the checkpoint has expired
+(Gmail answers 404), it falls back to a full sync. Message bodies are fetched
+through the Gmail batch endpoint, GMAIL_BATCH_SIZE messages per request and
+GMAIL_MAX_CONCURRENCY requests in flight. Job cards in the alert HTML are
+parsed with BeautifulSoup and written with repo.upsert_jobs.
+
+    python -m backend.gmail_ingest [--full]
+
+Set GMAIL_API_BASE and GMAIL_ACCESS_TOKEN to run against a local fake
+(see benchmarks/stubs.py).
+"""
+import os, re, json, time, uuid, email, pickle, base64, random, asyncio, argparse
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import httpx
+from bs4 import BeautifulSoup
+from dotenv import load_dotenv
+
+from backend.utils_normalize import make_hash_key
+from backend.metrics import async_httpx_hooks
+
+load_dotenv(dotenv_path=Path(__file__).parent / ".env")
+
+SOURCE = "gmail"
+SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
+CREDENTIALS_FILE = Path(__file__).parent / "credentials.json"
+TOKEN_FILE = Path(__file__).resolve().parents[1] / "token.pickle"
+
+GMAIL_API_BASE = os.getenv("GMAIL_API_BASE", "https://gmail.googleapis.com")
+GMAIL_USER = os.getenv("GMAIL_USER", "me")
+GMAIL_QUERY = os.getenv("GMAIL_QUERY", "subject:(job OR jobs) newer_than:30d")
+
+# ---- Batching / concurrency settings ----
+GMAIL_BATCH_SIZE = int(os.getenv("GMAIL_BATCH_SIZE", "50"))  # Gmail allows 100, recommends <= 50
+GMAIL_MAX_CONCURRENCY = int(os.getenv("GMAIL_MAX_CONCURRENCY", "4"))
+GMAIL_MAX_MESSAGES = int(os.getenv("GMAIL_MAX_MESSAGES", "2000"))  # cap for a full sync
+GMAIL_QUERY_MARGIN = 86400  # seconds before the checkpoint that the incremental query listing starts
+GMAIL_MAX_RETRIES = int(os.getenv("GMAIL_MAX_RETRIES", "4"))
+RETRY_BASE_DELAY = 0.5
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+SNIPPET_CHARS = 250
+JOB_LINK_RE = re.compile(
+    r"linkedin\.com/(comm/)?jobs/view/|seek\.com(\.au)?/job/|indeed\.com/(viewjob|rc/clk|pagead)|/jobs?/",
+    re.IGNORECASE,
+)
+# query parameters that identify a posting; everything else is tracking
+KEEP_PARAMS = {"jk", "id", "jobid", "currentjobid"}
+
+
+@dataclass
+class SyncStats:
+    mode: str = "incremental"
+    start_history_id: int | None = None
+    end_history_id: int | None = None
+    requests: int = 0
+    batches: int = 0
+    retries: int = 0
+    bytes_downloaded: int = 0
+    messages_listed: int = 0
+    messages_skipped: int = 0  # added since the checkpoint but not matching GMAIL_QUERY
+    messages_fetched: int = 0
+    messages_failed: int = 0
+    jobs_parsed: int = 0
+    jobs_saved: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def messages_per_sec(self) -> float:
+        return self.messages_fetched / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        return (
+            f"{self.mode} sync {self.start_history_id} -> {self.end_history_id}: "
+            f"{self.messages_fetched} messages in {self.elapsed:.1f}s = {self.messages_per_sec:.1f} messages/sec, "
+            f"{self.bytes_downloaded / 1024:.1f} KiB downloaded | "
+            f"{self.messages_skipped} skipped by query | "
+            f"{self.jobs_parsed} jobs parsed, {self.jobs_saved} new | "
+            f"{self.requests} requests ({self.batches} batches), {self.retries} retries, "
+            f"{self.messages_failed} messages failed"
+        )
+
+
+class HistoryExpired(Exception):
+    """The stored historyId is too old for history.list; a full sync is needed."""
+
+
+# ---- Auth ----
+
+def get_access_token() -> str:
+    """OAuth access token: GMAIL_ACCESS_TOKEN, else token.pickle (refreshed or created)."""
+    token = os.getenv("GMAIL_ACCESS_TOKEN")
+    if token:
+        return token
+
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    creds = None
+    if TOKEN_FILE.exists():
+        with open(TOKEN_FILE, "rb") as f:
+            creds = pickle.load(f)
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_FILE), SCOPES)
+            creds = flow.run_local_server(port=0)
+        with open(TOKEN_FILE, "wb") as f:
+            pickle.dump(creds, f)
+    return creds.token
+
+
+# ---- Gmail REST client ----
+
+class GmailClient:
+    """Gmail REST calls over one pooled httpx client, counting requests and bytes."""
+
+    def __init__(self, client: httpx.AsyncClient, stats: SyncStats | None = None,
+                 batch_size: int = GMAIL_BATCH_SIZE, max_concurrency: int = GMAIL_MAX_CONCURRENCY):
+        self.client = client
+        self.stats = stats or SyncStats()
+        self.batch_size = batch_size
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.prefix = f"/gmail/v1/users/{GMAIL_USER}"
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        for attempt in range(GMAIL_MAX_RETRIES + 1):
+            async with self.semaphore:
+                self.stats.requests += 1
+                response = await self.client.request(method, url, **kwargs)
+                self.stats.bytes_downloaded += len(response.content)
+            if response.status_code not in RETRYABLE_STATUS or attempt == GMAIL_MAX_RETRIES:
+                return response
+            self.stats.retries += 1
+            await asyncio.sleep(RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, RETRY_BASE_DELAY))
+        return response
+
+    async def _get_json(self, path: str, params: dict | None = None) -> dict:
+        response = await self._send("GET", self.prefix + path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def profile_history_id(self) -> int:
+        return int((await self._get_json("/profile"))["historyId"])
+
+    async def list_message_ids(self, query: str, limit: int = GMAIL_MAX_MESSAGES) -> list[str]:
+        ids, page_token = [], None
+        while len(ids) < limit:
+            params = {"q": query, "maxResults": min(500, limit - len(ids))}
+            if page_token:
+                params["pageToken"] = page_token
+            data = await self._get_json("/messages", params)
+            ids.extend(m["id"] for m in data.get("messages", []))
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                break
+        return ids
+
+    async def history_message_ids(self, start_history_id: int) -> tuple[list[str], int]:
+        """Ids of messages added since `start_history_id`, and the mailbox's current historyId."""
+        ids, page_token, latest = {}, None, start_history_id
+        while True:
+            params = {"startHistoryId": start_history_id, "historyTypes": "messageAdded", "maxResults": 500}
+            if page_token:
+                params["pageToken"] = page_token
+            response = await self._send("GET", self.prefix + "/history", params=params)
+            if response.status_code == 404:
+                raise HistoryExpired(start_history_id)
+            response.raise_for_status()
+            data = response.json()
+            for record in data.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    ids[added["message"]["id"]] = None  # ordered set
+            latest = int(data.get("historyId", latest))
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return list(ids), latest
+
+    async def _batch_get(self, message_ids: list[str]) -> dict[str, tuple[int, bytes]]:
+        """One multipart/mixed batch of messages.get calls -> {id: (status, json body)}."""
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for i, message_id in enumerate(message_ids):
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <item-{i}>\r\n\r\n"
+                f"GET {self.prefix}/messages/{message_id}?format=full\r\n\r\n"
+            )
+        body = ("".join(parts) + f"--{boundary}--\r\n").encode()
+        self.stats.batches += 1
+        response = await self._send(
+            "POST", "/batch/gmail/v1", content=body,
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        response.raise_for_status()
+        results = {}
+        for content_id, status, payload in parse_batch_response(response.headers["content-type"], response.content):
+            index = int(content_id.rsplit("-", 1)[-1])
+            results[message_ids[index]] = (status, payload)
+        return results
+
+    async def get_messages(self, message_ids: list[str]):
+        """Yields full message dicts, GMAIL_BATCH_SIZE per batch request, batches in parallel.
+
+        Items that come back 429/5xx inside a batch are retried in a later batch.
+        """
+        pending = list(message_ids)
+        for attempt in range(GMAIL_MAX_RETRIES + 1):
+            batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+            retry = []
+            for task in asyncio.as_completed([self._batch_get(b) for b in batches]):
+                for message_id, (status, payload) in (await task).items():
+                    if status == 200:
+                        self.stats.messages_fetched += 1
+                        yield json.loads(payload)
+                    elif status in RETRYABLE_STATUS and attempt < GMAIL_MAX_RETRIES:
+                        retry.append(message_id)
+                    else:
+                        print(f"Could not fetch message {message_id}: HTTP {status}")
+                        self.stats.messages_failed += 1
+            if not retry:
+                return
+            self.stats.retries += len(retry)
+            pending = retry
+            await asyncio.sleep(RETRY_BASE_DELAY * 2 ** attempt)
+
+
+def parse_batch_response(content_type: str, content: bytes):
+    """Yields (content_id, status, body) for each part of a multipart/mixed batch response."""
+    message = email.message_from_bytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + content)
+    for part in message.get_payload():
+        raw = part.get_payload(decode=False)
+        raw = raw.encode() if isinstance(raw, str) else raw
+        head, _, body = raw.replace(b"\r\n", b"\n").partition(b"\n\n")
+        status = int(head.split(b"\n", 1)[0].split()[1])
+        yield (part.get("Content-ID") or "").strip("<>"), status, body.strip()
+
+
+def make_client(base_url: str = GMAIL_API_BASE, token: str | None = None) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=GMAIL_MAX_CONCURRENCY, max_keepalive_connections=GMAIL_MAX_CONCURRENCY)
+    return httpx.AsyncClient(base_url=base_url, headers={"Authorization": f"Bearer {token}"},
+                             limits=limits, timeout=60, event_hooks=async_httpx_hooks("gmail"))
+
+
+# ---- Parsing ----
+
+def _b64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def message_html(payload: dict) -> str | None:
+    """The first text/html body in a (possibly nested multipart) Gmail payload."""
+    if payload.get("mimeType") == "text/html" and payload.get("body", {}).get("data"):
+        return _b64(payload["body"]["data"]).decode("utf-8", errors="replace")
+    for part in payload.get("parts", []):
+        html = message_html(part)
+        if html:
+            return html
+    return None
+
+def canonical_job_url(href: str) -> str:
+    parts = urlsplit(href)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if k.lower() in KEEP_PARAMS])
+    return urlunsplit((parts.scheme or "https", parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+def _card_lines(anchor, url: str) -> list[str]:
+    """Text lines of the smallest block around `anchor` that holds only this job's links."""
+    card = anchor
+    for parent in anchor.parents:
+        if parent.name in ("body", "html", "[document]"):
+            break
+        urls = {canonical_job_url(a["href"]) for a in parent.find_all("a", href=JOB_LINK_RE)}
+        if urls - {url}:
+            break
+        card = parent
+    return [s for s in card.stripped_strings if len(s) > 1]
+
+def parse_job_alert(html: str, received_at: datetime | None = None) -> list[dict]:
+    """Map the job cards in a job-alert email to repo.upsert_jobs rows."""
+    soup = BeautifulSoup(html, "html.parser")
+    anchors = {}
+    for a in soup.find_all("a", href=JOB_LINK_RE):
+        title = a.get_text(" ", strip=True)
+        if not title:
+            continue
+        url = canonical_job_url(a["href"])
+        # logo and title usually link to the same posting; keep the longest text
+        if len(title) > len(anchors.get(url, ("", None))[0]):
+            anchors[url] = (title, a)
+
+    rows = []
+    for url, (title, anchor) in anchors.items():
+        lines = [line for line in _card_lines(anchor, url) if line != title]
+        company = lines[0] if lines else None
+        location = lines[1] if len(lines) > 1 else None
+        snippet = " · ".join(lines[2:])[:SNIPPET_CHARS] or None
+        rows.append({
+            "hash_key": make_hash_key(SOURCE, title, company, location, url),
+            "source": SOURCE,
+            "title": title,
+            "company": company,
+            "location": location,
+            "description_snippet": snippet,
+            "description_sections": None,
+            "posted_at": received_at,
+            "canonical_url": url,
+            "salary_text": None,
+        })
+    return rows
+
+def message_rows(message: dict) -> list[dict]:
+    html = message_html(message.get("payload", {}))
+    if not html:
+        return []
+    internal_date = message.get("internalDate")
+    received_at = datetime.fromtimestamp(int(internal_date) / 1000, tz=timezone.utc) if internal_date else None
+    return parse_job_alert(html, received_at)
+
+
+# ---- Sync ----
+
+async def _sync(api: GmailClient, full: bool) -> SyncStats:
+    from backend.db import async_sessionmaker
+    from backend.crawl import Crawl
+    from backend import repo
+
+    stats = api.stats
+    async with async_sessionmaker() as session:
+        checkpoint = None if full else await repo.get_gmail_sync_state(session, GMAIL_USER)
+
+    # alerts only mention new postings, so a sync never deactivates jobs
+    async with Crawl(SOURCE, query=GMAIL_USER) as crawl:
+        message_ids = None
+        if checkpoint is not None:
+            stats.start_history_id = checkpoint.history_id
+            try:
+                message_ids, stats.end_history_id = await api.history_message_ids(checkpoint.history_id)
+            except HistoryExpired:
+                print(f"historyId {checkpoint.history_id} has expired, falling back to a full sync.")
+            if message_ids:
+                # history has every new message; keep the ones GMAIL_QUERY matches
+                since = int(checkpoint.updated_at.timestamp()) - GMAIL_QUERY_MARGIN
+                matching = set(await api.list_message_ids(f"({GMAIL_QUERY}) after:{since}"))
+                stats.messages_skipped = sum(1 for m in message_ids if m not in matching)
+                message_ids = [m for m in message_ids if m in matching]
+        if message_ids is None:
+            stats.mode = "full"
+            # read the checkpoint first so mail arriving during the listing is picked up next time
+            stats.end_history_id = await api.profile_history_id()
+            message_ids = await api.list_message_ids(GMAIL_QUERY)
+        stats.messages_listed = len(message_ids)
+        print(f"{stats.mode} sync: {len(message_ids)} messages to fetch")
+
+        rows = {}
+        async for message in api.get_messages(message_ids):
+            try:
+                for row in message_rows(message):
+                    rows[row["hash_key"]] = row
+            except Exception as e:
+                print(f"Could not parse message {message.get('id')}: {e}")
+        stats.jobs_parsed = len(rows)
+
+        async with async_sessionmaker() as session:
+            if rows:
+                written = await repo.upsert_jobs(session, list(rows.values()))
+                crawl.record(written)
+                stats.jobs_saved = sum(1 for r in written if r.inserted)
+            # only advance the checkpoint once the jobs are stored
+            await repo.set_gmail_history_id(session, GMAIL_USER, stats.end_history_id)
+
+    print(f"Gmail sync finished: {stats.report()}")
+    if rows:
+        from backend.dedup import dedup_pending
+        print(f"Dedup: {await dedup_pending()}")
+    return stats
+
+async def sync_gmail(full: bool = False, base_url: str = GMAIL_API_BASE, token: str | None = None) -> SyncStats:
+    """Fetch new job-alert mail since the stored checkpoint (or everything, if `full`)."""
+    token = token or await asyncio.to_thread(get_access_token)
+    async with make_client(base_url, token) as client:
+        return await _sync(GmailClient(client), full)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="ignore the stored historyId and rescan GMAIL_QUERY")
+    args = parser.parse_args()
+    asyncio.run(sync_gmail(full=args.full))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# backend/import_descriptions.py
+"""Stream job description JSON into job_post.
+
+Accepts a directory of *.json files (default: backend/job_descriptions) or a
+JSONL file with one description per line. Records are parsed in a process
+pool in fixed-size chunks and written with repo.upsert_jobs, with at most a
+few chunks in flight, so memory stays flat however large the input is.
+With --full the input is treated as the complete set of descriptions and
+rows it no longer contains are deactivated (see backend/crawl.py), unless a
+record failed to parse: its rows would otherwise look missing. Records
+without a title (the bundled samples only have description_sections) are
+titled after their first section entry and keyed by their id or filename,
+so editing the text doesn't turn them into new rows.
+
+    python -m backend.import_descriptions [PATH] [--chunk-size 500] [--workers N] [--full]
+"""
+import os, sys, json, time, asyncio, argparse, resource
+from itertools import islice
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.utils_normalize import make_hash_key
+
+SOURCE = "job_descriptions"
+JOB_DESC_DIR = Path(__file__).parent / "job_descriptions"
+SNIPPET_CHARS = 250
+FALLBACK_TITLE_CHARS = 80
+PLACEHOLDERS = {"no information provided", "n/a", "none"}  # empty sections in the samples
+
+def iter_items(path: Path):
+    """Yields (name, path_or_None, line_or_None) lazily from a directory or JSONL file."""
+    if path.is_dir():
+        with os.scandir(path) as it:
+            for de in it:
+                if de.name.endswith(".json") and de.is_file():
+                    yield de.name, de.path, None
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for lineno, line in enumerate(f, start=1):
+                if line.strip():
+                    yield f"{path.name}:{lineno}", None, line
+
+def section_items(sections: dict):
+    """The non-placeholder string entries of every section, in order."""
+    return (item.strip() for items in sections.values() if isinstance(items, list)
+            for item in items if isinstance(item, str)
+            and item.strip().rstrip(".").lower() not in PLACEHOLDERS | {""})
+
+def fallback_title(name: str, sections: dict) -> str:
+    """A title for a record without one: its first section entry, else its filename."""
+    first = next(section_items(sections), "").rstrip(".")
+    if not first:
+        return f"Job description {name.rsplit('.', 1)[0].removeprefix('job_')[:8]}"
+    if len(first) <= FALLBACK_TITLE_CHARS:
+        return first
+    return first[:FALLBACK_TITLE_CHARS].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+
+def to_row(name: str, job: dict) -> dict:
+    """Map a description record to a repo.upsert_jobs row."""
+    sections = job.get("description_sections") or {}
+    title = (job.get("title") or job.get("job_title") or "").strip()
+    company = job.get("company")
+    location = job.get("location")
+    canonical_url = job.get("canonical_url")
+    # without a URL the record's own id/filename is what tells two postings apart;
+    # a derived title stays out of the key so editing the text updates the same row
+    hash_key = make_hash_key(SOURCE, title, company, location, canonical_url or job.get("id") or name)
+    title = title or fallback_title(name, sections)
+    snippet = " ".join(section_items(sections))[:SNIPPET_CHARS]
+    posted_at = job.get("posted_at")
+    return {
+        "hash_key": hash_key,
+        "source": SOURCE,
+        "title": title,
+        "company": company,
+        "location": location,
+        "description_snippet": snippet or None,
+        "description_sections": sections or None,
+        "posted_at": datetime.fromisoformat(posted_at) if posted_at else None,
+        "canonical_url": canonical_url,
+        "salary_text": job.get("salary_text"),
+    }
+
+def parse_chunk(items: list[tuple]) -> tuple[list[dict], list[str]]:
+    """Process-pool worker: parse and map one chunk. Returns (rows, errors)."""
+    rows, errors = [], []
+    for name, path, line in items:
+        try:
+            if path is not None:
+                with open(path, "r", encoding="utf-8") as f:
+                    job = json.load(f)
+            else:
+                job = json.loads(line)
+            rows.append(to_row(name, job))
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+    return rows, errors
+
+def chunked(iterable, size: int):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+async def import_descriptions(path: Path = JOB_DESC_DIR, chunk_size: int = 500, workers: int | None = None,
+                              full: bool = False) -> dict:
+    # Imported here so pool workers (which re-import this module) never touch the DB setup
+    from backend.db import async_sessionmaker
+    from backend.crawl import Crawl
+    from backend import repo
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    loop = asyncio.get_running_loop()
+    stats = {"records": 0, "inserted": 0, "updated": 0, "errors": 0}
+    started = time.perf_counter()
+
+    async def write(task):
+        rows, errors = await task
+        for err in errors:
+            print(f"Skipping {err}", file=sys.stderr)
+            crawl.error(err)  # a --full run then leaves the unparsed files' rows active
+        stats["errors"] += len(errors)
+        stats["records"] += len(rows) + len(errors)
+        if rows:
+            async with async_sessionmaker() as session:
+                written = await repo.upsert_jobs(session, rows, chunk_size=chunk_size)
+            crawl.record(written)
+            inserted = sum(1 for r in written if r.inserted)
+            stats["inserted"] += inserted
+            stats["updated"] += len(written) - inserted
+        elapsed = time.perf_counter() - started
+        print(f"... {stats['records']} records, {stats['records'] / elapsed:.0f}/sec")
+
+    async with Crawl(SOURCE, query=str(path), full=full) as crawl:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for chunk in chunked(iter_items(Path(path)), chunk_size):
+                pending.append(loop.run_in_executor(pool, parse_chunk, chunk))
+                if len(pending) >= max_in_flight:
+                    await write(pending.pop(0))
+            while pending:
+                await write(pending.pop(0))
+    stats["deactivated"] = crawl.counts["rows_deactivated"]
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["records_per_sec"] = round(stats["records"] / elapsed, 1) if elapsed else 0.0
+    # ru_maxrss is KiB on Linux
+    stats["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", type=Path, default=JOB_DESC_DIR, help="directory of *.json or a .jsonl file")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--full", action="store_true", help="deactivate stored descriptions missing from PATH")
+    args = parser.parse_args()
+
+    stats = asyncio.run(import_descriptions(args.path, args.chunk_size, args.workers, args.full))
+    print(json.dumps(stats))
+    if stats["inserted"] or stats["updated"]:
+        from backend.dedup import dedup_pending
+        print(f"Dedup: {asyncio.run(dedup_pending())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+# backend/llm_client.py
+"""Async client for the OpenAI-compatible chat endpoint served by LM Studio.
+
+One pooled httpx.AsyncClient per process keeps the connection to LM Studio
+alive between calls, and at most LLM_MAX_CONCURRENCY requests are in flight
+at once. The rest wait on a semaphore, and that wait is reported as queue
+delay. Inputs are cut to LLM_MAX_INPUT_TOKENS before sending: complete()
+truncates at a word boundary, and complete_chunks() splits the text and
+sends every chunk. Token counts come from the server's `usage` when it
+reports them, and otherwise from a characters-per-token estimate, since no
+tokenizer is shipped here.
+
+    client = get_llm_client()
+    completion = await client.complete(system, cv_text)              # one call
+    async for delta in client.stream(system, cv_text): ...           # token by token
+    completions = await client.complete_many(system, cv_texts)       # many, concurrently
+
+Counters (tokens/sec, queue delay, in flight) are in llm_stats and on GET /metrics.
+
+    python -m backend.llm_client CV.pdf [...] [--stream] [--concurrency N]
+"""
+import os, json, time, asyncio, argparse, weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import httpx
+from backend.metrics import async_httpx_hooks
+
+LMSTUDIO_URL = os.getenv("LMSTUDIO_URL", "http://localhost:1234/v1/chat/completions")
+LMSTUDIO_MODEL = os.getenv("LMSTUDIO_MODEL", "mistralai/mistral-7b-instruct-v0.3")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+LLM_MAX_INPUT_TOKENS = int(os.getenv("LLM_MAX_INPUT_TOKENS", "3000"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+CHARS_PER_TOKEN = 4  # rough average for English text with Llama/Mistral tokenizers
+
+class LLMError(Exception):
+    """The LLM endpoint could not be reached or returned something unusable."""
+
+# ---- Token budget ----
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+def _cut(text: str, max_chars: int) -> int:
+    """Index to cut `text` at: the last whitespace before max_chars, if there is one nearby."""
+    if len(text) <= max_chars:
+        return len(text)
+    space = text.rfind(" ", max_chars // 2, max_chars + 1)
+    newline = text.rfind("\n", max_chars // 2, max_chars + 1)
+    cut = max(space, newline)
+    return cut if cut > 0 else max_chars
+
+def truncate_to_budget(text: str, max_tokens: int = LLM_MAX_INPUT_TOKENS) -> tuple[str, bool]:
+    """`text` cut to about max_tokens tokens; the flag says whether anything was dropped."""
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text, False
+    return text[:_cut(text, max_tokens * CHARS_PER_TOKEN)].rstrip(), True
+
+def chunk_text(text: str, max_tokens: int = LLM_MAX_INPUT_TOKENS, overlap_tokens: int = 0) -> list[str]:
+    """Split `text` into pieces of about max_tokens tokens, at word boundaries."""
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return [text]
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    overlap = min(overlap_tokens * CHARS_PER_TOKEN, max_chars // 2)
+    chunks, start = [], 0
+    while start < len(text):
+        end = start + _cut(text[start:], max_chars)
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [c for c in chunks if c]
+
+# ---- Stats ----
+
+@dataclass
+class Completion:
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    queue_seconds: float  # waiting for a concurrency slot
+    seconds: float        # request time once it had a slot
+    truncated: bool = False
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.completion_tokens / self.seconds if self.seconds else 0.0
+
+class LLMStats:
+    """Counters for LLM calls; read through report() (and GET /metrics)."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.truncated = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.generate_seconds = 0.0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+        self.in_flight = 0
+        self.waiting = 0
+
+    def record_queue(self, seconds: float):
+        self.queue_seconds_total += seconds
+        self.queue_seconds_max = max(self.queue_seconds_max, seconds)
+
+    def record(self, completion: Completion):
+        self.requests += 1
+        self.truncated += completion.truncated
+        self.prompt_tokens += completion.prompt_tokens
+        self.completion_tokens += completion.completion_tokens
+        self.generate_seconds += completion.seconds
+
+    def report(self) -> dict:
+        started = self.requests + self.errors
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "truncated": self.truncated,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            # per-request decode rate; concurrent requests each count their own time
+            "tokens_per_second": round(self.completion_tokens / self.generate_seconds, 1) if self.generate_seconds else 0.0,
+            "queue_seconds_mean": round(self.queue_seconds_total / started, 4) if started else 0.0,
+            "queue_seconds_max": round(self.queue_seconds_max, 4),
+        }
+
+llm_stats = LLMStats()
+
+# ---- Client ----
+
+class LLMClient:
+    def __init__(self, url: str = LMSTUDIO_URL, model: str = LMSTUDIO_MODEL,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY, max_input_tokens: int = LLM_MAX_INPUT_TOKENS,
+                 timeout: float = LLM_TIMEOUT, stats: LLMStats | None = None):
+        self.url = url
+        self.model = model
+        self.max_input_tokens = max_input_tokens
+        self.stats = stats or llm_stats
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        self.http = httpx.AsyncClient(timeout=timeout, limits=limits, event_hooks=async_httpx_hooks("lmstudio"))
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Holds one of the max_concurrency slots; yields how long it waited for it."""
+        t0 = time.perf_counter()
+        self.stats.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.stats.waiting -= 1
+        queued = time.perf_counter() - t0
+        self.stats.record_queue(queued)
+        self.stats.in_flight += 1
+        try:
+            yield queued
+        finally:
+            self.stats.in_flight -= 1
+            self.semaphore.release()
+
+    def _payload(self, system: str, user: str, temperature: float, max_tokens: int | None, **extra) -> dict:
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": user}],
+            "temperature": temperature,
+            **extra,
+        }
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        return payload
+
+    async def complete(self, system: str, user: str, temperature: float = 0.2,
+                       max_tokens: int | None = None) -> Completion:
+        """One chat completion, with `user` truncated to the input budget."""
+        user, truncated = truncate_to_budget(user, self.max_input_tokens)
+        payload = self._payload(system, user, temperature, max_tokens)
+        async with self._slot() as queued:
+            t0 = time.perf_counter()
+            try:
+                response = await self.http.post(self.url, json=payload)
+                response.raise_for_status()
+                data = response.json()
+                text = data["choices"][0]["message"]["content"]
+            except (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError) as e:
+                self.stats.errors += 1
+                raise LLMError(f"LLM request to {self.url} failed: {e!r}") from e
+            seconds = time.perf_counter() - t0
+        usage = data.get("usage") or {}
+        completion = Completion(
+            text=text,
+            prompt_tokens=usage.get("prompt_tokens") or estimate_tokens(system + user),
+            completion_tokens=usage.get("completion_tokens") or estimate_tokens(text),
+            queue_seconds=queued, seconds=seconds, truncated=truncated,
+        )
+        self.stats.record(completion)
+        return completion
+
+    async def stream(self, system: str, user: str, temperature: float = 0.2, max_tokens: int | None = None):
+        """Yields the reply's text deltas as the server sends them (SSE, `stream: true`)."""
+        user, truncated = truncate_to_budget(user, self.max_input_tokens)
+        payload = self._payload(system, user, temperature, max_tokens,
+                                stream=True, stream_options={"include_usage": True})
+        async with self._slot() as queued:
+            t0 = time.perf_counter()
+            parts, usage = [], {}
+            try:
+                async with self.http.stream("POST", self.url, json=payload) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        event = json.loads(data)
+                        usage = event.get("usage") or usage
+                        for choice in event.get("choices") or ():
+                            delta = (choice.get("delta") or {}).get("content")
+                            if delta:
+                                parts.append(delta)
+                                yield delta
+            except (httpx.HTTPError, ValueError, AttributeError) as e:
+                self.stats.errors += 1
+                raise LLMError(f"LLM stream from {self.url} failed: {e!r}") from e
+            seconds = time.perf_counter() - t0
+        self.stats.record(Completion(
+            text="".join(parts),
+            prompt_tokens=usage.get("prompt_tokens") or estimate_tokens(system + user),
+            # servers send roughly one token per delta when they don't report usage
+            completion_tokens=usage.get("completion_tokens") or len(parts),
+            queue_seconds=queued, seconds=seconds, truncated=truncated,
+        ))
+
+    async def complete_many(self, system: str, inputs: list[str], temperature: float = 0.2,
+                            max_tokens: int | None = None) -> list[Completion | LLMError]:
+        """complete() for every input concurrently (bounded by the semaphore), in input order.
+        A failed input gets its LLMError in its slot instead of failing the batch."""
+        async def one(user: str):
+            try:
+                return await self.complete(system, user, temperature, max_tokens)
+            except LLMError as e:
+                return e
+
+        return await asyncio.gather(*(one(user) for user in inputs))
+
+    async def complete_chunks(self, system: str, text: str, temperature: float = 0.2,
+                              max_tokens: int | None = None, overlap_tokens: int = 50) -> list[Completion | LLMError]:
+        """Split `text` to the input budget and complete every chunk; the caller combines them."""
+        chunks = chunk_text(text, self.max_input_tokens, overlap_tokens)
+        return await self.complete_many(system, chunks, temperature, max_tokens)
+
+# One client per event loop: its connections and semaphore belong to the loop
+# that created them. An entry goes away with its loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMClient]" = weakref.WeakKeyDictionary()
+
+def get_llm_client() -> LLMClient:
+    """The running event loop's shared client, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = LLMClient()
+    return client
+
+async def close_llm_client():
+    """Close the running event loop's shared client, if it has one."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+async def main():
+    from backend.cv_to_keywords import SYSTEM_PROMPT, TEMPERATURE, extract_text_cached
+
+    parser = argparse.ArgumentParser(description="Infer job titles for CVs with the shared LLM client.")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--stream", action="store_true", help="print each reply as it is generated")
+    parser.add_argument("--concurrency", type=int, default=LLM_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    texts = await asyncio.gather(*(asyncio.to_thread(extract_text_cached, p) for p in args.paths))
+    client = _clients[asyncio.get_running_loop()] = LLMClient(max_concurrency=args.concurrency)
+    t0 = time.perf_counter()
+    try:
+        if args.stream:
+            for path, text in zip(args.paths, texts):
+                print(f"{path}: ", end="", flush=True)
+                async for delta in client.stream(SYSTEM_PROMPT, text, TEMPERATURE):
+                    print(delta, end="", flush=True)
+                print()
+        else:
+            for path, result in zip(args.paths, await client.complete_many(SYSTEM_PROMPT, texts, TEMPERATURE)):
+                print(f"{path}: {result if isinstance(result, LLMError) else result.text.strip()}")
+    finally:
+        await close_llm_client()
+    print(json.dumps({"seconds": round(time.perf_counter() - t0, 3), **llm_stats.report()}))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,29 +1,45 @@
 from fastapi.middleware.cors import CORSMiddleware
-from .db import get_session, engine, DATABASE_URL
-from pydantic import BaseModel, ConfigDict
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy import inspect, select, delete, text, or_, asc, desc, func
-from .models import JobPost
+from .db import get_session, async_sessionmaker, get_engine, pool_status, DATABASE_URL
+from . import repo
+from .utils_normalize import make_hash_key
+from .cache import response_cache, cached_json, cache_key
+from .description_store import description_store, SUMMARY_FIELDS
+from .cv_worker import cv_worker
+from .cv_cache import text_cache, title_cache
+from .extract_cv_text import CV_MAX_PDF_BYTES
+from . import metrics
+from pydantic import BaseModel, ConfigDict, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import inspect, select, delete, text, or_, and_, asc, desc, func, tuple_, exists
+from sqlalchemy.orm import aliased
+from .models import JobPost, JobMatch, JobFacet
 from datetime import datetime
 from typing import Literal
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from uuid import UUID
-import os, json, pathlib
+import os, io, re, sys, csv, json, zlib, base64, asyncio, binascii
+import orjson
 
 app = FastAPI()
 
+# SCHEMA_CHECK=1 prints job_post's live columns at boot, to diagnose schema
+# drift. Off by default: it costs a connection and a catalog query per start.
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "0") == "1"
+
 @app.on_event("startup")
 async def startup_event():
-    """
-    On startup, connect to the DB and print the actual columns
-    of the job_post table to diagnose schema issues.
-    """
+    if SCHEMA_CHECK:
+        await schema_check()
+    await cv_worker.start()
+
+async def schema_check():
+    """Connect to the DB and print the actual columns of the job_post table."""
     print("--- Database Schema Diagnostic ---")
     print(f"--- Application connecting to database at URL: {DATABASE_URL} ---")
     try:
-        # Use a separate engine for a one-off inspection
-        engine = create_async_engine(DATABASE_URL)
-        async with engine.connect() as conn:
+        # Borrow a connection from the shared pool (this also warms it up)
+        async with get_engine().connect() as conn:
             def get_columns(sync_conn):
                 inspector = inspect(sync_conn)
                 return inspector.get_columns('job_post')
@@ -39,11 +55,36 @@ async def startup_event():
         print("This might mean the 'job_post' table does not exist at all.")
     print("---------------------------------")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await cv_worker.stop()
+    if dedup := sys.modules.get("backend.dedup"):  # only loaded once something was written
+        await dedup.stop()
+
+def request_dedup():
+    # imported on first write: dedup pulls in numpy, which the read path never needs
+    from .dedup import request_dedup
+    request_dedup()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000","http://127.0.0.1:3000", "job-tracker-one-pearl.vercel.app"],
     allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
+# outermost, so the latency includes every other middleware
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.register_stats("db_pool", pool_status)
+metrics.register_stats("response_cache", response_cache.stats)
+metrics.register_stats("cv_text_cache", text_cache.stats)
+metrics.register_stats("cv_title_cache", title_cache.stats)
+
+def llm_stats():
+    # imported on scrape rather than at startup: llm_client pulls in httpx
+    from .llm_client import llm_stats
+    return llm_stats.report()
+
+metrics.register_stats("llm", llm_stats)
 
 class JobIn(BaseModel):
     title: str
@@ -60,53 +101,357 @@ class JobIn(BaseModel):
 class JobOut(JobIn):
     id: UUID                                # <-- UUID, not str
     created_at: datetime | None = None      # <-- datetime, not str
+    canonical_job_id: UUID | None = None    # set when this is a near-duplicate of another job
     model_config = ConfigDict(from_attributes=True)  # Pydantic v2 "orm_mode"
 
+# GET /jobs column sets. `card` is what JobCard renders; it leaves out the JSONB
+# description_sections, which is most of a row's size.
+JOB_FIELDS = tuple(JobOut.model_fields)
+JOB_VIEWS = {
+    "full": JOB_FIELDS,
+    "card": ("id", "title", "company", "location", "source", "posted_at",
+             "salary_text", "description_snippet", "canonical_url"),
+}
+
+def job_fields(view: str, fields: str | None) -> tuple[str, ...]:
+    """Columns for a /jobs response: `fields` (comma-separated) overrides `view`; id is always included."""
+    if not fields:
+        return JOB_VIEWS[view]
+    wanted = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = set(wanted) - set(JOB_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return ("id",) + tuple(f for f in wanted if f != "id")
+
+def prefix_tsquery(q: str):
+    """Search-as-you-type tsquery: every word must match, as a prefix."""
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    return func.to_tsquery("english", " & ".join(f"{w}:*" for w in words))
+
+def filter_jobs(stmt, q=None, search="substring", source=None, include_inactive=False, collapse_duplicates=False):
+    """Apply the /jobs filters to `stmt`. Returns (stmt, tsquery or None)."""
+    if not include_inactive:
+        # bare `is_active` so the planner can use the partial (where is_active) indexes
+        stmt = stmt.where(JobPost.is_active)
+
+    if collapse_duplicates:
+        # one row per near-duplicate cluster (backend/dedup.py): the canonical job,
+        # or a duplicate standing in for a canonical that is no longer listed
+        if include_inactive:
+            stmt = stmt.where(JobPost.canonical_job_id.is_(None))
+        else:
+            canonical = aliased(JobPost)
+            stmt = stmt.where(or_(
+                JobPost.canonical_job_id.is_(None),
+                ~exists().where(canonical.id == JobPost.canonical_job_id, canonical.is_active),
+            ))
+
+    tsquery = None
+    if q and search == "fulltext":
+        # Served by the GIN index on search_vector
+        tsquery = prefix_tsquery(q)
+        if tsquery is not None:
+            stmt = stmt.where(JobPost.search_vector.op("@@")(tsquery))
+    elif q:
+        ilike = f"%{q}%"
+        stmt = stmt.where(or_(
+            JobPost.title.ilike(ilike),
+            JobPost.company.ilike(ilike),
+            JobPost.location.ilike(ilike),
+        ))
+
+    if source:
+        stmt = stmt.where(JobPost.source == source)
+    return stmt, tsquery
+
+def encode_cursor(posted_at: datetime | None, job_id: UUID) -> str:
+    raw = f"{posted_at.isoformat() if posted_at else ''},{job_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        posted_at, job_id = raw.rsplit(",", 1)
+        return (datetime.fromisoformat(posted_at) if posted_at else None), UUID(job_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def after_cursor(cursor: str, sort: str):
+    """Keyset predicate for rows after `cursor` in (posted_at, id) order.
+
+    Mirrors Postgres' default NULL placement so it matches a plain scan of
+    ix_job_post_live_posted_id: NULL dates sort first descending, last ascending.
+    """
+    posted_at, job_id = decode_cursor(cursor)
+    if sort == "posted_at_asc":
+        if posted_at is None:
+            return and_(JobPost.posted_at.is_(None), JobPost.id > job_id)
+        return or_(tuple_(JobPost.posted_at, JobPost.id) > tuple_(posted_at, job_id), JobPost.posted_at.is_(None))
+    if posted_at is None:
+        return or_(and_(JobPost.posted_at.is_(None), JobPost.id < job_id), JobPost.posted_at.is_not(None))
+    return tuple_(JobPost.posted_at, JobPost.id) < tuple_(posted_at, job_id)
+
 # --- Endpoints ---
 @app.get("/jobs", response_model=list[JobOut])
 async def list_jobs(
+    request: Request,
     q: str | None = None,
+    search: Literal["substring","fulltext"] = "substring",
     source: str | None = None,
-    sort: Literal["posted_at_desc","posted_at_asc"] = "posted_at_desc",
+    sort: Literal["relevance","posted_at_desc","posted_at_asc"] | None = None,
     page: int = 1,
     limit: int = 10,
+    after: str | None = None,
     include_inactive: bool = False,
+    collapse_duplicates: bool = False,
+    view: Literal["full","card"] = "full",
+    fields: str | None = None,
     session: AsyncSession = Depends(get_session),
 ):
-    stmt = select(JobPost)
-    if not include_inactive:
-        stmt = stmt.where(JobPost.is_active.is_(True))
+    """List jobs. Page with `page` (OFFSET) or, for date sorts, with the
+    opaque `after` cursor returned in the X-Next-Cursor header (keyset).
+    `collapse_duplicates` shows one job per near-duplicate cluster.
+    `view=card` or `fields=a,b,c` returns only those columns."""
+    columns = job_fields(view, fields)
+    key = cache_key("jobs", q=q, search=search, source=source, sort=sort, page=page,
+                    limit=limit, after=after, include_inactive=include_inactive,
+                    collapse_duplicates=collapse_duplicates, columns=",".join(columns))
+    return await cached_json(request, key, lambda: _list_jobs(
+        session, q, search, source, sort, page, limit, after, include_inactive, collapse_duplicates, columns))
 
-    if q:
-        ilike = f"%{q}%"
-        stmt = stmt.where(or_(
-            JobPost.title.ilike(ilike),
-            JobPost.company.ilike(ilike),
-            JobPost.location.ilike(ilike),
-        ))
+async def _list_jobs(session, q, search, source, sort, page, limit, after, include_inactive,
+                     collapse_duplicates=False, columns=JOB_FIELDS):
+    # Select just the requested columns (plus the cursor's), never whole entities
+    selected = columns + tuple(c for c in ("posted_at", "id") if c not in columns)
+    stmt = select(*(getattr(JobPost, c) for c in selected))
+    stmt, tsquery = filter_jobs(stmt, q, search, source, include_inactive, collapse_duplicates)
 
-    if source:
-        stmt = stmt.where(JobPost.source == source)
+    # Full-text results are ranked by relevance unless a date sort is requested
+    if sort is None:
+        sort = "relevance" if tsquery is not None else "posted_at_desc"
+    keyset = not (sort == "relevance" and tsquery is not None)
+    if not keyset:
+        stmt = stmt.order_by(desc(func.ts_rank(JobPost.search_vector, tsquery)), desc(JobPost.posted_at))
+    else:
+        # id breaks ties so the order is total and stable across requests
+        order = asc if sort == "posted_at_asc" else desc
+        stmt = stmt.order_by(order(JobPost.posted_at), order(JobPost.id))
 
-    stmt = stmt.order_by(
-        desc(JobPost.posted_at) if sort == "posted_at_desc" else asc(JobPost.posted_at)
-    )
+    if after:
+        if not keyset:
+            raise HTTPException(status_code=400, detail="Cursor pagination requires a posted_at sort")
+        stmt = stmt.where(after_cursor(after, sort))
+    else:
+        stmt = stmt.offset((page - 1) * limit)
+    stmt = stmt.limit(limit)
+
+    rows = (await session.execute(stmt)).all()
+    headers = {}
+    if keyset and len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].posted_at, rows[-1].id)
+    # Straight from row tuples to JSON: the columns are already JobOut's types,
+    # so per-row model validation would only cost time (zip drops the cursor extras)
+    body = orjson.dumps([dict(zip(columns, row)) for row in rows], option=orjson.OPT_UTC_Z)
+    return body, headers
 
-    offset = (page - 1) * limit
-    stmt = stmt.offset(offset).limit(limit)
 
-    rows = (await session.execute(stmt)).scalars().all()
-    return rows
+# --- Export ---
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))  # rows per server-side cursor fetch
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", "4"))  # favour throughput over ratio
 
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+async def export_rows(stmt, columns: tuple[str, ...], format: str = "ndjson", compress: bool = False,
+                      batch_size: int = EXPORT_BATCH_SIZE):
+    """Yields `stmt`'s rows encoded as NDJSON or CSV, one chunk per fetched batch.
+
+    Rows come through a server-side cursor (session.stream) batch_size at a
+    time, so memory stays flat however many rows are exported.
+    """
+    gzip = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def encode(rows) -> bytes:
+        if format == "csv":
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_value(v) for v in row] for row in rows)
+            data = buffer.getvalue().encode()
+        else:
+            data = b"".join(orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_UTC_Z) + b"\n"
+                            for row in rows)
+        return gzip.compress(data) if gzip else data
+
+    if format == "csv":
+        yield encode([columns])
+    async with async_sessionmaker() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            if chunk := encode(rows):
+                yield chunk
+    if gzip:
+        yield gzip.flush()
+
+@app.get("/jobs/export")
+async def export_jobs(
+    request: Request,
+    format: Literal["ndjson","csv"] = "ndjson",
+    q: str | None = None,
+    search: Literal["substring","fulltext"] = "substring",
+    source: str | None = None,
+    include_inactive: bool = False,
+    collapse_duplicates: bool = False,
+    view: Literal["full","card"] = "full",
+    fields: str | None = None,
+):
+    """Stream every job matching the /jobs filters, unpaged and in no particular
+    order. Sent gzip-compressed when the client accepts it."""
+    columns = job_fields(view, fields)
+    stmt, _ = filter_jobs(select(*(getattr(JobPost, c) for c in columns)),
+                          q, search, source, include_inactive, collapse_duplicates)
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {"Content-Disposition": f'attachment; filename="jobs.{format}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    headers["Vary"] = "Accept-Encoding"
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(export_rows(stmt, columns, format, compress), media_type=media_type, headers=headers)
+
+def job_row(payload: JobIn) -> dict:
+    """The job_post columns for a JobIn; hash_key is derived when missing."""
+    row = payload.model_dump()
+    if not row["hash_key"]:
+        row["hash_key"] = make_hash_key(row["source"], row["title"], row["company"],
+                                        row["location"], row["canonical_url"])
+    return row
 
 @app.post("/jobs", response_model=JobOut)
 async def create_job(payload: JobIn, session: AsyncSession = Depends(get_session)):
-    job = JobPost(**payload.model_dump())
+    job = JobPost(**job_row(payload))
     session.add(job)
     await session.commit()
+    response_cache.invalidate()
+    request_dedup()
     await session.refresh(job)
     return job
 
+# --- Bulk ingest ---
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))  # lines parsed before they are written
+BULK_MAX_LINE_BYTES = int(os.getenv("BULK_MAX_LINE_BYTES", str(1024 * 1024)))
+
+async def ndjson_lines(chunks, max_line_bytes: int = BULK_MAX_LINE_BYTES):
+    """Yields (line_number, line) for the non-blank lines of an NDJSON byte stream.
+
+    Holds at most one partial line; a line longer than `max_line_bytes` is
+    dropped and yielded as None.
+    """
+    buffer, line_no, overflow = b"", 0, False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if overflow or len(line) > max_line_bytes:
+                overflow = False
+                yield line_no, None
+            elif line.strip():
+                yield line_no, line
+        if len(buffer) > max_line_bytes:
+            overflow, buffer = True, b""
+    if overflow or buffer.strip():
+        yield line_no + 1, None if overflow or len(buffer) > max_line_bytes else buffer
+
+def bulk_row(line: bytes | None) -> dict:
+    """A repo.upsert_jobs row for one NDJSON line; hash_key is derived when missing."""
+    if line is None:
+        raise ValueError(f"line longer than {BULK_MAX_LINE_BYTES} bytes")
+    return job_row(JobIn.model_validate_json(line))
+
+async def bulk_upsert(pending: list[tuple]) -> list[dict]:
+    """Upsert the valid rows in `pending` [(line, row or error)] and build each line's result, in order.
+
+    Rows are written one repo.upsert_jobs statement (UPSERT_CHUNK_SIZE rows)
+    at a time, each committed on its own, so a database error is reported for
+    exactly the lines whose statement failed; earlier ones are already stored.
+    """
+    valid = [i for i, (_, row) in enumerate(pending) if isinstance(row, dict)]
+    outcome = {}  # index into pending -> written row, or the database error
+    for start in range(0, len(valid), repo.UPSERT_CHUNK_SIZE):
+        chunk = valid[start:start + repo.UPSERT_CHUNK_SIZE]
+        try:
+            async with async_sessionmaker() as session:
+                written = {w.hash_key: w for w in await repo.upsert_jobs(session, [pending[i][1] for i in chunk])}
+            outcome.update((i, written[pending[i][1]["hash_key"]]) for i in chunk)
+        except Exception as e:
+            outcome.update((i, f"database error: {e}") for i in chunk)
+    results = []
+    for i, (line_no, row) in enumerate(pending):
+        w = outcome.get(i, row)
+        if isinstance(w, str):
+            results.append({"line": line_no, "status": "error", "error": w})
+        else:
+            results.append({"line": line_no, "status": "inserted" if w.inserted else "updated",
+                            "id": w.id, "hash_key": w.hash_key})
+    return results
+
+class RequestStreamingResponse(StreamingResponse):
+    """A StreamingResponse that never calls receive(), so the body generator can
+    keep reading the request while the response is already streaming (Starlette
+    otherwise listens for a disconnect on the same channel and swallows body chunks)."""
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+@app.post("/jobs/bulk")
+async def bulk_jobs(request: Request, results: Literal["all","errors"] = "all"):
+    """Upsert jobs sent as NDJSON, one JobIn per line.
+
+    Lines are upserted BULK_CHUNK_SIZE at a time while the body is still
+    arriving, so memory stays bounded however many jobs are sent. The response
+    is NDJSON too: one result per input line, in order ({"line", "status":
+    inserted|updated|error, "id", "hash_key"} or {"line", "status", "error"}),
+    then a {"summary": ...} line. Clients that only read the response after
+    sending the whole body (requests, httpx) should pass results=errors, or
+    the unread results back up and stall the upload.
+    """
+    async def stream():
+        summary = {"lines": 0, "inserted": 0, "updated": 0, "errors": 0}
+        pending = []
+        async def flush():
+            lines = await bulk_upsert(pending)
+            pending.clear()
+            for r in lines:
+                summary["lines"] += 1
+                summary["errors" if r["status"] == "error" else r["status"]] += 1
+            return b"".join(orjson.dumps(r) + b"\n" for r in lines
+                            if results == "all" or r["status"] == "error")
+
+        async for line_no, line in ndjson_lines(request.stream()):
+            try:
+                pending.append((line_no, bulk_row(line)))
+            except ValidationError as e:
+                pending.append((line_no, "; ".join(f"{'.'.join(map(str, err['loc'])) or 'line'}: {err['msg']}"
+                                                   for err in e.errors(include_url=False))))
+            except ValueError as e:
+                pending.append((line_no, str(e)))
+            if len(pending) >= BULK_CHUNK_SIZE and (chunk := await flush()):
+                yield chunk
+        if pending and (chunk := await flush()):
+            yield chunk
+        if summary["inserted"] or summary["updated"]:
+            request_dedup()
+        yield orjson.dumps({"summary": summary}) + b"\n"
+
+    return RequestStreamingResponse(stream(), media_type="application/x-ndjson")
+
 @app.get("/jobs/{job_id}", response_model=JobOut)
 async def get_job(job_id: UUID, session: AsyncSession = Depends(get_session)):
     result = await session.execute(select(JobPost).where(JobPost.id == job_id))
@@ -123,6 +468,7 @@ async def delete_job(job_id: UUID, session: AsyncSession = Depends(get_session))
         raise HTTPException(status_code=404, detail="Job not found")
     await session.delete(job)
     await session.commit()
+    response_cache.invalidate()
     return {"ok": True}
 
 class SourceStat(BaseModel):
@@ -135,21 +481,128 @@ class StatsOut(BaseModel):
     per_source: list[SourceStat]
 
 @app.get("/stats", response_model=StatsOut)
-async def stats(session: AsyncSession = Depends(get_session)):
-    total_active = await session.scalar(
-        select(func.count()).select_from(JobPost).where(JobPost.is_active.is_(True))
-    )
+async def stats(request: Request, session: AsyncSession = Depends(get_session)):
+    return await cached_json(request, cache_key("stats"), lambda: _stats(session))
 
+async def _stats(session: AsyncSession):
+    # Counts come from the trigger-maintained job_facet rows, and each source's
+    # last_seen from one backward scan of ix_job_post_live_source_last_seen
+    last_seen = (
+        select(func.max(JobPost.last_seen))
+        .where(JobPost.source == JobFacet.value, JobPost.is_active)
+        .scalar_subquery()
+    )
     rows = (await session.execute(
-        select(
-            JobPost.source.label("source"),
-            func.count().filter(JobPost.is_active.is_(True)).label("active_count"),
-            func.max(JobPost.last_seen).label("last_seen"),
-        ).group_by(JobPost.source)
+        select(JobFacet.value, JobFacet.active_count, last_seen.label("last_seen"))
+        .where(JobFacet.scope == "", JobFacet.facet == "source", JobFacet.row_count > 0)
+        .order_by(JobFacet.value)
     )).all()
 
-    per_source = [SourceStat(source=r.source, active_count=r.active_count or 0, last_seen=r.last_seen) for r in rows]
-    return StatsOut(total_active=total_active or 0, per_source=per_source)
+    total_active = sum(r.active_count for r in rows)
+    per_source = [SourceStat(source=r.value, active_count=r.active_count, last_seen=r.last_seen) for r in rows]
+    return StatsOut(total_active=total_active, per_source=per_source).model_dump_json().encode(), {}
+
+# --- Facets ---
+FACETS = ("source", "location", "company")
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class FacetsOut(BaseModel):
+    total: int
+    source: list[FacetCount]
+    location: list[FacetCount]
+    company: list[FacetCount]
+
+@app.get("/facets", response_model=FacetsOut)
+async def get_facets(
+    request: Request,
+    q: str | None = None,
+    search: Literal["substring","fulltext"] = "substring",
+    source: str | None = None,
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+):
+    """Active-job counts per source, location and company (top `limit` each) for
+    the same q/search/source filters as GET /jobs. The source facet ignores
+    `source`, so the other sources stay selectable. Without `q` the counts come
+    from job_facet; with `q` they are counted live in one grouping-sets scan."""
+    key = cache_key("facets", q=q, search=search, source=source, limit=limit)
+    if q:
+        build = lambda: _live_facets(session, q, search, source, limit)
+    else:
+        build = lambda: _stored_facets(session, source, limit)
+    return await cached_json(request, key, build)
+
+async def _stored_facets(session: AsyncSession, source: str | None, limit: int):
+    async def top(scope: str, facet: str) -> list[FacetCount]:
+        rows = (await session.execute(
+            select(JobFacet.value, JobFacet.active_count)
+            .where(JobFacet.scope == scope, JobFacet.facet == facet, JobFacet.active_count > 0,
+                   JobFacet.value != "")
+            .order_by(JobFacet.active_count.desc(), JobFacet.value)
+            .limit(limit)
+        )).all()
+        return [FacetCount(value=r.value, count=r.active_count) for r in rows]
+
+    # the source rows (including '' for jobs without one) add up to the total
+    total = await session.scalar(
+        select(func.sum(JobFacet.active_count))
+        .where(JobFacet.scope == "", JobFacet.facet == "source", *([JobFacet.value == source] if source else []))
+    )
+    out = FacetsOut(total=total or 0, source=await top("", "source"),
+                    location=await top(source or "", "location"), company=await top(source or "", "company"))
+    return out.model_dump_json().encode(), {}
+
+async def _live_facets(session: AsyncSession, q: str, search: str, source: str | None, limit: int):
+    columns = [getattr(JobPost, f) for f in FACETS]
+    in_source = func.count().filter(JobPost.source == source) if source else func.count()
+    stmt = select(*columns, func.count().label("n"), in_source.label("n_source"),
+                  func.grouping(*columns).label("sets"))
+    # the source facet needs counts across sources, so `source` is applied per aggregate instead
+    stmt, _ = filter_jobs(stmt, q, search)
+    stmt = stmt.group_by(func.grouping_sets(*(tuple_(c) for c in columns), tuple_()))
+
+    # grouping() sets a bit for each column *not* in the row's grouping set
+    bits = {0b011: "source", 0b101: "location", 0b110: "company"}
+    counts = {f: [] for f in FACETS}
+    total = 0
+    for row in (await session.execute(stmt)).all():
+        if row.sets == 0b111:
+            total = row.n_source
+            continue
+        facet = bits[row.sets]
+        value = getattr(row, facet)
+        count = row.n if facet == "source" else row.n_source
+        if value and count:
+            counts[facet].append(FacetCount(value=value, count=count))
+    top = {f: sorted(c, key=lambda fc: (-fc.count, fc.value))[:limit] for f, c in counts.items()}
+    return FacetsOut(total=total, **top).model_dump_json().encode(), {}
+
+class MatchOut(BaseModel):
+    rank: int
+    score: float
+    job: JobOut
+
+@app.get("/matches/{cv_id}", response_model=list[MatchOut])
+async def get_matches(
+    cv_id: str,
+    limit: int = Query(20, ge=1, le=200),
+    include_inactive: bool = False,
+    session: AsyncSession = Depends(get_session),
+):
+    """Best-matching jobs for a CV, by the SHA-256 of its PDF (see backend/matching.py)."""
+    stmt = select(JobMatch.rank, JobMatch.score, JobPost).join(JobPost, JobPost.id == JobMatch.job_id)
+    stmt = stmt.where(JobMatch.cv_id == cv_id).order_by(JobMatch.rank)
+    if not include_inactive:
+        stmt = stmt.where(JobPost.is_active)
+    rows = (await session.execute(stmt.limit(limit))).all()
+    if not rows:
+        stored = await session.scalar(select(func.count()).select_from(JobMatch).where(JobMatch.cv_id == cv_id))
+        if not stored:
+            raise HTTPException(status_code=404, detail="No matches for this CV")
+    return [MatchOut(rank=r.rank, score=r.score, job=JobOut.model_validate(r.JobPost)) for r in rows]
 
 @app.get("/healthz")
 async def healthz():
@@ -157,41 +610,111 @@ async def healthz():
 
 @app.get("/dbz")
 async def dbz():
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         val = await conn.scalar(text("SELECT 1"))
     return {"db_ok": (val == 1)}
 
-def get_job_desc_dir() -> pathlib.Path:
-    job_desc_dir = pathlib.Path(__file__).parent / "job_descriptions"
-    job_desc_dir.mkdir(exist_ok=True) # Ensure it exists
-    return job_desc_dir
+@app.get("/poolz")
+async def poolz():
+    return pool_status()
 
-# List all job description JSON files and their metadata
-@app.get("/job-descriptions")
-async def list_job_descriptions(job_desc_dir: pathlib.Path = Depends(get_job_desc_dir)):
-    job_files = [f for f in os.listdir(job_desc_dir) if f.endswith(".json")]
-    jobs = []
+@app.get("/cachez")
+async def cachez():
+    return response_cache.stats()
 
-    for filename in job_files:
-        path = os.path.join(job_desc_dir, filename)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                job = json.load(f)
-                job["filename"] = filename
-                jobs.append(job)
-        except Exception as e:
-            print(f"Error reading {filename}: {e}")
-    return jobs
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of backend/metrics.py."""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# List indexed job description files (summaries only; see description_store)
+@app.get("/job-descriptions")
+async def list_job_descriptions(
+    response: Response,
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+    fields: str | None = None,
+):
+    wanted = SUMMARY_FIELDS
+    if fields:
+        wanted = tuple(f.strip() for f in fields.split(",") if f.strip())
+        unknown = set(wanted) - set(SUMMARY_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    total, items = await description_store.list((page - 1) * limit, limit, wanted)
+    response.headers["X-Total-Count"] = str(total)
+    return items
 
 # Fetch a specific job description JSON file by filename
 @app.get("/job-descriptions/{filename}")
-async def get_job_description(filename: str, job_desc_dir: pathlib.Path = Depends(get_job_desc_dir)):
-    path = job_desc_dir / filename
-    if not os.path.exists(path):
-        raise HTTPException(status_code=404, detail="Job description not found")
+async def get_job_description(filename: str):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            job = json.load(f)
-        return job
+        job = await description_store.read(filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading job description: {e}")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return job
+
+# --- CV processing (see cv_worker) ---
+CV_FORM_OVERHEAD = 64 * 1024  # multipart boundaries and part headers around the PDF
+
+@app.post("/cv", status_code=202)
+async def upload_cv(request: Request):
+    """Multipart form with the PDF in its `cv` field."""
+    too_large = HTTPException(status_code=413, detail=f"CV is larger than {CV_MAX_PDF_BYTES} bytes")
+    max_body = CV_MAX_PDF_BYTES + CV_FORM_OVERHEAD
+    # Refuse from the header before the body is parsed
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_body:
+        raise too_large
+
+    # A chunked body has no Content-Length: count what arrives and stop the
+    # parser at the limit, before it spools the rest to disk
+    received = 0
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > max_body:
+                raise too_large
+        return message
+
+    async with Request(request.scope, receive).form(max_files=1) as form:
+        cv = form.get("cv")
+        if cv is None or isinstance(cv, str):
+            raise HTTPException(status_code=400, detail="No file uploaded")
+        if cv.size is not None and cv.size > CV_MAX_PDF_BYTES:
+            raise too_large
+        # never hold more than the limit in memory, whatever the client claimed
+        data = await cv.read(CV_MAX_PDF_BYTES + 1)
+    if not data:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    if len(data) > CV_MAX_PDF_BYTES:
+        raise too_large
+    try:
+        job = await cv_worker.submit(cv.filename or "cv.pdf", data)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Too many CVs waiting, try again shortly",
+                            headers={"Retry-After": "30"})
+    return {"job_id": job.id, "status": job.status, "status_url": f"/cv/jobs/{job.id}"}
+
+@app.get("/cv/jobs/{job_id}")
+async def get_cv_job(job_id: str):
+    job = cv_worker.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="CV job not found")
+    return job.snapshot()
+
+@app.get("/cv/jobs/{job_id}/events")
+async def cv_job_events(job_id: str):
+    """Server-sent events: one `data:` line per status change."""
+    if not cv_worker.get(job_id):
+        raise HTTPException(status_code=404, detail="CV job not found")
+
+    async def stream():
+        async for snapshot in cv_worker.events(job_id):
+            yield f"data: {json.dumps(snapshot)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
@@ -0,0 +1,335 @@
+# backend/matching.py
+"""Rank active jobs against a CV with hashed TF-IDF vectors.
+
+Every active job is turned into a MATCH_DIM-wide vector. Each word goes to
+one of MATCH_DIM buckets, with a sign, via the crc32 hash shared with
+backend/dedup.py. Weights are sublinear tf times a per-bucket idf, and each
+vector is L2-normalised. Job vectors form one float32 matrix stored as .npy
+under MATCH_INDEX_DIR and memory-mapped on load, so a process pays for the
+pages it touches rather than a copy. Ranking a CV is a single matrix-vector
+product plus argpartition: about 20ms for 100k jobs at 512 dimensions (see
+benchmarks/bench_matching.py).
+
+Jobs added after the index was built are vectorised on the fly, so fresh
+search results are matched before the next rebuild. The top-k per CV is
+written to job_match, keyed by the CV's sha256 (cv_cache.pdf_key), and
+served at GET /matches/{cv_id}.
+
+    python -m backend.matching build
+    python -m backend.matching match path/to/cv.pdf [--top 20]
+"""
+import os, sys, json, time, shutil, asyncio, argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import UUID
+import numpy as np
+
+from backend.dedup import tokenize, token_hash
+
+MATCH_DIM = int(os.getenv("MATCH_DIM", "512"))  # power of two
+MATCH_TOP_K = int(os.getenv("MATCH_TOP_K", "50"))
+MATCH_INDEX_DIR = Path(os.getenv("MATCH_INDEX_DIR", str(Path(__file__).parent / ".cache" / "match")))
+MATCH_MAX_FRESH = int(os.getenv("MATCH_MAX_FRESH", "20000"))  # jobs newer than the index scored on the fly
+MATCH_BATCH_SIZE = 5000
+TITLE_WEIGHT = 3  # title words count this many times
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the their this to we will with "
+    "you your who what which all any can may must not other such than that these they into over per".split()
+)
+
+# ---- Vectorising ----
+
+def _hashes(text: str) -> np.ndarray:
+    tokens = [t for t in tokenize(text) if t not in STOPWORDS and len(t) > 1]
+    return np.fromiter(map(token_hash, tokens), dtype=np.uint32, count=len(tokens))
+
+def job_document(title: str | None, snippet: str | None, sections: dict | None) -> str:
+    parts = [title or ""] * TITLE_WEIGHT
+    if sections:
+        parts.extend(item for items in sections.values() if isinstance(items, list)
+                     for item in items if isinstance(item, str))
+    elif snippet:
+        parts.append(snippet)
+    return " ".join(parts)
+
+def tf_matrix(texts, dim: int = MATCH_DIM) -> tuple[np.ndarray, np.ndarray]:
+    """Unweighted (n, dim) tf rows and the bucket document frequencies of `texts`.
+
+    Words are counted for the whole batch at once by keying each hash with its row.
+    """
+    hashes = [_hashes(t) for t in texts]
+    rows = np.zeros((len(hashes), dim), dtype=np.float32)
+    if not hashes:
+        return rows, np.zeros(dim, dtype=np.int64)
+    row_of = np.repeat(np.arange(len(hashes), dtype=np.uint64), [len(h) for h in hashes])
+    keys, counts = np.unique((row_of << np.uint64(32)) | np.concatenate(hashes).astype(np.uint64),
+                             return_counts=True)
+    row = (keys >> np.uint64(32)).astype(np.intp)
+    word = (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+    bucket = (word & np.uint32(dim - 1)).astype(np.intp)
+    weights = (1.0 + np.log(counts)).astype(np.float32)
+    weights[word >> np.uint32(31) == 1] *= -1  # the sign spreads colliding words around zero
+    np.add.at(rows, (row, bucket), weights)
+    # document frequency: distinct (row, bucket) pairs per bucket
+    present = np.unique(row * dim + bucket)
+    df = np.bincount(present % dim, minlength=dim).astype(np.int64)
+    return rows, df
+
+def idf_weights(df: np.ndarray, n_docs: int) -> np.ndarray:
+    return (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+def normalize(rows: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(rows, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    rows /= norms
+    return rows
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    best = np.argpartition(scores, -k)[-k:]
+    return best[np.argsort(-scores[best], kind="stable")]
+
+# ---- Index ----
+
+@dataclass
+class MatchIndex:
+    vectors: np.ndarray   # (n, dim) float32, rows L2-normalised
+    job_ids: np.ndarray   # (n, 16) uint8, UUID bytes
+    idf: np.ndarray       # (dim,) float32
+    built_at: datetime
+
+    @property
+    def dim(self) -> int:
+        return len(self.idf)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def job_id(self, i: int) -> UUID:
+        return UUID(bytes=self.job_ids[i].tobytes())
+
+    def vectorize(self, texts) -> np.ndarray:
+        rows, _ = tf_matrix(texts, self.dim)
+        rows *= self.idf
+        return normalize(rows)
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every job to each query row: one (n, dim) x (dim, q) product."""
+        return self.vectors @ queries.T
+
+    def save(self, directory: Path = MATCH_INDEX_DIR):
+        """Write a new generation, then flip CURRENT to it so readers never see a partial index."""
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"index-{self.built_at:%Y%m%dT%H%M%S%f}"
+        tmp = directory / f"{name}.tmp"
+        tmp.mkdir()
+        np.save(tmp / "vectors.npy", self.vectors)
+        np.save(tmp / "job_ids.npy", self.job_ids)
+        np.save(tmp / "idf.npy", self.idf)
+        (tmp / "meta.json").write_text(json.dumps({"built_at": self.built_at.isoformat(), "jobs": len(self)}))
+        tmp.rename(directory / name)
+        (directory / "CURRENT.tmp").write_text(name)
+        os.replace(directory / "CURRENT.tmp", directory / "CURRENT")
+        for old in directory.glob("index-*"):
+            if old.name != name:
+                shutil.rmtree(old, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path = MATCH_INDEX_DIR) -> "MatchIndex | None":
+        try:
+            path = directory / (directory / "CURRENT").read_text().strip()
+            meta = json.loads((path / "meta.json").read_text())
+            return cls(
+                vectors=np.load(path / "vectors.npy", mmap_mode="r"),
+                job_ids=np.load(path / "job_ids.npy"),
+                idf=np.load(path / "idf.npy"),
+                built_at=datetime.fromisoformat(meta["built_at"]),
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+class IndexBuilder:
+    """Accumulates tf rows batch by batch; idf needs the whole corpus, so it is applied in finish()."""
+
+    def __init__(self, dim: int = MATCH_DIM):
+        self.dim = dim
+        self._tf: list[np.ndarray] = []
+        self._ids: list[bytes] = []
+        self._df = np.zeros(dim, dtype=np.int64)
+
+    def add(self, rows):
+        """Add (job_id, title, snippet, sections) tuples."""
+        texts = []
+        for job_id, title, snippet, sections in rows:
+            self._ids.append(job_id.bytes)
+            texts.append(job_document(title, snippet, sections))
+        tf, df = tf_matrix(texts, self.dim)
+        self._tf.append(tf)
+        self._df += df
+
+    def finish(self, built_at: datetime | None = None) -> MatchIndex:
+        vectors = np.concatenate(self._tf) if self._tf else np.empty((0, self.dim), dtype=np.float32)
+        self._tf = []
+        idf = idf_weights(self._df, len(vectors))
+        vectors *= idf
+        return MatchIndex(
+            vectors=normalize(vectors),
+            job_ids=np.frombuffer(b"".join(self._ids), dtype=np.uint8).reshape(-1, 16),
+            idf=idf,
+            built_at=built_at or datetime.now(timezone.utc),
+        )
+
+def build_index(rows, built_at: datetime | None = None, dim: int = MATCH_DIM) -> MatchIndex:
+    """Build from (job_id, title, snippet, sections) tuples."""
+    builder = IndexBuilder(dim)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == MATCH_BATCH_SIZE:
+            builder.add(batch)
+            batch = []
+    if batch:
+        builder.add(batch)
+    return builder.finish(built_at)
+
+_index: MatchIndex | None = None
+_index_mtime: float | None = None
+
+def current_index() -> MatchIndex | None:
+    """The saved index, reloaded when another process has rebuilt it."""
+    global _index, _index_mtime
+    try:
+        mtime = (MATCH_INDEX_DIR / "CURRENT").stat().st_mtime
+    except OSError:
+        return None
+    if mtime != _index_mtime:
+        _index, _index_mtime = MatchIndex.load(), mtime
+    return _index
+
+# ---- Database ----
+
+JOB_COLUMNS = "id, title, description_snippet, description_sections"
+
+_rebuild_lock = asyncio.Lock()
+
+async def rebuild_index() -> MatchIndex:
+    """Re-vectorise every active job and save the result as the current index."""
+    from sqlalchemy import text
+    from backend.db import async_sessionmaker
+
+    started = time.perf_counter()
+    builder = IndexBuilder()
+    async with async_sessionmaker() as session:
+        # the database clock, so jobs created during the build count as fresh
+        built_at = await session.scalar(text("select now()"))
+        result = await session.stream(
+            text(f"select {JOB_COLUMNS} from job_post where is_active order by id")
+            .execution_options(yield_per=MATCH_BATCH_SIZE)
+        )
+        async for batch in result.partitions():
+            await asyncio.to_thread(builder.add, batch)
+    index = await asyncio.to_thread(builder.finish, built_at)
+    await asyncio.to_thread(index.save)
+    print(f"Match index: {len(index)} jobs x {index.dim} dims in {time.perf_counter() - started:.1f}s")
+    return index
+
+async def _fresh_jobs(session, built_at: datetime):
+    from sqlalchemy import text
+
+    return (await session.execute(
+        text(f"""
+            select {JOB_COLUMNS} from job_post
+             where is_active and created_at > :built_at
+             order by created_at desc limit :limit
+        """),
+        {"built_at": built_at, "limit": MATCH_MAX_FRESH},
+    )).all()
+
+async def _active_top_k(session, index: MatchIndex, scores: np.ndarray, k: int) -> list[tuple]:
+    """Top-k indexed jobs that are still active. The index keeps jobs deleted or
+    deactivated since it was built, so fetch extra and widen until k remain."""
+    from sqlalchemy import text
+
+    fetch, found = 2 * k, []
+    while True:
+        best = await asyncio.to_thread(top_k, scores, fetch)
+        ids = [index.job_id(i) for i in best]
+        active = set((await session.execute(
+            text("select id from job_post where id = any(cast(:ids as uuid[])) and is_active"),
+            {"ids": [str(i) for i in ids]},
+        )).scalars())
+        found = [(job_id, float(scores[i])) for job_id, i in zip(ids, best) if job_id in active]
+        if len(found) >= k or fetch >= len(scores):
+            return found[:k]
+        fetch *= 4
+
+def _score(index: MatchIndex, cv_text: str, fresh, k: int) -> tuple[np.ndarray, list[tuple]]:
+    """Scores of every indexed job and the top-k fresh ones; numpy work, so callers run it in a thread."""
+    query = index.vectorize([cv_text])
+    scores = index.scores(query)[:, 0]
+    if not fresh:
+        return scores, []
+    fresh_scores = index.vectorize(job_document(r.title, r.description_snippet, r.description_sections)
+                                   for r in fresh) @ query[0]
+    return scores, [(fresh[i].id, float(fresh_scores[i])) for i in top_k(fresh_scores, k)]
+
+async def match_text(session, cv_text: str, k: int = MATCH_TOP_K) -> list[tuple]:
+    """Top-k (job_id, score) for a CV across the index plus jobs created since it was built."""
+    index = current_index()
+    fresh = [] if index is None else await _fresh_jobs(session, index.built_at)
+    if index is None or len(fresh) == MATCH_MAX_FRESH:
+        # missing, or too stale to patch up on the fly
+        async with _rebuild_lock:
+            if current_index() is index:
+                await rebuild_index()
+        index = current_index()
+        fresh = await _fresh_jobs(session, index.built_at)
+
+    scores, fresh_top = await asyncio.to_thread(_score, index, cv_text, fresh, k)
+    candidates = await _active_top_k(session, index, scores, k) + fresh_top
+    # a job in both sets scores the same either way; keep one copy
+    candidates = list(dict(candidates).items())
+    candidates.sort(key=lambda c: c[1], reverse=True)
+    return candidates[:k]
+
+async def match_cv(cv_id: str, cv_text: str, k: int = MATCH_TOP_K) -> list[tuple]:
+    """Rank jobs for a CV and store the top-k in job_match."""
+    from backend.db import async_sessionmaker
+    from backend import repo
+
+    async with async_sessionmaker() as session:
+        matches = await match_text(session, cv_text, k)
+        await repo.save_matches(session, cv_id, matches)
+    return matches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="vectorise every active job")
+    match = sub.add_parser("match", help="rank jobs for a CV and store them in job_match")
+    match.add_argument("pdf")
+    match.add_argument("--top", type=int, default=MATCH_TOP_K)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        asyncio.run(rebuild_index())
+        return
+
+    from backend.cv_cache import pdf_key
+    from backend.cv_to_keywords import extract_text_cached
+
+    cv_id = pdf_key(Path(args.pdf).read_bytes())
+    cv_text = extract_text_cached(args.pdf)
+    if not cv_text:
+        sys.exit("Could not extract text from CV.")
+    for rank, (job_id, score) in enumerate(asyncio.run(match_cv(cv_id, cv_text, args.top)), start=1):
+        print(f"{rank:>3}  {score:.3f}  {job_id}")
+    print(f"cv_id {cv_id}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# backend/metrics.py
+"""In-process metrics in the Prometheus text format, served at GET /metrics.
+
+    http_request_duration_seconds{method,route,status}   MetricsMiddleware on the app
+    db_query_duration_seconds{statement}                 cursor events on the engine
+    http_client_request_duration_seconds{service,...}    httpx event hooks (JSearch,
+                                                         LM Studio, Gmail)
+
+plus the pool and cache counters already kept elsewhere (register_stats).
+Routes are labelled by their template (/jobs/{job_id}), never the raw path,
+so the series count stays bounded. Queries slower than DB_SLOW_QUERY_MS are
+printed with their SQL.
+
+Recording a sample is a bisect and two additions under a lock, about a
+microsecond (see benchmarks/bench_metrics.py), so this stays on in
+production. METRICS_ENABLED=0 turns the middleware and cursor timing off.
+"""
+import os, time, bisect, threading
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "500"))
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+CLIENT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = HTTP_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()  # to_thread workers observe too
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labelnames, labels)} {_number(v)}" for labels, v in items)
+        return lines
+
+class StatsCollector:
+    """Exposes the numeric values of a stats() dict (pool_status, cache stats) as untyped samples."""
+
+    def __init__(self, prefix: str, stats):
+        self.prefix = prefix
+        self.stats = stats
+
+    def render(self) -> list[str]:
+        try:
+            stats = self.stats()
+        except Exception as e:
+            return [f"# {self.prefix}: {e}"]
+        lines = []
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            lines.append(f"# TYPE {self.prefix}_{key} untyped")
+            lines.append(f"{self.prefix}_{key} {_number(value)}")
+        return lines
+
+REGISTRY: list = []
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+def register_stats(prefix: str, stats):
+    return register(StatsCollector(prefix, stats))
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+http_requests = register(Histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte.",
+    ("method", "route", "status"), HTTP_BUCKETS))
+db_queries = register(Histogram(
+    "db_query_duration_seconds", "Cursor execute time per statement.", ("statement",), DB_BUCKETS))
+db_slow_queries = register(Counter(
+    "db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_MS.", ("statement",)))
+client_requests = register(Histogram(
+    "http_client_request_duration_seconds", "Outbound request time to response headers.",
+    ("service", "method", "status"), CLIENT_BUCKETS))
+
+# ---- HTTP server ----
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware), so streaming bodies pass through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_requests.observe(time.perf_counter() - start, scope["method"],
+                                  getattr(route, "path", "unmatched"), status)
+
+# ---- SQL ----
+
+def _statement_kind(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+def instrument_engine(engine, slow_query_ms: float = DB_SLOW_QUERY_MS):
+    """Time every cursor execute on `engine` (an AsyncEngine or Engine) and log slow ones."""
+    if not METRICS_ENABLED:
+        return
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    slow = slow_query_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        kind = _statement_kind(statement)
+        db_queries.observe(elapsed, kind)
+        if elapsed >= slow:
+            db_slow_queries.inc(kind)
+            print(f"Slow query ({elapsed * 1000:.0f}ms): {' '.join(statement.split())[:500]}")
+
+# ---- HTTP clients ----
+
+def _observe_response(service: str, response):
+    start = response.request.extensions.get("metrics_start")
+    if start is not None:
+        client_requests.observe(time.perf_counter() - start, service, response.request.method,
+                                response.status_code)
+
+def httpx_hooks(service: str) -> dict:
+    """event_hooks for an httpx.Client."""
+    def on_request(request):
+        request.extensions["metrics_start"] = time.perf_counter()
+
+    def on_response(response):
+        _observe_response(service, response)
+
+    return {"request": [on_request], "response": [on_response]} if METRICS_ENABLED else {}
+
+def async_httpx_hooks(service: str) -> dict:
+    """event_hooks for an httpx.AsyncClient."""
+    async def on_request(request):
+        request.extensions["metrics_start"] = time.perf_counter()
+
+    async def on_response(response):
+        _observe_response(service, response)
+
+    return {"request": [on_request], "response": [on_response]} if METRICS_ENABLED else {}
@@ -0,0 +1,41 @@
+# backend/migrate.py
+"""Apply backend/migrations/*.sql in order, recording each in schema_migrations.
+
+Migrations are plain SQL and idempotent (`if not exists`), so they are also
+safe to run over a schema freshly built by `Base.metadata.create_all`.
+
+    python -m backend.migrate
+"""
+import asyncio
+from pathlib import Path
+from backend.db import get_engine
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+async def apply_migrations(verbose: bool = True) -> list[str]:
+    applied_now = []
+    async with get_engine().connect() as conn:
+        # asyncpg's own execute() runs multi-statement scripts, SQLAlchemy's doesn't
+        raw = (await conn.get_raw_connection()).driver_connection
+        await raw.execute("""
+            create table if not exists schema_migrations (
+                version    text primary key,
+                applied_at timestamptz not null default now()
+            )
+        """)
+        applied = {r["version"] for r in await raw.fetch("select version from schema_migrations")}
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            if path.stem in applied:
+                continue
+            if verbose:
+                print(f"--- Applying migration {path.name} ---")
+            async with raw.transaction():
+                await raw.execute(path.read_text(encoding="utf-8"))
+                await raw.execute("insert into schema_migrations (version) values ($1)", path.stem)
+            applied_now.append(path.stem)
+    if verbose:
+        print(f"--- {len(applied_now)} migration(s) applied. ---")
+    return applied_now
+
+if __name__ == "__main__":
+    asyncio.run(apply_migrations())
@@ -0,0 +1,12 @@
+-- Full-text search over title/company/location/description for GET /jobs?search=fulltext
+-- Expression must match models.SEARCH_VECTOR_SQL
+alter table job_post
+  add column if not exists search_vector tsvector
+  generated always as (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(company, '') || ' ' || coalesce(location, '')), 'B') ||
+    setweight(coalesce(jsonb_to_tsvector('english', description_sections, '["string"]'), ''::tsvector), 'C') ||
+    setweight(to_tsvector('english', coalesce(description_snippet, '')), 'D')
+  ) stored;
+
+create index if not exists ix_job_post_search_vector on job_post using gin (search_vector);
@@ -0,0 +1,3 @@
+-- Keyset pagination for GET /jobs?after=<cursor>: (is_active, posted_at, id)
+-- serves both date sorts (scanned forwards or backwards) without OFFSET.
+create index if not exists ix_job_post_active_posted_id on job_post (is_active, posted_at, id);
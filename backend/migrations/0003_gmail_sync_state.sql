@@ -0,0 +1,6 @@
+-- historyId checkpoint per Gmail account for incremental sync (backend/gmail_ingest.py)
+create table if not exists gmail_sync_state (
+  account    text primary key,
+  history_id bigint not null,
+  updated_at timestamptz not null default now()
+);
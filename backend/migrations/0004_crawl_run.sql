@@ -0,0 +1,28 @@
+-- One row per ingest run (backend/crawl.py): when it started, what it touched
+-- and how many rows it deactivated.
+create table if not exists crawl_run (
+  id               uuid primary key default gen_random_uuid(),
+  source           text not null,
+  query            text,
+  full_crawl       boolean not null default false,
+  status           text not null default 'running',  -- running | succeeded | failed
+  started_at       timestamptz not null default now(),
+  finished_at      timestamptz,
+  duration_seconds double precision,
+  rows_seen        integer not null default 0,
+  rows_inserted    integer not null default 0,
+  rows_updated     integer not null default 0,
+  rows_touched     integer not null default 0,
+  rows_deactivated integer not null default 0,
+  error            text
+);
+
+create index if not exists ix_crawl_run_source_started on crawl_run (source, started_at);
+
+-- Partial indexes over live rows only, so hot queries don't scan or maintain
+-- entries for deactivated jobs. The first replaces the full
+-- (is_active, posted_at, id) index from 0002 for GET /jobs keyset pagination.
+-- The second serves deactivate_missing_for_source and per-source counts.
+create index if not exists ix_job_post_live_posted_id on job_post (posted_at, id) where is_active;
+create index if not exists ix_job_post_live_source_last_seen on job_post (source, last_seen) where is_active;
+drop index if exists ix_job_post_active_posted_id;
@@ -0,0 +1,13 @@
+-- Saved JSearch queries run on an interval by backend/scheduler.py
+create table if not exists saved_query (
+  id               serial primary key,
+  query            text not null unique,
+  num_pages        integer not null default 1,
+  interval_seconds integer not null default 3600,
+  enabled          boolean not null default true,
+  next_run_at      timestamptz not null default now(),
+  last_run_at      timestamptz,
+  last_run_id      uuid references crawl_run (id) on delete set null
+);
+
+create index if not exists ix_saved_query_due on saved_query (next_run_at) where enabled;
@@ -0,0 +1,39 @@
+-- Near-duplicate clusters (backend/dedup.py). canonical_job_id is NULL for a
+-- cluster's canonical row; minhash holds the MinHash signature (64 x uint32)
+-- and deduped_at marks rows already clustered.
+alter table job_post
+  add column if not exists canonical_job_id uuid references job_post (id) on delete set null,
+  add column if not exists minhash bytea,
+  add column if not exists deduped_at timestamptz;
+
+create index if not exists ix_job_post_canonical on job_post (canonical_job_id) where canonical_job_id is not null;
+create index if not exists ix_job_post_dedup_pending on job_post (created_at, id) where deduped_at is null;
+
+-- clusters written since a process last looked (dedup._load catch-up)
+create index if not exists ix_job_post_deduped_at on job_post (deduped_at);
+
+-- Queue a job for clustering again when the text it was clustered on changes,
+-- or when its canonical row is deleted (the FK's set null runs as an update;
+-- dedup's own writes set deduped_at, which the orphan trigger leaves alone).
+create or replace function job_post_dedup_reset() returns trigger
+language plpgsql as $$
+begin
+  new.deduped_at := null;
+  return new;
+end $$;
+
+drop trigger if exists job_post_dedup_text on job_post;
+create trigger job_post_dedup_text
+  before update of title, company, description_snippet, description_sections on job_post
+  for each row
+  when ((new.title, new.company, new.description_snippet, new.description_sections)
+        is distinct from (old.title, old.company, old.description_snippet, old.description_sections))
+  execute function job_post_dedup_reset();
+
+drop trigger if exists job_post_dedup_orphan on job_post;
+create trigger job_post_dedup_orphan
+  before update of canonical_job_id on job_post
+  for each row
+  when (new.canonical_job_id is null and old.canonical_job_id is not null
+        and new.deduped_at is not distinct from old.deduped_at)
+  execute function job_post_dedup_reset();
@@ -0,0 +1,12 @@
+-- Top-k jobs per CV (backend/matching.py). cv_id is the SHA-256 of the PDF
+-- bytes (cv_cache.pdf_key), so re-uploading a resume replaces its matches.
+create table if not exists job_match (
+  cv_id text not null,
+  job_id uuid not null references job_post (id) on delete cascade,
+  rank integer not null,
+  score real not null,
+  created_at timestamptz not null default now(),
+  primary key (cv_id, job_id)
+);
+
+create index if not exists ix_job_match_cv_rank on job_match (cv_id, rank);
@@ -0,0 +1,121 @@
+-- Facet counts for GET /facets and GET /stats, kept current by triggers on
+-- job_post so every writer (repo upserts, crawl deactivation, the CRUD
+-- endpoints, raw SQL) maintains them.
+--
+-- scope ''       counts over all sources: facet 'source', 'location', 'company'
+-- scope <source> counts within one source: facet 'location', 'company'
+--
+-- active_count/row_count are live/all rows. Jobs without a source count
+-- under source '', so the source facet sums to the table total and there is
+-- no single 'total' row for every insert to lock. Only changes to source,
+-- location, company or is_active touch job_facet: re-seeing a job (an upsert
+-- or touch that only bumps last_seen) writes nothing here, and /stats reads
+-- last_seen from ix_job_post_live_source_last_seen instead.
+--
+-- Statement-level triggers fold a whole multi-row upsert into one upsert per
+-- facet value, taken in key order. That order only holds within a statement,
+-- so writers commit after each statement that changes facets
+-- (repo.upsert_jobs commits per chunk).
+create table if not exists job_facet (
+  scope        text not null,
+  facet        text not null,
+  value        text not null,
+  active_count bigint not null default 0,
+  row_count    bigint not null default 0,
+  primary key (scope, facet, value)
+);
+
+-- top-N per facet by count
+create index if not exists ix_job_facet_top on job_facet (scope, facet, active_count desc, value);
+
+-- The (scope, facet, value) keys a job_post row counts towards
+create or replace function job_facet_keys(source text, location text, company text)
+returns table (scope text, facet text, value text)
+language sql immutable as $$
+  select '', 'source', coalesce(source, '')
+  union all select '', 'location', nullif(location, '')
+  union all select '', 'company', nullif(company, '')
+  union all select nullif(source, ''), 'location', nullif(location, '')
+  union all select nullif(source, ''), 'company', nullif(company, '')
+$$;
+
+-- Applies the rows changed by one statement. `deltas` is a query over the
+-- transition tables returning (source, location, company, active, rows).
+create or replace function job_facet_apply() returns trigger
+language plpgsql as $$
+declare
+  deltas text;
+  changed text := '(n.source, n.location, n.company, n.is_active)
+                   is distinct from (o.source, o.location, o.company, o.is_active)';
+begin
+  if tg_op = 'INSERT' then
+    deltas := 'select source, location, company, is_active::int, 1 from new_rows';
+  elsif tg_op = 'DELETE' then
+    deltas := 'select source, location, company, -(is_active::int), -1 from old_rows';
+  else
+    deltas := format($q$
+      select n.source, n.location, n.company, n.is_active::int, 1
+        from new_rows n join old_rows o using (id) where %1$s
+      union all
+      select o.source, o.location, o.company, -(o.is_active::int), -1
+        from new_rows n join old_rows o using (id) where %1$s
+    $q$, changed);
+  end if;
+
+  execute format($q$
+    insert into job_facet as f (scope, facet, value, active_count, row_count)
+    select k.scope, k.facet, k.value, sum(d.active), sum(d.rows)
+      from (%s) as d (source, location, company, active, rows)
+      cross join lateral job_facet_keys(d.source, d.location, d.company) k
+     where k.scope is not null and k.value is not null
+     group by k.scope, k.facet, k.value
+    having sum(d.active) <> 0 or sum(d.rows) <> 0
+     order by k.scope, k.facet, k.value
+    on conflict (scope, facet, value) do update
+       set active_count = f.active_count + excluded.active_count,
+           row_count = f.row_count + excluded.row_count
+  $q$, deltas);
+  return null;
+end $$;
+
+create or replace function job_facet_clear() returns trigger
+language plpgsql as $$
+begin
+  delete from job_facet;
+  return null;
+end $$;
+
+-- Recount everything from job_post (initial fill, or repair after bulk loads
+-- with triggers disabled): select job_facet_rebuild();
+create or replace function job_facet_rebuild() returns void
+language sql as $$
+  delete from job_facet;
+  insert into job_facet (scope, facet, value, active_count, row_count)
+  select k.scope, k.facet, k.value, count(*) filter (where j.is_active), count(*)
+    from job_post j
+    cross join lateral job_facet_keys(j.source, j.location, j.company) k
+   where k.scope is not null and k.value is not null
+   group by k.scope, k.facet, k.value;
+$$;
+
+-- Transition tables can't be shared by multi-event triggers, hence one per event
+drop trigger if exists job_facet_insert on job_post;
+create trigger job_facet_insert after insert on job_post
+  referencing new table as new_rows
+  for each statement execute function job_facet_apply();
+
+drop trigger if exists job_facet_update on job_post;
+create trigger job_facet_update after update on job_post
+  referencing old table as old_rows new table as new_rows
+  for each statement execute function job_facet_apply();
+
+drop trigger if exists job_facet_delete on job_post;
+create trigger job_facet_delete after delete on job_post
+  referencing old table as old_rows
+  for each statement execute function job_facet_apply();
+
+drop trigger if exists job_facet_truncate on job_post;
+create trigger job_facet_truncate after truncate on job_post
+  for each statement execute function job_facet_clear();
+
+select job_facet_rebuild();
@@ -1,9 +1,19 @@
 # backend/models.py
 import uuid
-from sqlalchemy import Column, String, Text, TIMESTAMP, Boolean, func
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Text, TIMESTAMP, Boolean, BigInteger, Integer, Float, REAL, LargeBinary, Computed, Index, ForeignKey, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from backend.db import Base
 
+# Weighted full-text document: title > company/location > description.
+# Must stay in sync with backend/migrations/0001_job_post_search.sql
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '') || ' ' || coalesce(location, '')), 'B') || "
+    "setweight(coalesce(jsonb_to_tsvector('english', description_sections, '[\"string\"]'), ''::tsvector), 'C') || "
+    "setweight(to_tsvector('english', coalesce(description_snippet, '')), 'D')"
+)
+
 class JobPost(Base):
     __tablename__ = "job_post"
 
@@ -26,3 +36,100 @@ class JobPost(Base):
     first_seen = Column(TIMESTAMP(timezone=True), server_default=func.now())
     last_seen  = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
     is_active  = Column(Boolean, nullable=False, server_default="true")
+
+    # 👇 for full-text search (GET /jobs?search=fulltext)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
+    # 👇 for near-duplicate clustering (backend/dedup.py); NULL canonical_job_id = canonical row
+    canonical_job_id = Column(UUID(as_uuid=True), ForeignKey("job_post.id", ondelete="SET NULL"), nullable=True)
+    minhash = deferred(Column(LargeBinary, nullable=True))
+    deduped_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_job_post_search_vector", "search_vector", postgresql_using="gin"),
+        # live rows only: keyset pagination for GET /jobs?after=<cursor>, and
+        # deactivate_missing_for_source / per-source counts
+        Index("ix_job_post_live_posted_id", "posted_at", "id", postgresql_where=text("is_active")),
+        Index("ix_job_post_live_source_last_seen", "source", "last_seen", postgresql_where=text("is_active")),
+        Index("ix_job_post_canonical", "canonical_job_id", postgresql_where=text("canonical_job_id is not null")),
+        Index("ix_job_post_dedup_pending", "created_at", "id", postgresql_where=text("deduped_at is null")),
+        Index("ix_job_post_deduped_at", "deduped_at"),
+    )
+
+class GmailSyncState(Base):
+    """historyId checkpoint for incremental Gmail sync (backend/gmail_ingest.py)."""
+    __tablename__ = "gmail_sync_state"
+
+    account = Column(Text, primary_key=True)
+    history_id = Column(BigInteger, nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+
+class CrawlRun(Base):
+    """One ingest run per source (backend/crawl.py)."""
+    __tablename__ = "crawl_run"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    source = Column(Text, nullable=False)
+    query = Column(Text, nullable=True)
+    full_crawl = Column(Boolean, nullable=False, server_default="false")
+    status = Column(Text, nullable=False, server_default="running")  # running | succeeded | failed
+    started_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    rows_seen = Column(Integer, nullable=False, server_default="0")
+    rows_inserted = Column(Integer, nullable=False, server_default="0")
+    rows_updated = Column(Integer, nullable=False, server_default="0")
+    rows_touched = Column(Integer, nullable=False, server_default="0")
+    rows_deactivated = Column(Integer, nullable=False, server_default="0")
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_crawl_run_source_started", "source", "started_at"),
+    )
+
+class SavedQuery(Base):
+    """A JSearch query the scheduler re-runs every interval_seconds (backend/scheduler.py)."""
+    __tablename__ = "saved_query"
+
+    id = Column(Integer, primary_key=True)
+    query = Column(Text, nullable=False, unique=True)
+    num_pages = Column(Integer, nullable=False, server_default="1")
+    interval_seconds = Column(Integer, nullable=False, server_default="3600")
+    enabled = Column(Boolean, nullable=False, server_default="true")
+    next_run_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    last_run_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    last_run_id = Column(UUID(as_uuid=True), ForeignKey("crawl_run.id", ondelete="SET NULL"), nullable=True)
+
+    __table_args__ = (
+        Index("ix_saved_query_due", "next_run_at", postgresql_where=text("enabled")),
+    )
+
+class JobMatch(Base):
+    """A CV's top-k jobs by TF-IDF similarity (backend/matching.py); cv_id = sha256 of the PDF."""
+    __tablename__ = "job_match"
+
+    cv_id = Column(Text, primary_key=True)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("job_post.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, nullable=False)
+    score = Column(REAL, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_job_match_cv_rank", "cv_id", "rank"),
+    )
+
+class JobFacet(Base):
+    """Active/total job counts per source, location and company, kept by triggers
+    on job_post (migrations/0008_job_facet.sql). scope '' = all sources; jobs
+    without a source count under source ''."""
+    __tablename__ = "job_facet"
+
+    scope = Column(Text, primary_key=True)
+    facet = Column(Text, primary_key=True)  # source | location | company
+    value = Column(Text, primary_key=True)
+    active_count = Column(BigInteger, nullable=False, server_default="0")
+    row_count = Column(BigInteger, nullable=False, server_default="0")
+
+    __table_args__ = (
+        Index("ix_job_facet_top", "scope", "facet", text("active_count desc"), "value"),
+    )
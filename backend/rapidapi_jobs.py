@@ -1,8 +1,11 @@
 
 import os
+import time
+import random
 import httpx
 import asyncio
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import hashlib
 from pathlib import Path
@@ -12,118 +15,278 @@ env_path = Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
 from backend.db import async_sessionmaker
-from backend.models import JobPost
+from backend import repo
+from backend.crawl import Crawl
+from backend.metrics import async_httpx_hooks
 
-RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
-if not RAPIDAPI_KEY:
-    raise ValueError("RAPIDAPI_KEY environment variable not set")
+RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")  # checked in make_client, so importing never needs it
 
 API_HOST = "jsearch.p.rapidapi.com"
-SEARCH_ENDPOINT = "https://jsearch.p.rapidapi.com/search"
-DETAILS_ENDPOINT = "https://jsearch.p.rapidapi.com/job-details"
+# Overridable so the crawler can be pointed at a local mock server
+API_BASE_URL = os.getenv("JSEARCH_BASE_URL", f"https://{API_HOST}")
+SEARCH_ENDPOINT = "/search"
+DETAILS_ENDPOINT = "/job-details"
 
-async def fetch_job_details(job_id: str, client: httpx.AsyncClient) -> dict | None:
-    """Fetches the full details for a single job."""
-    querystring = {"job_id": job_id, "extended_publisher_details": "false"}
-    headers = {
-        "X-RapidAPI-Key": RAPIDAPI_KEY,
-        "X-RapidAPI-Host": API_HOST,
-    }
-    try:
-        response = await client.get(DETAILS_ENDPOINT, headers=headers, params=querystring)
-        response.raise_for_status()
-        data = response.json()
-        if data["status"] == "OK" and data.get("data"):
+# ---- Concurrency / quota settings ----
+MAX_CONCURRENCY = int(os.getenv("RAPIDAPI_MAX_CONCURRENCY", "8"))
+REQUESTS_PER_SECOND = float(os.getenv("RAPIDAPI_REQUESTS_PER_SECOND", "5"))
+MAX_RETRIES = int(os.getenv("RAPIDAPI_MAX_RETRIES", "4"))
+RETRY_BASE_DELAY = float(os.getenv("RAPIDAPI_RETRY_BASE_DELAY", "0.5"))
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+class JSearchError(Exception):
+    """A JSearch request failed for good (retries used up, or a non-retryable status)."""
+
+
+class RateLimiter:
+    """Token bucket: allows `rate` requests per second with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int | None = None, clock=time.monotonic, sleep=asyncio.sleep):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        # injectable so tests can drive the bucket with a fake clock
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await self.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class CrawlStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    jobs_seen: int = 0
+    jobs_skipped: int = 0
+    jobs_saved: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def jobs_per_sec(self) -> float:
+        return self.jobs_saved / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        return (
+            f"{self.jobs_saved} jobs saved ({self.jobs_seen} seen, {self.jobs_skipped} already known) "
+            f"in {self.elapsed:.1f}s = {self.jobs_per_sec:.1f} jobs/sec | "
+            f"{self.requests} requests, {self.retries} retries, {self.failures} failures, "
+            f"peak {self.max_in_flight} in flight"
+        )
+
+
+class JSearchClient:
+    """Thin JSearch wrapper that bounds concurrency, respects the quota and retries on 429/5xx."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        limiter: RateLimiter | None = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+        stats: CrawlStats | None = None,
+    ):
+        self.client = client
+        self.limiter = limiter or RateLimiter(REQUESTS_PER_SECOND)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.stats = stats or CrawlStats()
+
+    async def _get(self, url: str, params: dict) -> dict | None:
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            async with self.semaphore:
+                await self.limiter.acquire()
+                self.stats.requests += 1
+                self.stats.in_flight += 1
+                self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+                try:
+                    response = await self.client.get(url, params=params)
+                    if response.status_code not in RETRYABLE_STATUS:
+                        response.raise_for_status()
+                        return response.json()
+                    print(f"Got {response.status_code} for {url} {params}")
+                    retry_after = response.headers.get("Retry-After")
+                except httpx.TransportError as e:
+                    print(f"Transport error for {url} {params}: {e}")
+                except httpx.HTTPStatusError as e:
+                    print(f"HTTP error for {url} {params}: {e}")
+                    break
+                finally:
+                    self.stats.in_flight -= 1
+
+            if attempt == self.max_retries:
+                break
+            self.stats.retries += 1
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, RETRY_BASE_DELAY)
+            await asyncio.sleep(delay)
+
+        self.stats.failures += 1
+        return None
+
+    async def search_page(self, query: str, page: int) -> list[dict]:
+        """Returns the job summaries on one search results page.
+
+        Raises JSearchError if the page couldn't be fetched, so a crawl can tell
+        a failed page from an empty one (and then deactivates nothing)."""
+        querystring = {"query": query, "page": str(page), "num_pages": "1"}
+        data = await self._get(SEARCH_ENDPOINT, querystring)
+        if data is None:
+            raise JSearchError(f"search page {page} for '{query}' failed")
+        if data.get("status") != "OK" or not data.get("data"):
+            return []
+        return data["data"]
+
+    async def job_details(self, job_id: str) -> dict | None:
+        """Fetches the full details for a single job."""
+        querystring = {"job_id": job_id, "extended_publisher_details": "false"}
+        data = await self._get(DETAILS_ENDPOINT, querystring)
+        if data and data.get("status") == "OK" and data.get("data"):
             return data["data"][0]
-    except httpx.HTTPStatusError as e:
-        print(f"HTTP error fetching details for job {job_id}: {e}")
-    except Exception as e:
-        print(f"Error fetching details for job {job_id}: {e}")
-    return None
-
-async def search_jobs(query: str = "Python developer in USA", num_pages: int = 1):
-    """Searches for jobs and saves them to the database."""
+        return None
+
+
+def make_client(base_url: str = API_BASE_URL) -> httpx.AsyncClient:
+    if not RAPIDAPI_KEY:
+        raise ValueError("RAPIDAPI_KEY environment variable not set")
     headers = {
         "X-RapidAPI-Key": RAPIDAPI_KEY,
         "X-RapidAPI-Host": API_HOST,
     }
-    
-    async with httpx.AsyncClient() as client:
-        for page in range(1, num_pages + 1):
-            querystring = {"query": query, "page": str(page), "num_pages": "1"}
-            print(f"Fetching page {page} for query: '{query}'")
-            
-            try:
-                search_response = await client.get(SEARCH_ENDPOINT, headers=headers, params=querystring)
-                search_response.raise_for_status()
-                search_data = search_response.json()
-
-                if search_data["status"] != "OK" or not search_data.get("data"):
-                    print("No jobs found or API error.")
-                    continue
-
-                jobs_to_create = []
-                for job_summary in search_data["data"]:
-                    job_id = job_summary.get("job_id")
-                    if not job_id:
-                        continue
-
-                    # Use a consistent hash key for deduplication
-                    hash_key = hashlib.sha256(f"jsearch_{job_id}".encode()).hexdigest()
-
-                    async with async_sessionmaker() as session:
-                        existing_job = await session.get(JobPost, hash_key)
-                        if existing_job:
-                            print(f"Job {job_id} already exists, skipping.")
-                            continue
-                    
-                    print(f"Fetching details for job_id: {job_id}")
-                    details = await fetch_job_details(job_id, client)
-                    
-                    if not details:
-                        print(f"Could not fetch details for {job_id}, skipping.")
-                        continue
-
-                    # --- Map API response to JobPost model ---
-                    description_text = details.get("job_description", "No description provided.")
-                    
-                    # Create a simple structured description
-                    description_sections = {
-                        "description": description_text.split('\n\n') # Split into paragraphs
-                    }
-
-                    posted_at_timestamp = details.get("job_posted_at_timestamp")
-                    posted_at = datetime.fromtimestamp(posted_at_timestamp) if posted_at_timestamp else None
-
-                    job_post = JobPost(
-                        hash_key=hash_key,
-                        source="JSearch",
-                        title=details.get("job_title"),
-                        company=details.get("employer_name"),
-                        location=details.get("job_city"),
-                        description_snippet=details.get("job_description", "")[:250] + "...",
-                        description_sections=description_sections,
-                        posted_at=posted_at,
-                        canonical_url=details.get("job_apply_link"),
-                        salary_text=details.get("job_salary_range"),
-                        is_active=True,
-                    )
-                    jobs_to_create.append(job_post)
-
-                if jobs_to_create:
-                    async with async_sessionmaker() as session:
-                        print(f"Adding {len(jobs_to_create)} new jobs to the database.")
-                        session.add_all(jobs_to_create)
-                        await session.commit()
-                else:
-                    print("No new jobs to add on this page.")
-
-            except httpx.HTTPStatusError as e:
-                print(f"HTTP error during search: {e}")
-                break
-            except Exception as e:
-                print(f"An error occurred: {e}")
-                break
+    limits = httpx.Limits(max_connections=MAX_CONCURRENCY, max_keepalive_connections=MAX_CONCURRENCY)
+    return httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30,
+                             event_hooks=async_httpx_hooks("jsearch"))
+
+
+def jsearch_hash_key(job_id: str) -> str:
+    # Use a consistent hash key for deduplication
+    return hashlib.sha256(f"jsearch_{job_id}".encode()).hexdigest()
+
+
+def to_job_row(hash_key: str, details: dict) -> dict:
+    """Map a JSearch job-details payload to a `repo.upsert_jobs` row."""
+    description_text = details.get("job_description") or "No description provided."
+
+    # Create a simple structured description
+    description_sections = {
+        "description": description_text.split('\n\n') # Split into paragraphs
+    }
+
+    posted_at_timestamp = details.get("job_posted_at_timestamp")
+    posted_at = datetime.fromtimestamp(posted_at_timestamp, tz=timezone.utc) if posted_at_timestamp else None
+
+    return {
+        "hash_key": hash_key,
+        "source": "JSearch",
+        "title": details.get("job_title"),
+        "company": details.get("employer_name"),
+        "location": details.get("job_city"),
+        "description_snippet": description_text[:250] + "...",
+        "description_sections": description_sections,
+        "posted_at": posted_at,
+        "canonical_url": details.get("job_apply_link"),
+        "salary_text": details.get("job_salary_range"),
+    }
+
+
+def summary_job_ids(summaries: list[dict]) -> list[str]:
+    return [s["job_id"] for s in summaries if s.get("job_id")]
+
+
+async def ingest_job_ids(api: JSearchClient, crawl: Crawl, job_ids, label: str):
+    """Fetch details for the job_ids we don't have yet and upsert them; touch the rest."""
+    candidates = {job_id: jsearch_hash_key(job_id) for job_id in job_ids}
+    api.stats.jobs_seen += len(candidates)
+
+    # One round trip to skip detail fetches for jobs we already know
+    async with async_sessionmaker() as session:
+        known = await repo.existing_hash_keys(session, list(candidates.values()))
+    if known:
+        print(f"{len(known)} jobs on {label} already exist, skipping.")
+        api.stats.jobs_skipped += len(known)
+        # still listed upstream, so keep them active
+        await crawl.touch(known)
+        candidates = {job_id: key for job_id, key in candidates.items() if key not in known}
+
+    details = await asyncio.gather(*(api.job_details(job_id) for job_id in candidates))
+
+    jobs_to_create = []
+    for (job_id, hash_key), detail in zip(candidates.items(), details):
+        if not detail:
+            print(f"Could not fetch details for {job_id}, skipping.")
+            continue
+        jobs_to_create.append(to_job_row(hash_key, detail))
+
+    if jobs_to_create:
+        async with async_sessionmaker() as session:
+            print(f"Adding {len(jobs_to_create)} new jobs from {label} to the database.")
+            crawl.record(await repo.upsert_jobs(session, jobs_to_create))
+        api.stats.jobs_saved += len(jobs_to_create)
+    else:
+        print(f"No new jobs to add on {label}.")
+
+
+async def _ingest_page(api: JSearchClient, crawl: Crawl, query: str, page: int):
+    print(f"Fetching page {page} for query: '{query}'")
+    summaries = await api.search_page(query, page)
+    if not summaries:
+        print(f"No jobs found on page {page}.")
+        return
+    await ingest_job_ids(api, crawl, summary_job_ids(summaries), f"page {page}")
+
+
+async def _crawl(api: JSearchClient, query: str, num_pages: int) -> CrawlStats:
+    # A query only covers part of the source, so this crawl never deactivates jobs
+    async with Crawl("JSearch", query=query) as crawl:
+        results = await asyncio.gather(
+            *(_ingest_page(api, crawl, query, page) for page in range(1, num_pages + 1)),
+            return_exceptions=True,
+        )
+        for page, result in enumerate(results, start=1):
+            if isinstance(result, Exception):
+                print(f"An error occurred on page {page}: {result}")
+                crawl.error(f"page {page}: {result}")
+
+    print(f"Crawl for '{query}' finished: {api.stats.report()}")
+    return api.stats
+
+
+async def search_jobs(
+    query: str = "Python developer in USA",
+    num_pages: int = 1,
+    base_url: str = API_BASE_URL,
+    api: JSearchClient | None = None,
+) -> CrawlStats:
+    """Searches for jobs and saves them to the database.
+
+    Pages are fetched in parallel and detail lookups fan out through the
+    client's semaphore and rate limiter. Pass `api` to share a client
+    (and its quota) between crawls.
+    """
+    if api is not None:
+        return await _crawl(api, query, num_pages)
+    async with make_client(base_url) as client:
+        return await _crawl(JSearchClient(client), query, num_pages)
 
 if __name__ == "__main__":
     # Example of how to run the script
@@ -1,44 +1,237 @@
 # backend/repo.py
+import os
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import text, func, true, null, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime
+from backend.models import JobPost
+from backend.cache import response_cache
 
-UPSERT_SQL = text("""
-insert into job_post (hash_key, source, title, company, location,
-                      description_snippet, posted_at, canonical_url, salary_text,
-                      first_seen, last_seen, is_active)
-values
-  (:hash_key, :source, :title, :company, :location,
-   :description_snippet, :posted_at, :canonical_url, :salary_text,
-   now(), now(), true)
-on conflict (hash_key) do update
-set title               = excluded.title,
-    company             = excluded.company,
-    location            = excluded.location,
-    description_snippet = excluded.description_snippet,
-    posted_at           = excluded.posted_at,
-    canonical_url       = excluded.canonical_url,
-    salary_text         = excluded.salary_text,
-    last_seen           = now(),
-    is_active           = true
-""")
-
-async def upsert_jobs(session: AsyncSession, rows: list[dict]):
-    # rows: list of dicts with keys used above (including :hash_key)
+# Rows per INSERT statement. Each row binds ~11 parameters and asyncpg caps a
+# statement at 32767, so keep this below ~3000.
+UPSERT_CHUNK_SIZE = int(os.getenv("UPSERT_CHUNK_SIZE", "500"))
+
+UPSERT_COLUMNS = (
+    "hash_key", "source", "title", "company", "location",
+    "description_snippet", "description_sections", "posted_at",
+    "canonical_url", "salary_text",
+)
+
+def _upsert_stmt(rows: list[dict]):
+    table = JobPost.__table__
+    values = []
     for r in rows:
-        await session.execute(UPSERT_SQL, r)
+        v = {c: r.get(c) for c in UPSERT_COLUMNS}
+        if v["description_sections"] is None:
+            v["description_sections"] = null()  # SQL NULL, not JSON 'null'
+        values.append(v)
+    stmt = pg_insert(table).values(values)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.hash_key],
+        set_={
+            "title": excluded.title,
+            "company": excluded.company,
+            "location": excluded.location,
+            "description_snippet": excluded.description_snippet,
+            # keep previously stored sections when a source only sends a snippet
+            "description_sections": func.coalesce(excluded.description_sections, table.c.description_sections),
+            "posted_at": excluded.posted_at,
+            "canonical_url": excluded.canonical_url,
+            "salary_text": excluded.salary_text,
+            "last_seen": func.now(),
+            "is_active": true(),
+        },
+    )
+    # xmax = 0 only for freshly inserted tuples
+    return stmt.returning(table.c.id, table.c.hash_key, literal_column("(xmax = 0)").label("inserted"))
+
+async def upsert_jobs(session: AsyncSession, rows: list[dict], chunk_size: int = UPSERT_CHUNK_SIZE):
+    # rows: list of dicts keyed by UPSERT_COLUMNS (hash_key required).
+    # One multi-row INSERT ... ON CONFLICT per chunk, committed per chunk: the
+    # job_facet trigger locks facet rows in key order within a statement, and
+    # holding them across chunks could deadlock against another writer.
+    # Returns (id, hash_key, inserted) for every row written.
+    # a statement can't touch the same row twice, so keep the last duplicate
+    rows = list({r["hash_key"]: r for r in rows}.values())
+    results = []
+    try:
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            results.extend((await session.execute(_upsert_stmt(chunk))).all())
+            await session.commit()
+    finally:
+        if results:
+            response_cache.invalidate()
+    return results
+
+async def existing_hash_keys(session: AsyncSession, hash_keys: list[str]) -> set[str]:
+    # One round trip to find which of the given keys are already stored
+    if not hash_keys:
+        return set()
+    result = await session.execute(
+        text("select hash_key from job_post where hash_key = any(:keys)"),
+        {"keys": list(hash_keys)},
+    )
+    return set(result.scalars().all())
+
+async def touch_last_seen(session: AsyncSession, hash_keys: list[str]) -> int:
+    # Mark already-stored jobs as seen in this crawl without rewriting them.
+    # One UPDATE per call; returns how many rows were touched.
+    if not hash_keys:
+        return 0
+    result = await session.execute(
+        text("""
+            update job_post
+               set last_seen = now(), is_active = true
+             where hash_key = any(:keys)
+        """),
+        {"keys": list(hash_keys)},
+    )
     await session.commit()
+    response_cache.invalidate()
+    return result.rowcount
 
-async def deactivate_missing_for_source(session: AsyncSession, source: str, crawl_started_at: datetime):
-    # Any active row for this source not touched during this crawl becomes inactive
-    await session.execute(
+async def deactivate_missing_for_source(session: AsyncSession, source: str, crawl_started_at: datetime) -> int:
+    # Any active row for this source not touched during this crawl becomes inactive.
+    # Served by the partial index ix_job_post_live_source_last_seen.
+    result = await session.execute(
         text("""
             update job_post
                set is_active = false
              where source = :source
-               and is_active = true
+               and is_active
                and last_seen < :ts
         """),
         {"source": source, "ts": crawl_started_at},
     )
     await session.commit()
+    response_cache.invalidate()
+    return result.rowcount
+
+async def start_crawl_run(session: AsyncSession, source: str, query: str | None, full_crawl: bool):
+    # started_at comes from the database clock, the same one that sets last_seen
+    result = await session.execute(
+        text("""
+            insert into crawl_run (source, query, full_crawl, started_at)
+            values (:source, :query, :full_crawl, clock_timestamp())
+            returning id, started_at
+        """),
+        {"source": source, "query": query, "full_crawl": full_crawl},
+    )
+    row = result.one()
+    await session.commit()
+    return row
+
+async def finish_crawl_run(session: AsyncSession, run_id, status: str, counts: dict, error: str | None = None):
+    await session.execute(
+        text("""
+            update crawl_run
+               set status = :status,
+                   finished_at = clock_timestamp(),
+                   duration_seconds = extract(epoch from clock_timestamp() - started_at),
+                   rows_seen = :rows_seen,
+                   rows_inserted = :rows_inserted,
+                   rows_updated = :rows_updated,
+                   rows_touched = :rows_touched,
+                   rows_deactivated = :rows_deactivated,
+                   error = :error
+             where id = :id
+        """),
+        {"id": run_id, "status": status, "error": error, **counts},
+    )
+    await session.commit()
+
+async def get_gmail_sync_state(session: AsyncSession, account: str):
+    # (history_id, updated_at) checkpoint of the last completed Gmail sync, or None
+    result = await session.execute(
+        text("select history_id, updated_at from gmail_sync_state where account = :account"),
+        {"account": account},
+    )
+    return result.one_or_none()
+
+async def set_gmail_history_id(session: AsyncSession, account: str, history_id: int):
+    await session.execute(
+        text("""
+            insert into gmail_sync_state (account, history_id, updated_at)
+            values (:account, :history_id, now())
+            on conflict (account) do update
+               set history_id = excluded.history_id,
+                   updated_at = excluded.updated_at
+        """),
+        {"account": account, "history_id": history_id},
+    )
+    await session.commit()
+
+async def save_query(session: AsyncSession, query: str, num_pages: int = 1, interval_seconds: int = 3600):
+    # Add a saved query (due immediately) or update its paging/interval
+    await session.execute(
+        text("""
+            insert into saved_query (query, num_pages, interval_seconds)
+            values (:query, :num_pages, :interval_seconds)
+            on conflict (query) do update
+               set num_pages = excluded.num_pages,
+                   interval_seconds = excluded.interval_seconds,
+                   enabled = true
+        """),
+        {"query": query, "num_pages": num_pages, "interval_seconds": interval_seconds},
+    )
+    await session.commit()
+
+async def list_saved_queries(session: AsyncSession):
+    result = await session.execute(text("select * from saved_query order by next_run_at, id"))
+    return result.all()
+
+async def due_saved_queries(session: AsyncSession, now: datetime):
+    # `now` comes from the caller's clock so the scheduler can run on a fake one
+    result = await session.execute(
+        text("""
+            select id, query, num_pages, interval_seconds
+              from saved_query
+             where enabled and next_run_at <= :now
+             order by next_run_at, id
+        """),
+        {"now": now},
+    )
+    return result.all()
+
+async def next_saved_query_due(session: AsyncSession) -> datetime | None:
+    return await session.scalar(text("select min(next_run_at) from saved_query where enabled"))
+
+async def mark_saved_queries_run(session: AsyncSession, ids: list[int], ran_at: datetime, run_id=None):
+    # Schedule each query interval_seconds after this run, in one UPDATE
+    await session.execute(
+        text("""
+            update saved_query
+               set last_run_at = :ran_at,
+                   last_run_id = :run_id,
+                   next_run_at = :ran_at + make_interval(secs => interval_seconds)
+             where id = any(:ids)
+        """),
+        {"ids": list(ids), "ran_at": ran_at, "run_id": run_id},
+    )
+    await session.commit()
+
+async def save_matches(session: AsyncSession, cv_id: str, matches: list[tuple]):
+    # Replace a CV's matches with (job_id, score) pairs, best first. Jobs deleted
+    # or deactivated since they were ranked are dropped rather than failing the FK.
+    await session.execute(text("delete from job_match where cv_id = :cv_id"), {"cv_id": cv_id})
+    if matches:
+        await session.execute(
+            text("""
+                insert into job_match (cv_id, job_id, rank, score)
+                select :cv_id, m.job_id, row_number() over (order by m.rank), m.score
+                  from unnest(cast(:job_ids as uuid[]), cast(:ranks as integer[]), cast(:scores as real[]))
+                       as m(job_id, rank, score)
+                  join job_post j on j.id = m.job_id and j.is_active
+            """),
+            {"cv_id": cv_id, "job_ids": [m[0] for m in matches],
+             "ranks": list(range(1, len(matches) + 1)), "scores": [m[1] for m in matches]},
+        )
+    await session.commit()
+
+async def rebuild_facets(session: AsyncSession):
+    # Recount job_facet from job_post (its triggers keep it current otherwise)
+    await session.execute(text("select job_facet_rebuild()"))
+    await session.commit()
+    response_cache.invalidate()
@@ -0,0 +1,169 @@
+# backend/scheduler.py
+"""Long-running scheduler for saved JSearch queries.
+
+Each tick picks up every saved_query whose next_run_at has passed and fetches
+all of their search pages concurrently through one JSearchClient, so every
+query draws on the same RapidAPI rate limit. job_ids returned by more than one
+query are merged before any detail lookup, so overlapping searches ("Python
+developer NYC", "Backend engineer NY") fetch each job's details once. The
+tick is recorded as a single crawl_run, and each query's next_run_at moves on
+by its own interval_seconds. A tick without errors then deactivates JSearch
+jobs that no query has returned for CRAWL_EXPIRE_DAYS (backend/crawl.py).
+New jobs are then clustered with near-duplicates (backend/dedup.py).
+
+`clock` and `sleep` are injectable, and due-ness is decided by the clock rather
+than the database's now(), so the scheduler can be driven by a fake clock
+against a stub server (see benchmarks/bench_scheduler.py).
+
+    python -m backend.scheduler add "Python developer in New York" --pages 2 --every 3600
+    python -m backend.scheduler list
+    python -m backend.scheduler run [--once]
+"""
+import os, asyncio, argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+
+from backend.db import async_sessionmaker
+from backend import repo
+from backend.crawl import Crawl, CRAWL_EXPIRE_DAYS
+from backend.dedup import dedup_pending
+from backend.rapidapi_jobs import (
+    API_BASE_URL, CrawlStats, JSearchClient, make_client, ingest_job_ids, summary_job_ids,
+)
+
+SCHEDULER_POLL_INTERVAL = float(os.getenv("SCHEDULER_POLL_INTERVAL", "60"))  # max seconds between checks
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+@dataclass
+class TickStats:
+    queries: int = 0
+    pages: int = 0
+    job_ids_listed: int = 0
+    job_ids_unique: int = 0
+    page_errors: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.job_ids_listed - self.job_ids_unique
+
+    def report(self) -> str:
+        return (
+            f"{self.queries} queries, {self.pages} pages: {self.job_ids_listed} job_ids listed, "
+            f"{self.job_ids_unique} unique ({self.duplicates} cross-query duplicates not re-fetched), "
+            f"{self.page_errors} page errors"
+        )
+
+class Scheduler:
+    def __init__(self, api: JSearchClient, clock=utcnow, sleep=asyncio.sleep,
+                 poll_interval: float = SCHEDULER_POLL_INTERVAL):
+        self.api = api
+        self.clock = clock
+        self.sleep = sleep
+        self.poll_interval = poll_interval
+        self._stopping = False
+
+    async def tick(self) -> TickStats | None:
+        """Run every due query once. Returns None if nothing was due."""
+        now = self.clock()
+        async with async_sessionmaker() as session:
+            due = await repo.due_saved_queries(session, now)
+        if not due:
+            return None
+
+        stats = TickStats(queries=len(due))
+        self.api.stats = CrawlStats()
+        async with Crawl("JSearch", query="; ".join(q.query for q in due),
+                         expire_after=timedelta(days=CRAWL_EXPIRE_DAYS)) as crawl:
+            pages = [(q.query, page) for q in due for page in range(1, q.num_pages + 1)]
+            stats.pages = len(pages)
+            results = await asyncio.gather(
+                *(self.api.search_page(query, page) for query, page in pages),
+                return_exceptions=True,
+            )
+            job_ids = {}  # ordered set, first query wins
+            for (query, page), result in zip(pages, results):
+                if isinstance(result, Exception):
+                    print(f"An error occurred on page {page} of '{query}': {result}")
+                    crawl.error(f"page {page} of '{query}': {result}")
+                    stats.page_errors += 1
+                    continue
+                ids = summary_job_ids(result)
+                stats.job_ids_listed += len(ids)
+                job_ids.update(dict.fromkeys(ids))
+            stats.job_ids_unique = len(job_ids)
+            await ingest_job_ids(self.api, crawl, list(job_ids), f"{len(due)} saved queries")
+
+        async with async_sessionmaker() as session:
+            await repo.mark_saved_queries_run(session, [q.id for q in due], now, crawl.run_id)
+        print(f"Scheduler tick: {stats.report()} | {self.api.stats.report()}")
+        if self.api.stats.jobs_saved:
+            # cluster the new jobs with near-duplicates from other queries and sources
+            print(f"Dedup: {await dedup_pending()}")
+        return stats
+
+    async def seconds_until_due(self) -> float:
+        async with async_sessionmaker() as session:
+            next_due = await repo.next_saved_query_due(session)
+        if next_due is None:
+            return self.poll_interval
+        return min(self.poll_interval, max(0.0, (next_due - self.clock()).total_seconds()))
+
+    async def run_forever(self):
+        self._stopping = False
+        while not self._stopping:
+            try:
+                await self.tick()
+            except Exception as e:
+                # leave next_run_at alone so the queries are retried on the next poll
+                print(f"Scheduler tick failed: {e}")
+                await self.sleep(self.poll_interval)
+                continue
+            await self.sleep(await self.seconds_until_due())
+
+    def stop(self):
+        self._stopping = True
+
+async def run(once: bool = False, base_url: str = API_BASE_URL):
+    async with make_client(base_url) as client:
+        scheduler = Scheduler(JSearchClient(client))
+        if once:
+            await scheduler.tick()
+        else:
+            await scheduler.run_forever()
+
+async def _add(query: str, pages: int, every: int):
+    async with async_sessionmaker() as session:
+        await repo.save_query(session, query, pages, every)
+    print(f"Saved '{query}': {pages} page(s) every {every}s")
+
+async def _list():
+    async with async_sessionmaker() as session:
+        rows = await repo.list_saved_queries(session)
+    for r in rows:
+        state = "" if r.enabled else " (disabled)"
+        print(f"{r.id:>4}  next {r.next_run_at:%Y-%m-%d %H:%M}  every {r.interval_seconds}s  "
+              f"{r.num_pages}p  {r.query}{state}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="save a query (or update its pages/interval)")
+    add.add_argument("query")
+    add.add_argument("--pages", type=int, default=1)
+    add.add_argument("--every", type=int, default=3600, help="seconds between runs")
+    sub.add_parser("list", help="show saved queries and their next run")
+    run_parser = sub.add_parser("run", help="run due queries forever (or once)")
+    run_parser.add_argument("--once", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "add":
+        asyncio.run(_add(args.query, args.pages, args.every))
+    elif args.command == "list":
+        asyncio.run(_list())
+    else:
+        asyncio.run(run(once=args.once))
+
+if __name__ == "__main__":
+    main()
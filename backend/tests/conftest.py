@@ -0,0 +1,35 @@
+# backend/tests/conftest.py
+"""Shared fixtures. Nothing here needs Postgres: HTTP goes to the local stub
+server in benchmarks/stubs.py, and tests that touch the database replace the
+repo functions they call.
+
+    python -m pytest backend/tests
+"""
+import pytest
+
+from benchmarks.stubs import serve
+
+@pytest.fixture
+def stub():
+    """The stub server (LM Studio, JSearch, Gmail); its base URL is stub.url."""
+    server = serve(jobs_per_page=4)
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+@pytest.fixture
+def no_db(monkeypatch):
+    """Make async_sessionmaker() hand out sessions that are never used; patch
+    the repo functions a test reaches with monkeypatch.setattr(repo, ...)."""
+    from backend import crawl, scheduler, rapidapi_jobs
+
+    for module in (crawl, scheduler, rapidapi_jobs):
+        monkeypatch.setattr(module, "async_sessionmaker", FakeSession)
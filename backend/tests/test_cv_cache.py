@@ -0,0 +1,36 @@
+import os
+
+from backend.cv_cache import DiskCache, pdf_key, title_key
+
+def test_round_trip_and_counters(tmp_path):
+    cache = DiskCache(tmp_path)
+    assert cache.get("missing") is None
+    cache.set("k", "Software Engineer", seconds=1.5)
+    assert cache.get("k") == "Software Engineer"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "saved_seconds": 1.5}
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=10**6)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.set(key, "x" * 100, seconds=0)
+        os.utime(tmp_path / f"{key}.json", (1000 + i, 1000 + i))
+    entry = (tmp_path / "a.json").stat().st_size
+
+    assert cache.get("a") is not None  # a read makes "a" the most recent
+    cache.max_bytes = 3 * entry + entry // 2  # room for three; sizes vary by a few bytes
+    cache.set("d", "x" * 100, seconds=0)
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "c", "d"]
+
+def test_stays_within_max_bytes(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1000)
+    for i in range(50):
+        cache.set(str(i), "x" * 100, seconds=0)
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.json")) <= 1000
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_keys_depend_on_every_input():
+    assert pdf_key(b"%PDF-1") != pdf_key(b"%PDF-2")
+    base = title_key("cv", "model", "prompt", 0.2)
+    assert base == title_key("cv", "model", "prompt", 0.2)
+    assert len({base, title_key("cv2", "model", "prompt", 0.2), title_key("cv", "model2", "prompt", 0.2),
+                title_key("cv", "model", "prompt2", 0.2), title_key("cv", "model", "prompt", 0.3)}) == 5
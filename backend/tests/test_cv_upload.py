@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+
+from backend import cv_to_keywords, main
+from backend.cv_worker import CVWorker
+
+BOUNDARY = b"cvboundary"
+HEAD = (b"--" + BOUNDARY + b'\r\nContent-Disposition: form-data; name="cv"; filename="cv.pdf"\r\n'
+        b"Content-Type: application/pdf\r\n\r\n")
+TAIL = b"\r\n--" + BOUNDARY + b"--\r\n"
+
+@pytest.fixture
+def worker(monkeypatch, tmp_path):
+    monkeypatch.setattr(cv_to_keywords, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(main, "CV_MAX_PDF_BYTES", 1000)
+    monkeypatch.setattr(main, "CV_FORM_OVERHEAD", 1000)
+    worker = CVWorker(max_queued=1)
+    monkeypatch.setattr(main, "cv_worker", worker)
+    return worker
+
+def post_cv(chunks: list[bytes], headers=()) -> tuple[int, dict, int]:
+    """POST /cv straight through ASGI with a chunked body; returns (status, body, chunks read)."""
+    messages = [{"type": "http.request", "body": c, "more_body": True} for c in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+    read, sent = 0, []
+
+    async def receive():
+        nonlocal read
+        read += 1
+        return messages[read - 1] if read <= len(messages) else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/cv", "raw_path": b"/cv", "root_path": "",
+             "query_string": b"", "http_version": "1.1", "scheme": "http",
+             "server": ("test", 80), "client": ("test", 1),
+             "headers": [(b"content-type", b"multipart/form-data; boundary=" + BOUNDARY), *headers]}
+    asyncio.run(main.app(scope, receive, send))
+    status = next(m["status"] for m in sent if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return status, json.loads(body), read
+
+def test_upload_is_queued_and_saved(worker, tmp_path):
+    status, body, _ = post_cv([HEAD, b"%PDF-1.4 tiny", TAIL])
+    assert status == 202 and body["status"] == "queued"
+    assert [p.read_bytes() for p in tmp_path.iterdir()] == [b"%PDF-1.4 tiny"]
+
+def test_chunked_upload_stops_at_the_limit(worker, tmp_path):
+    chunks = [HEAD] + [b"x" * 100] * 10_000 + [TAIL]  # ~1MB, no Content-Length
+    status, body, read = post_cv(chunks)
+    assert status == 413
+    assert read < 30  # stopped once 2000 bytes had arrived
+    assert not list(tmp_path.iterdir())
+
+def test_declared_length_is_refused_before_reading(worker):
+    status, _, read = post_cv([HEAD, TAIL], headers=[(b"content-length", b"5000000")])
+    assert (status, read) == (413, 0)
+
+def test_full_queue_is_refused(worker):
+    assert post_cv([HEAD, b"%PDF one", TAIL])[0] == 202
+    status, body, _ = post_cv([HEAD, b"%PDF two", TAIL])
+    assert status == 503
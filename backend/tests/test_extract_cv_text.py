@@ -0,0 +1,28 @@
+import io
+import pytest
+
+from backend.extract_cv_text import PDFExtractionError, iter_pages_from
+
+def blank_pdf(pages: int) -> bytes:
+    import PyPDF2
+
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(100, 100)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+def test_yields_one_text_per_page_up_to_max_pages():
+    assert list(iter_pages_from(io.BytesIO(blank_pdf(3)))) == ["", "", ""]
+    assert len(list(iter_pages_from(io.BytesIO(blank_pdf(3)), max_pages=2))) == 2
+
+@pytest.mark.parametrize("broken", [b"/Kids 4              ", b"/Kids [ 4 0 R 5 ]    "])
+def test_broken_page_tree_raises_extraction_error(broken):
+    data = blank_pdf(2).replace(b"/Kids [ 4 0 R 5 0 R ]", broken)  # same length keeps the xref valid
+    with pytest.raises(PDFExtractionError):
+        list(iter_pages_from(io.BytesIO(data)))
+
+def test_garbage_raises_extraction_error():
+    with pytest.raises(PDFExtractionError):
+        list(iter_pages_from(io.BytesIO(b"not a pdf")))
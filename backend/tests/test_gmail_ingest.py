@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+
+from backend.gmail_ingest import GmailClient, HistoryExpired, canonical_job_url, make_client, message_rows
+from benchmarks.stubs import FIRST_HISTORY_ID, add_gmail_messages, fake_alert_message
+
+def run_client(stub, fn, batch_size=3):
+    async def run():
+        async with make_client(stub.url, token="test") as http:
+            return await fn(GmailClient(http, batch_size=batch_size))
+    return asyncio.run(run())
+
+def test_history_lists_only_mail_since_the_checkpoint(stub):
+    add_gmail_messages(stub, 4)
+
+    async def fn(api):
+        checkpoint = await api.profile_history_id()
+        add_gmail_messages(stub, 2)
+        return checkpoint, await api.history_message_ids(checkpoint)
+
+    checkpoint, (ids, latest) = run_client(stub, fn)
+    assert ids == ["msg00000004", "msg00000005"]
+    assert latest == checkpoint + 2
+
+def test_expired_history_raises(stub):
+    async def fn(api):
+        await api.history_message_ids(FIRST_HISTORY_ID - 1)
+
+    with pytest.raises(HistoryExpired):
+        run_client(stub, fn)
+
+def test_batched_fetch_returns_every_message(stub):
+    add_gmail_messages(stub, 7)
+
+    async def fn(api):
+        ids = await api.list_message_ids("subject:job")
+        messages = [m async for m in api.get_messages(ids + ["missing"])]
+        return ids, messages, api.stats
+
+    ids, messages, stats = run_client(stub, fn, batch_size=3)
+    assert len(ids) == 7
+    assert sorted(m["id"] for m in messages) == ids
+    assert stats.batches == 3  # 8 ids, 3 per batch request
+    assert (stats.messages_fetched, stats.messages_failed) == (7, 1)
+
+def test_alert_cards_become_job_rows():
+    rows = message_rows(fake_alert_message(3, jobs=2))
+    assert [r["title"] for r in rows] == ["Stub Engineer 3-0", "Stub Engineer 3-1"]
+    assert [r["company"] for r in rows] == ["Stub Co 0", "Stub Co 1"]
+    assert rows[0]["location"] == "Remote"
+    # logo and title links collapse to one tracking-free URL
+    assert rows[0]["canonical_url"] == "https://www.linkedin.com/comm/jobs/view/3000"
+    assert rows[0]["posted_at"].year == 2023
+    assert len({r["hash_key"] for r in rows}) == 2
+
+def test_canonical_job_url_keeps_only_identifying_params():
+    assert (canonical_job_url("https://WWW.Indeed.com/viewjob/?jk=abc&from=alert&utm_source=x")
+            == "https://www.indeed.com/viewjob?jk=abc")
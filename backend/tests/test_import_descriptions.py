@@ -0,0 +1,43 @@
+import json
+
+from backend.import_descriptions import JOB_DESC_DIR, iter_items, parse_chunk, to_row
+
+SECTIONS = {"Responsibilities": ["Build things."], "Requirements": ["Ship things."]}
+
+def test_to_row_maps_a_titled_record():
+    row = to_row("job_1.json", {"title": " Data Engineer ", "company": "Acme", "description_sections": SECTIONS})
+    assert (row["title"], row["company"], row["source"]) == ("Data Engineer", "Acme", "job_descriptions")
+    assert row["description_snippet"] == "Build things. Ship things."
+
+def test_untitled_records_take_their_first_section_entry():
+    assert to_row("job_1.json", {"description_sections": SECTIONS})["title"] == "Build things"
+    long = {"Responsibilities": ["Participate in software programming initiatives to support innovation, "
+                                 "using Java, JavaScript, Python, SpringBoot, Hibernate"]}
+    title = to_row("job_1.json", {"description_sections": long})["title"]
+    assert title == "Participate in software programming initiatives to support innovation, using…"
+    assert to_row("job_0073231f-b975.json", {})["title"] == "Job description 0073231f"
+
+def test_derived_titles_stay_out_of_the_hash_key():
+    edited = {"Responsibilities": ["Build other things."]}
+    assert to_row("job_1.json", {"description_sections": SECTIONS})["hash_key"] == \
+        to_row("job_1.json", {"description_sections": edited})["hash_key"]
+    assert to_row("job_1.json", {"description_sections": SECTIONS})["hash_key"] != \
+        to_row("job_2.json", {"description_sections": SECTIONS})["hash_key"]
+
+def test_parse_chunk_reports_unparseable_records(tmp_path):
+    (tmp_path / "titled.json").write_text(json.dumps({"job_title": "Nurse", "description_sections": SECTIONS}))
+    (tmp_path / "broken.json").write_text("{")
+
+    rows, errors = parse_chunk(sorted(iter_items(tmp_path)))
+    assert [r["title"] for r in rows] == ["Nurse"]
+    assert [e.split(":")[0] for e in errors] == ["broken.json"]
+
+def test_bundled_samples_import():
+    rows, errors = parse_chunk(list(iter_items(JOB_DESC_DIR)))
+    assert len(rows) >= 40
+    assert all(r["title"] and r["description_sections"] for r in rows)
+    assert len({r["hash_key"] for r in rows}) == len(rows)
+
+def test_placeholder_entries_are_not_titles():
+    sections = {"Responsibilities": ["No information provided."], "Requirements": ["Ship things."]}
+    assert to_row("job_1.json", {"description_sections": sections})["title"] == "Ship things"
@@ -0,0 +1,65 @@
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main, repo
+from backend.db import get_session
+from backend.utils_normalize import make_hash_key
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "request_dedup", lambda: None)
+    monkeypatch.setattr(main, "async_sessionmaker", FakeSession)
+    return TestClient(main.app)
+
+def test_create_job_derives_a_missing_hash_key(client):
+    added = []
+
+    class Session:
+        def add(self, job):
+            added.append(job)
+
+        async def commit(self):
+            pass
+
+        async def refresh(self, job):
+            job.id = uuid.uuid4()
+
+    main.app.dependency_overrides[get_session] = Session
+    try:
+        response = client.post("/jobs", json={"title": "Data Engineer", "company": "Acme", "source": "api"})
+    finally:
+        main.app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert added[0].hash_key == make_hash_key("api", "Data Engineer", "Acme", None, None)
+
+def test_bulk_reports_database_errors_per_statement(client, monkeypatch):
+    calls = []
+
+    async def upsert_jobs(session, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("deadlock detected")
+        return [SimpleNamespace(id=uuid.uuid4(), hash_key=r["hash_key"], inserted=True) for r in rows]
+
+    monkeypatch.setattr(repo, "UPSERT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(repo, "upsert_jobs", upsert_jobs)
+    body = "\n".join([json.dumps({"title": f"Job {i}", "source": "bulk"}) for i in range(3)]
+                     + ["{not json"]
+                     + [json.dumps({"title": f"Job {i}", "source": "bulk"}) for i in range(3, 5)])
+    lines = [json.loads(line) for line in client.post("/jobs/bulk", content=body).text.splitlines()]
+
+    assert calls == [2, 2, 1]
+    assert [r["status"] for r in lines[:-1]] == ["inserted", "inserted", "error", "error", "error", "inserted"]
+    assert lines[2]["error"] == lines[4]["error"] == "database error: deadlock detected"
+    assert lines[-1]["summary"] == {"lines": 6, "inserted": 3, "updated": 0, "errors": 3}
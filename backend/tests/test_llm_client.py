@@ -0,0 +1,92 @@
+import asyncio
+import httpx
+import pytest
+
+from backend import llm_client
+from backend.llm_client import LLMClient, LLMError, LLMStats, chunk_text, estimate_tokens, truncate_to_budget
+from benchmarks.stubs import LLM_REPLY
+
+TEXT = " ".join(f"word{i}" for i in range(2000))  # ~3.5k tokens
+
+def test_truncate_to_budget_leaves_short_text_alone():
+    assert truncate_to_budget("a short CV", 100) == ("a short CV", False)
+    assert truncate_to_budget(TEXT, 0) == (TEXT, False)
+
+def test_truncate_to_budget_cuts_at_a_word_boundary():
+    cut, truncated = truncate_to_budget(TEXT, 500)
+    assert truncated
+    assert estimate_tokens(cut) <= 500
+    assert TEXT.startswith(cut)
+    assert TEXT[len(cut)] == " "  # whole words only
+
+def test_chunk_text_covers_the_text_within_budget():
+    chunks = chunk_text(TEXT, 500)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= 500 for c in chunks)
+    assert " ".join(chunks).split() == TEXT.split()
+
+def test_chunk_text_overlap_repeats_words():
+    plain, overlapping = chunk_text(TEXT, 500), chunk_text(TEXT, 500, overlap_tokens=50)
+    assert len(overlapping) >= len(plain)
+    assert overlapping[1].split()[0] in overlapping[0].split()
+    assert chunk_text("short", 500) == ["short"]
+
+def test_complete_many_isolates_failures():
+    def handler(request):
+        if b"fail" in request.content:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Engineer"}}]})
+
+    async def run():
+        client = LLMClient(url="http://llm.test/v1/chat/completions", stats=LLMStats())
+        await client.http.aclose()
+        client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await client.complete_many("system", ["ok 1", "please fail", "ok 2"]), client.stats
+        finally:
+            await client.aclose()
+
+    results, stats = asyncio.run(run())
+    assert [r.text for r in (results[0], results[2])] == ["Engineer", "Engineer"]
+    assert isinstance(results[1], LLMError)
+    assert (stats.requests, stats.errors) == (2, 1)
+
+def test_complete_and_stream_against_stub(stub):
+    async def run():
+        client = LLMClient(url=f"{stub.url}/v1/chat/completions", max_input_tokens=100, stats=LLMStats())
+        try:
+            completion = await client.complete("system", TEXT)
+            deltas = [d async for d in client.stream("system", "a CV")]
+            return completion, deltas, client.stats.report()
+        finally:
+            await client.aclose()
+
+    completion, deltas, report = asyncio.run(run())
+    assert completion.text == "".join(LLM_REPLY)
+    assert completion.truncated and completion.completion_tokens == len(LLM_REPLY)
+    assert deltas == LLM_REPLY
+    assert report["requests"] == 2 and report["truncated"] == 1 and report["in_flight"] == 0
+
+def test_stream_unreachable_server_raises_llm_error():
+    async def run():
+        client = LLMClient(url="http://127.0.0.1:9/v1/chat/completions", stats=LLMStats())
+        try:
+            async for _ in client.stream("system", "a CV"):
+                pass
+        finally:
+            await client.aclose()
+
+    with pytest.raises(LLMError):
+        asyncio.run(run())
+
+def test_shared_client_is_per_event_loop():
+    async def shared():
+        client = llm_client.get_llm_client()
+        assert llm_client.get_llm_client() is client
+        await llm_client.close_llm_client()
+        return client
+
+    first, second = asyncio.run(shared()), asyncio.run(shared())
+    assert first is not second
+    assert first.http.is_closed and second.http.is_closed
+    assert len(llm_client._clients) == 0
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from backend import matching
+from backend.matching import MatchIndex, build_index
+
+BUILT_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def job(title: str, text: str) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), title=title, description_snippet=text, description_sections=None)
+
+class FakeSession:
+    """Answers the fresh-jobs query and the still-active filter."""
+
+    def __init__(self, fresh, inactive=()):
+        self.fresh, self.inactive = fresh, set(inactive)
+
+    async def execute(self, statement, params):
+        if "ids" in params:
+            active = [uuid.UUID(i) for i in params["ids"] if uuid.UUID(i) not in self.inactive]
+            return SimpleNamespace(scalars=lambda: active)
+        return SimpleNamespace(all=lambda: self.fresh)
+
+def test_match_text_scores_off_the_event_loop(monkeypatch, tmp_path):
+    indexed = [job("Python developer", "Django and Postgres"), job("Nurse", "Night shifts on a ward"),
+               job("Data engineer", "Python pipelines and Spark")]
+    fresh = [job("Python backend engineer", "FastAPI services")]
+    index = build_index([(j.id, j.title, j.description_snippet, None) for j in indexed], BUILT_AT)
+    monkeypatch.setattr(matching, "current_index", lambda: index)
+
+    threads = []
+    vectorize = MatchIndex.vectorize
+
+    def recording_vectorize(self, texts):
+        threads.append(threading.current_thread())
+        return vectorize(self, texts)
+
+    monkeypatch.setattr(MatchIndex, "vectorize", recording_vectorize)
+    session = FakeSession(fresh, inactive=[indexed[2].id])
+    matches = asyncio.run(matching.match_text(session, "Python developer with Django experience", k=2))
+
+    assert [job_id for job_id, _ in matches] == [indexed[0].id, fresh[0].id]
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,95 @@
+import asyncio
+import httpx
+import pytest
+
+from backend import rapidapi_jobs
+from backend.rapidapi_jobs import CrawlStats, JSearchClient, JSearchError, RateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def test_rate_limiter_allows_a_burst_then_paces():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+
+    async def run():
+        for _ in range(4):
+            await limiter.acquire()
+
+    asyncio.run(run())
+    assert clock.sleeps == [0.5, 0.5]  # the burst is free, then one token every 1/rate seconds
+    assert clock.now == 1.0
+
+def test_rate_limiter_refills_while_idle():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=1, burst=3, clock=clock, sleep=clock.sleep)
+
+    async def run():
+        for _ in range(3):
+            await limiter.acquire()
+        clock.now += 10  # idle: refills to the burst size, not beyond
+        for _ in range(4):
+            await limiter.acquire()
+
+    asyncio.run(run())
+    assert clock.sleeps == [1.0]
+
+def jsearch(handler, max_retries=3) -> tuple[JSearchClient, httpx.AsyncClient]:
+    http = httpx.AsyncClient(base_url="http://jsearch.test", transport=httpx.MockTransport(handler))
+    clock = FakeClock()
+    limiter = RateLimiter(rate=1000, clock=clock, sleep=clock.sleep)
+    return JSearchClient(http, limiter=limiter, max_retries=max_retries, stats=CrawlStats()), http
+
+def test_retries_429_and_5xx_then_succeeds(monkeypatch):
+    monkeypatch.setattr(rapidapi_jobs, "RETRY_BASE_DELAY", 0)
+    responses = [httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(503),
+                 httpx.Response(200, json={"status": "OK", "data": [{"job_id": "a"}]})]
+
+    async def run():
+        api, http = jsearch(lambda request: responses.pop(0))
+        async with http:
+            return await api.search_page("python", 1), api.stats
+
+    page, stats = asyncio.run(run())
+    assert page == [{"job_id": "a"}]
+    assert (stats.requests, stats.retries, stats.failures) == (3, 2, 0)
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(rapidapi_jobs, "RETRY_BASE_DELAY", 0)
+
+    async def run():
+        api, http = jsearch(lambda request: httpx.Response(500), max_retries=2)
+        async with http:
+            return await api.job_details("a"), api.stats
+
+    details, stats = asyncio.run(run())
+    assert details is None
+    assert (stats.requests, stats.retries, stats.failures) == (3, 2, 1)
+
+def test_client_errors_are_not_retried():
+    async def run():
+        api, http = jsearch(lambda request: httpx.Response(404))
+        async with http:
+            with pytest.raises(JSearchError):
+                await api.search_page("python", 1)
+            return api.stats
+
+    stats = asyncio.run(run())
+    assert (stats.requests, stats.retries, stats.failures) == (1, 0, 1)
+
+def test_an_empty_page_is_not_an_error():
+    async def run():
+        api, http = jsearch(lambda request: httpx.Response(200, json={"status": "OK", "data": []}))
+        async with http:
+            return await api.search_page("python", 9)
+
+    assert asyncio.run(run()) == []
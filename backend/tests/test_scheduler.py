@@ -0,0 +1,140 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import httpx
+
+from backend import repo, scheduler
+from backend.rapidapi_jobs import JSearchClient, RateLimiter
+from backend.scheduler import Scheduler
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+class FakeClock:
+    """Wall clock that only moves when the scheduler sleeps."""
+
+    def __init__(self):
+        self.now = START
+        self.sleeps = []
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += timedelta(seconds=seconds)
+
+class FakeRepo:
+    """The saved_query / job_post state the scheduler reads and writes."""
+
+    def __init__(self, monkeypatch, queries):
+        self.queries = queries  # [query, num_pages, interval_seconds, next_run_at]
+        self.upserted = []
+        self.finished = []
+        self.deactivated = []
+        for name in ("due_saved_queries", "next_saved_query_due", "mark_saved_queries_run",
+                     "start_crawl_run", "finish_crawl_run", "existing_hash_keys", "upsert_jobs",
+                     "touch_last_seen", "deactivate_missing_for_source"):
+            monkeypatch.setattr(repo, name, getattr(self, name))
+        monkeypatch.setattr(scheduler, "dedup_pending", self.dedup_pending)
+
+    async def due_saved_queries(self, session, now):
+        return [SimpleNamespace(id=i, query=q[0], num_pages=q[1]) for i, q in enumerate(self.queries)
+                if q[3] <= now]
+
+    async def next_saved_query_due(self, session):
+        return min((q[3] for q in self.queries), default=None)
+
+    async def mark_saved_queries_run(self, session, ids, ran_at, run_id=None):
+        for i in ids:
+            self.queries[i][3] = ran_at + timedelta(seconds=self.queries[i][2])
+
+    async def start_crawl_run(self, session, source, query, full):
+        return 1, START
+
+    async def finish_crawl_run(self, session, run_id, status, counts, error):
+        self.finished.append((status, counts))
+
+    async def existing_hash_keys(self, session, hash_keys):
+        return {r["hash_key"] for r in self.upserted} & set(hash_keys)
+
+    async def upsert_jobs(self, session, rows):
+        self.upserted.extend(rows)
+        return [SimpleNamespace(inserted=True) for _ in rows]
+
+    async def touch_last_seen(self, session, hash_keys):
+        return len(hash_keys)
+
+    async def deactivate_missing_for_source(self, session, source, cutoff):
+        self.deactivated.append((source, cutoff))
+        return 0
+
+    async def dedup_pending(self):
+        return "ok"
+
+def run_scheduler(stub, clock, fn):
+    async def run():
+        async with httpx.AsyncClient(base_url=stub.url) as http:
+            limiter = RateLimiter(rate=1000, clock=lambda: 0.0)
+            return await fn(Scheduler(JSearchClient(http, limiter=limiter), clock=clock, sleep=clock.sleep,
+                                      poll_interval=60))
+    return asyncio.run(run())
+
+def test_tick_does_nothing_before_a_query_is_due(stub, no_db, monkeypatch):
+    db = FakeRepo(monkeypatch, [["python", 1, 3600, START + timedelta(seconds=30)]])
+    clock = FakeClock()
+
+    async def fn(s):
+        return await s.tick(), await s.seconds_until_due()
+
+    assert run_scheduler(stub, clock, fn) == (None, 30.0)
+    assert db.finished == []
+
+def test_tick_merges_job_ids_across_queries(stub, no_db, monkeypatch):
+    # jobs_per_page=4: slots 0 and 2 of every page are shared by all queries
+    db = FakeRepo(monkeypatch, [["python", 2, 3600, START], ["backend", 2, 600, START]])
+    clock = FakeClock()
+
+    async def fn(s):
+        return await s.tick(), s.api.stats
+
+    tick, api = run_scheduler(stub, clock, fn)
+    assert (tick.queries, tick.pages, tick.job_ids_listed) == (2, 4, 16)
+    assert (tick.job_ids_unique, tick.duplicates) == (12, 4)
+    assert api.requests == 4 + 12  # every job's details fetched once
+    assert len(db.upserted) == 12
+    assert db.finished == [("succeeded", db.finished[0][1])]
+    assert [q[3] for q in db.queries] == [START + timedelta(seconds=3600), START + timedelta(seconds=600)]
+
+def test_run_forever_sleeps_until_the_next_query_is_due(stub, no_db, monkeypatch):
+    db = FakeRepo(monkeypatch, [["python", 1, 3600, START], ["backend", 1, 90, START]])
+    clock = FakeClock()
+
+    async def fn(s):
+        async def sleep(seconds):
+            await clock.sleep(seconds)
+            if clock.now > START + timedelta(seconds=180):
+                s.stop()
+        s.sleep = sleep
+        await s.run_forever()
+
+    run_scheduler(stub, clock, fn)
+    # polls at most every 60s; "backend" runs at 0, 90 and 180s, "python" only at 0
+    assert clock.sleeps == [60, 30, 60, 30, 60]
+    assert len(db.finished) == 3
+    assert db.queries[0][3] == START + timedelta(seconds=3600)
+
+def test_failed_pages_fail_the_tick_and_deactivate_nothing(no_db, monkeypatch):
+    db = FakeRepo(monkeypatch, [["python", 2, 3600, START]])
+    clock = FakeClock()
+
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        async with httpx.AsyncClient(base_url="http://jsearch.test", transport=transport) as http:
+            api = JSearchClient(http, limiter=RateLimiter(rate=1000, clock=lambda: 0.0), max_retries=0)
+            return await Scheduler(api, clock=clock, sleep=clock.sleep).tick()
+
+    tick = asyncio.run(run())
+    assert tick.page_errors == 2
+    assert [status for status, _ in db.finished] == ["failed"]
+    assert db.deactivated == []
@@ -0,0 +1,20 @@
+import asyncio
+import pytest
+
+from backend.db import DATABASE_URL
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="needs Postgres (DATABASE_URL)")
+
+def test_fulltext_search_is_served_by_the_gin_index():
+    from sqlalchemy import text
+    from backend.db import async_sessionmaker
+    from benchmarks.bench_search import QUERIES, build, explain, index_names
+
+    async def run():
+        async with async_sessionmaker() as session:
+            # a small table would be scanned whatever the indexes; ask whether the index can serve it
+            await session.execute(text("set local enable_seqscan = off"))
+            return {q: index_names(await explain(session, build(q, "fulltext"))) for q in QUERIES}
+
+    for q, used in asyncio.run(run()).items():
+        assert "ix_job_post_search_vector" in used, f"fulltext {q!r} did not use the GIN index: {used}"
@@ -0,0 +1,72 @@
+# benchmarks/bench_bulk_ingest.py
+"""POST /jobs/bulk throughput and server memory for one large NDJSON upload.
+
+Streams --rows synthetic jobs (source 'bench_bulk', no hash_key, so the
+server derives it) through the app in-process with httpx's ASGI transport,
+against DATABASE_URL. It compares that with the same rows sent one POST /jobs
+at a time (--single rows) and reports rows/sec and peak RSS. The body is
+generated lazily and results=errors keeps the response small, so RSS growth
+belongs to the server.
+
+    python -m benchmarks.bench_bulk_ingest --rows 100000 --single 500
+"""
+import argparse, asyncio, json, resource, time
+import httpx
+from backend.main import app
+from benchmarks.synthetic import synthetic_jobs, delete_source
+
+BENCH_SOURCE = "bench_bulk"
+
+def job_json(row: dict, hash_key: bool = False) -> dict:
+    row = {k: v for k, v in row.items() if hash_key or k != "hash_key"}
+    row["posted_at"] = row["posted_at"].isoformat()
+    return row
+
+async def ndjson_body(rows: int, chunk_rows: int = 200):
+    batch = []
+    for row in synthetic_jobs(rows, seed=7, source=BENCH_SOURCE):
+        batch.append(json.dumps(job_json(row)))
+        if len(batch) == chunk_rows:
+            yield ("\n".join(batch) + "\n").encode()
+            batch = []
+    if batch:
+        yield ("\n".join(batch) + "\n").encode()
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single", type=int, default=500, help="rows to send one POST /jobs each")
+    args = parser.parse_args()
+
+    await delete_source(BENCH_SOURCE)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        rss_before = peak_rss_mb()
+        t0 = time.perf_counter()
+        response = await client.post("/jobs/bulk?results=errors", content=ndjson_body(args.rows),
+                                     headers={"Content-Type": "application/x-ndjson"})
+        bulk_seconds = time.perf_counter() - t0
+        summary = json.loads(response.text.splitlines()[-1])["summary"]
+        bulk_rss = peak_rss_mb()
+
+        await delete_source(BENCH_SOURCE)
+        t0 = time.perf_counter()
+        for row in synthetic_jobs(args.single, seed=7, source=BENCH_SOURCE):
+            # POST /jobs doesn't derive hash_key, so send it
+            (await client.post("/jobs", json=job_json(row, hash_key=True))).raise_for_status()
+        single_seconds = time.perf_counter() - t0
+
+    print(json.dumps({
+        "bulk": {"rows": args.rows, "seconds": round(bulk_seconds, 2),
+                 "rows_per_sec": round(args.rows / bulk_seconds), **summary,
+                 "peak_rss_mb": round(bulk_rss, 1), "rss_growth_mb": round(bulk_rss - rss_before, 1)},
+        "single": {"rows": args.single, "seconds": round(single_seconds, 2),
+                   "rows_per_sec": round(args.single / single_seconds)},
+    }, indent=2))
+    await delete_source(BENCH_SOURCE)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+# benchmarks/bench_cv_pipeline.py
+"""End-to-end CV latency: spawning `python -m backend.cv_to_keywords` per
+upload (the old Next.js route) vs POST /cv to the warm API worker.
+
+LM Studio and JSearch are replaced by local stubs (benchmarks/stubs.py), so
+only DATABASE_URL has to be reachable, and only by the API process.
+
+    python -m benchmarks.bench_cv_pipeline --runs 5 --pdf frontend/uploads/Hayden_Le_Resume.pdf
+"""
+import argparse, json, os, shutil, statistics, subprocess, sys, time
+from pathlib import Path
+import httpx
+from benchmarks.stubs import serve
+
+ROOT = Path(__file__).resolve().parents[1]
+UPLOAD_DIR = ROOT / "frontend" / "uploads"
+
+def stub_env(stub_url: str) -> dict:
+    return {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "LMSTUDIO_URL": f"{stub_url}/v1/chat/completions",
+        "JSEARCH_BASE_URL": stub_url,
+        "RAPIDAPI_KEY": os.environ.get("RAPIDAPI_KEY", "bench"),
+    }
+
+def spawn_once(env: dict, filename: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "backend.cv_to_keywords", filename],
+                   cwd=ROOT, env=env, check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+def worker_once(client: httpx.Client, pdf: Path) -> float:
+    t0 = time.perf_counter()
+    r = client.post("/cv", files={"cv": (pdf.name, pdf.read_bytes(), "application/pdf")})
+    r.raise_for_status()
+    with client.stream("GET", f"/cv/jobs/{r.json()['job_id']}/events") as events:
+        for line in events.iter_lines():
+            if line.startswith("data:"):
+                snapshot = json.loads(line[5:])
+                if snapshot["status"] in ("done", "failed"):
+                    assert snapshot["status"] == "done", snapshot
+                    break
+    return time.perf_counter() - t0
+
+def summary(samples: list[float]) -> dict:
+    return {"runs": len(samples), "p50_s": round(statistics.median(samples), 3),
+            "mean_s": round(statistics.mean(samples), 3), "max_s": round(max(samples), 3)}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pdf", type=Path, default=UPLOAD_DIR / "Hayden_Le_Resume.pdf")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    stub = serve()
+    env = stub_env(f"http://127.0.0.1:{stub.server_address[1]}")
+
+    filename = f"bench_{args.pdf.name}"
+    shutil.copy(args.pdf, UPLOAD_DIR / filename)
+    spawn = [spawn_once(env, filename) for _ in range(args.runs)]
+    (UPLOAD_DIR / filename).unlink()
+
+    api = subprocess.Popen([sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(args.port)],
+                           cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=60) as client:
+            for _ in range(100):
+                try:
+                    client.get("/healthz").raise_for_status()
+                    break
+                except httpx.HTTPError:
+                    time.sleep(0.1)
+            worker = [worker_once(client, args.pdf) for _ in range(args.runs)]
+    finally:
+        api.terminate()
+        api.wait()
+
+    print(json.dumps({"spawn_per_upload": summary(spawn), "warm_worker": summary(worker)}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/bench_dedup.py
+"""MinHash/LSH near-duplicate clustering at scale, in memory (no database).
+
+Streams --rows synthetic jobs. A --dup-rate share of them are near-copies of
+an earlier job: same description, reworded title, different source and URL.
+It reports signature and clustering throughput, candidate comparisons per
+row (LSH keeps this flat while brute force grows with the corpus),
+precision/recall against the injected duplicates, index size and peak RSS.
+
+    python -m benchmarks.bench_dedup --rows 1000000 --dup-rate 0.1
+"""
+import argparse, random, resource, time
+import numpy as np
+from backend.dedup import Deduper, band_keys, job_text, signatures, NUM_PERM
+from benchmarks.synthetic import synthetic_jobs, SOURCES
+
+TITLE_EDITS = [
+    lambda t: t.replace("Senior ", "Sr. ") if "Senior " in t else "Senior " + t,
+    lambda t: t + " (Remote)",
+    lambda t: t + " - Immediate Start",
+    lambda t: t.upper(),
+]
+
+def near_copy(rng: random.Random, row: dict) -> dict:
+    sections = {k: list(v) for k, v in row["description_sections"].items()}
+    if len(sections["Responsibilities"]) > 3:
+        sections["Responsibilities"].pop(rng.randrange(len(sections["Responsibilities"])))
+    return {**row, "title": rng.choice(TITLE_EDITS)(row["title"]), "description_sections": sections,
+            "source": rng.choice(SOURCES), "canonical_url": row["canonical_url"] + "?ref=alert"}
+
+def corpus(n: int, dup_rate: float, seed: int = 0, batch: int = 10_000):
+    """Yields batches of (texts, truth) where truth[i] is the original's index or -1."""
+    rng = random.Random(seed)
+    originals = []  # recent originals to copy from: (index, row)
+    index = 0
+    while index < n:
+        size = min(batch, n - index)
+        texts, truth = [], []
+        for row in synthetic_jobs(size, seed=seed + index, start=index):
+            if originals and rng.random() < dup_rate:
+                orig_index, orig = rng.choice(originals)
+                row, source = near_copy(rng, orig), orig_index
+            else:
+                source = -1
+                originals.append((index, row))
+                if len(originals) > 5000:
+                    originals.pop(rng.randrange(len(originals)))
+            texts.append(job_text(row["title"], row["company"], row["description_snippet"], row["description_sections"]))
+            truth.append(source)
+            index += 1
+        yield texts, truth
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dup-rate", type=float, default=0.1)
+    parser.add_argument("--brute-force-sample", type=int, default=5000)
+    args = parser.parse_args()
+
+    deduper = Deduper()
+    sig_seconds = assign_seconds = 0.0
+    tp = fp = fn = 0
+    start = time.perf_counter()
+    offset = 0
+    sample_sigs = []
+    for texts, truth in corpus(args.rows, args.dup_rate):
+        t0 = time.perf_counter()
+        sigs = signatures(texts)
+        keys = band_keys(sigs)
+        sig_seconds += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        canonical = [deduper.assign(offset + i, sigs[i], keys[i]) for i in range(len(texts))]
+        assign_seconds += time.perf_counter() - t0
+        for got, want in zip(canonical, truth):
+            # an original may itself be clustered under an earlier job, so compare clusters loosely
+            if want >= 0 and got is not None:
+                tp += 1
+            elif want >= 0:
+                fn += 1
+            elif got is not None:
+                fp += 1
+        if len(sample_sigs) * len(texts) < args.brute_force_sample:
+            sample_sigs.append(sigs)
+        offset += len(texts)
+        if offset % 100_000 == 0 or offset == args.rows:
+            print(f"... {offset} rows, {deduper.comparisons / offset:.2f} comparisons/row, "
+                  f"{offset / (time.perf_counter() - start):.0f} rows/sec")
+
+    elapsed = time.perf_counter() - start
+    sample = np.concatenate(sample_sigs)[:args.brute_force_sample]
+    t0 = time.perf_counter()
+    for i in range(1, len(sample)):
+        (sample[:i] == sample[i]).sum(axis=1)
+    brute = time.perf_counter() - t0
+    n = len(sample)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"rows:                 {args.rows} ({args.dup_rate:.0%} injected near-duplicates)")
+    print(f"signatures:           {args.rows / sig_seconds:,.0f} rows/sec ({NUM_PERM} permutations)")
+    print(f"LSH clustering:       {args.rows / assign_seconds:,.0f} rows/sec, "
+          f"{deduper.comparisons / args.rows:.2f} candidate comparisons/row")
+    print(f"brute force:          {n * (n - 1) // 2 / brute:,.0f} comparisons/sec on {n} rows; "
+          f"{args.rows // 2:,} comparisons/row at {args.rows} rows")
+    print(f"end to end:           {elapsed:.1f}s = {args.rows / elapsed:,.0f} rows/sec")
+    print(f"clusters:             {len(deduper):,} canonical jobs")
+    print(f"precision / recall:   {tp / max(1, tp + fp):.4f} / {tp / max(1, tp + fn):.4f}")
+    print(f"index:                {deduper.index.nbytes() / 2**20:.1f} MB + signatures "
+          f"{len(deduper) * NUM_PERM * 4 / 2**20:.1f} MB, peak RSS {rss:.0f} MB")
+
+if __name__ == "__main__":
+    main()
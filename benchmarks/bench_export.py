@@ -0,0 +1,49 @@
+# benchmarks/bench_export.py
+"""Rows/sec, bytes and peak memory of GET /jobs/export for a large table.
+
+Seeds --rows synthetic jobs (source 'bench_export') into DATABASE_URL, then
+drains main.export_rows (the endpoint's body generator) for NDJSON, CSV and
+gzipped NDJSON, discarding the output. Peak RSS is sampled after each format;
+with a server-side cursor it should stay flat as --rows grows.
+
+    python -m benchmarks.bench_export --rows 1000000
+"""
+import argparse, asyncio, json, resource, time
+from sqlalchemy import select
+from backend.main import JOB_VIEWS, JobPost, export_rows, filter_jobs
+from benchmarks.synthetic import seed_jobs, delete_source
+
+BENCH_SOURCE = "bench_export"
+
+async def drain(columns, format: str, compress: bool) -> dict:
+    stmt, _ = filter_jobs(select(*(getattr(JobPost, c) for c in columns)), source=BENCH_SOURCE)
+    size = chunks = 0
+    t0 = time.perf_counter()
+    async for chunk in export_rows(stmt, columns, format, compress):
+        size += len(chunk)
+        chunks += 1
+    return {"seconds": round(time.perf_counter() - t0, 2), "mb": round(size / 2**20, 1), "chunks": chunks,
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--view", choices=sorted(JOB_VIEWS), default="full")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    await seed_jobs(args.rows, BENCH_SOURCE)
+    columns = JOB_VIEWS[args.view]
+    results = {}
+    for name, format, compress in (("ndjson", "ndjson", False), ("csv", "csv", False), ("ndjson_gzip", "ndjson", True)):
+        r = await drain(columns, format, compress)
+        r["rows_per_sec"] = round(args.rows / r["seconds"])
+        results[name] = r
+        print(name, r)
+    print(json.dumps({"rows": args.rows, "view": args.view, **results}, indent=2))
+
+    if args.cleanup:
+        await delete_source(BENCH_SOURCE)
+
+if __name__ == "__main__":
+    asyncio.run(main())
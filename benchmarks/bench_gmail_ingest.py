@@ -0,0 +1,54 @@
+# benchmarks/bench_gmail_ingest.py
+"""Gmail sync throughput against the fake Gmail API in benchmarks/stubs.py.
+
+Runs a full sync over --messages alert emails, then delivers --new more and
+runs an incremental sync from the stored historyId. Reports messages/sec and
+bytes downloaded for each. Needs DATABASE_URL; the checkpoint is kept under
+a separate GMAIL_USER and the stub's jobs are deleted afterwards.
+
+    python -m benchmarks.bench_gmail_ingest --messages 500 --new 20 --batch-size 10 50
+"""
+import argparse, asyncio, os
+
+os.environ.setdefault("GMAIL_USER", "bench@example.com")
+
+from sqlalchemy import text
+from backend.db import async_sessionmaker
+from backend import gmail_ingest
+from benchmarks.stubs import serve, add_gmail_messages
+
+async def cleanup():
+    async with async_sessionmaker() as session:
+        await session.execute(text("delete from job_post where source = 'gmail' and company like 'Stub Co %'"))
+        await session.execute(text("delete from gmail_sync_state where account = :a"), {"a": gmail_ingest.GMAIL_USER})
+        await session.commit()
+
+def row(label: str, stats: gmail_ingest.SyncStats):
+    print(f"{label:<26} {stats.messages_fetched:>6} msgs  {stats.elapsed:6.2f}s  "
+          f"{stats.messages_per_sec:8.1f} msgs/sec  {stats.bytes_downloaded / 1024:9.1f} KiB  "
+          f"{stats.requests:>4} requests  {stats.jobs_saved:>6} new jobs")
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--new", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[10, 50])
+    args = parser.parse_args()
+
+    for batch_size in args.batch_size:
+        stub = serve(gmail_messages=args.messages)
+        base_url = f"http://127.0.0.1:{stub.server_address[1]}"
+        await cleanup()
+        try:
+            async with gmail_ingest.make_client(base_url, token="bench") as client:
+                row(f"full batch={batch_size}", await gmail_ingest._sync(
+                    gmail_ingest.GmailClient(client, batch_size=batch_size), full=True))
+                add_gmail_messages(stub, args.new)
+                row(f"incremental batch={batch_size}", await gmail_ingest._sync(
+                    gmail_ingest.GmailClient(client, batch_size=batch_size), full=False))
+        finally:
+            stub.shutdown()
+            await cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
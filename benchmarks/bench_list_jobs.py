@@ -0,0 +1,90 @@
+# benchmarks/bench_list_jobs.py
+"""Payload size and throughput of GET /jobs views at limit=100 and limit=1000.
+
+Calls main._list_jobs directly (no HTTP, no response cache) against
+DATABASE_URL after seeding --rows synthetic jobs (source 'bench_list_jobs'),
+for each of:
+
+  entities  the old path: select(JobPost) + per-row JobOut validation
+  full      every JobOut column, row tuples serialized with orjson
+  card      view=card: the JobCard columns, no description_sections
+
+Each case runs --concurrency sessions in a closed loop for --seconds.
+
+    python -m benchmarks.bench_list_jobs --rows 50000 --seconds 10
+"""
+import argparse, asyncio, json, statistics, time
+from pydantic import TypeAdapter
+from sqlalchemy import select, desc
+from backend.db import async_sessionmaker
+from backend.main import JobOut, JOB_VIEWS, _list_jobs
+from backend.models import JobPost
+from benchmarks.synthetic import seed_jobs, delete_source
+
+BENCH_SOURCE = "bench_list_jobs"
+job_list_adapter = TypeAdapter(list[JobOut])
+
+async def entities_page(session, limit: int) -> bytes:
+    stmt = (select(JobPost).where(JobPost.is_active, JobPost.source == BENCH_SOURCE)
+            .order_by(desc(JobPost.posted_at), desc(JobPost.id)).limit(limit))
+    rows = (await session.execute(stmt)).scalars().all()
+    return job_list_adapter.dump_json(job_list_adapter.validate_python(rows, from_attributes=True))
+
+async def view_page(session, limit: int, view: str) -> bytes:
+    body, _ = await _list_jobs(session, None, "substring", BENCH_SOURCE, None, 1, limit, None, False,
+                               columns=JOB_VIEWS[view])
+    return body
+
+async def run_case(case: str, limit: int, seconds: float, concurrency: int) -> dict:
+    async def page(session):
+        if case == "entities":
+            return await entities_page(session, limit)
+        return await view_page(session, limit, case)
+
+    async with async_sessionmaker() as session:
+        size = len(await page(session))  # also warms the pool and statement cache
+
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        async with async_sessionmaker() as session:
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                await page(session)
+                latencies.append(time.perf_counter() - t0)
+                session.expunge_all()  # don't let the identity map grow across requests
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "bytes": size,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    await seed_jobs(args.rows, BENCH_SOURCE)
+    results = {}
+    for limit in (100, 1000):
+        results[f"limit_{limit}"] = {
+            case: await run_case(case, limit, args.seconds, args.concurrency)
+            for case in ("entities", "full", "card")
+        }
+    print(json.dumps({"rows": args.rows, "concurrency": args.concurrency, **results}, indent=2))
+
+    if args.cleanup:
+        await delete_source(BENCH_SOURCE)
+
+if __name__ == "__main__":
+    asyncio.run(main())
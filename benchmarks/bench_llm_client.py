@@ -0,0 +1,100 @@
+# benchmarks/bench_llm_client.py
+"""Job-title inference for a batch of CVs against the LM Studio stub.
+
+  sync_per_call   the old path: a blocking httpx.Client per CV, one at a time,
+                  full CV text sent
+  async cN        LLMClient.complete_many with N concurrent requests over one
+                  pooled connection set, CVs truncated to --max-input-tokens
+  stream          LLMClient.stream for a few CVs, reporting time to first token
+
+The stub answers each request after --llm-delay seconds and serves requests
+in parallel, so this measures the client, not a GPU. A real LM Studio
+serialises generation, so LLM_MAX_CONCURRENCY beyond its parallel slots only
+adds queue delay.
+
+    python -m benchmarks.bench_llm_client --cvs 64 --llm-delay 0.2 --concurrency 1 4 8
+"""
+import argparse, asyncio, json, random, statistics, time
+import httpx
+from backend.llm_client import LLMClient, LLMStats, estimate_tokens
+from backend.cv_to_keywords import SYSTEM_PROMPT, TEMPERATURE
+from benchmarks.stubs import serve
+from benchmarks.synthetic import TITLES, WORDS
+
+def synthetic_cvs(n: int, seed: int = 0) -> list[str]:
+    """CV-like texts from ~300 to ~12k tokens, so some exceed the input budget."""
+    rng = random.Random(seed)
+    return [f"{rng.choice(TITLES)}\n" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(200, 8000)))
+            for _ in range(n)]
+
+def sync_per_call(url: str, texts: list[str]) -> dict:
+    t0 = time.perf_counter()
+    for text in texts:
+        with httpx.Client(timeout=120) as client:
+            client.post(url, json={"model": "stub", "temperature": TEMPERATURE, "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": text}]}).raise_for_status()
+    seconds = time.perf_counter() - t0
+    return {"seconds": round(seconds, 3), "cvs_per_sec": round(len(texts) / seconds, 1),
+            "prompt_tokens": sum(estimate_tokens(SYSTEM_PROMPT + t) for t in texts)}
+
+async def async_batch(url: str, texts: list[str], concurrency: int, max_input_tokens: int) -> dict:
+    stats = LLMStats()
+    client = LLMClient(url=url, max_concurrency=concurrency, max_input_tokens=max_input_tokens, stats=stats)
+    try:
+        t0 = time.perf_counter()
+        results = await client.complete_many(SYSTEM_PROMPT, texts, TEMPERATURE)
+        seconds = time.perf_counter() - t0
+    finally:
+        await client.aclose()
+    queue = sorted(r.queue_seconds for r in results if not isinstance(r, Exception))
+    report = stats.report()
+    return {"seconds": round(seconds, 3), "cvs_per_sec": round(len(texts) / seconds, 1),
+            "errors": report["errors"], "truncated": report["truncated"], "prompt_tokens": report["prompt_tokens"],
+            "tokens_per_second": report["tokens_per_second"],
+            "queue_p50_ms": round(statistics.median(queue) * 1000, 1),
+            "queue_max_ms": round(queue[-1] * 1000, 1)}
+
+async def stream_ttft(url: str, texts: list[str], max_input_tokens: int) -> dict:
+    client = LLMClient(url=url, max_concurrency=1, max_input_tokens=max_input_tokens, stats=LLMStats())
+    first, total = [], []
+    try:
+        for text in texts:
+            t0 = time.perf_counter()
+            async for i, _ in aenumerate(client.stream(SYSTEM_PROMPT, text, TEMPERATURE)):
+                if i == 0:
+                    first.append(time.perf_counter() - t0)
+            total.append(time.perf_counter() - t0)
+    finally:
+        await client.aclose()
+    return {"first_token_ms": round(statistics.median(first) * 1000, 1),
+            "complete_ms": round(statistics.median(total) * 1000, 1)}
+
+async def aenumerate(iterable):
+    i = 0
+    async for item in iterable:
+        yield i, item
+        i += 1
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cvs", type=int, default=64)
+    parser.add_argument("--llm-delay", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--max-input-tokens", type=int, default=3000)
+    args = parser.parse_args()
+
+    stub = serve(llm_delay=args.llm_delay)
+    url = f"http://127.0.0.1:{stub.server_address[1]}/v1/chat/completions"
+    texts = synthetic_cvs(args.cvs)
+
+    results = {"cvs": args.cvs, "llm_delay": args.llm_delay,
+               "sync_per_call": await asyncio.to_thread(sync_per_call, url, texts)}
+    for concurrency in args.concurrency:
+        results[f"async_c{concurrency}"] = await async_batch(url, texts, concurrency, args.max_input_tokens)
+        print(concurrency, results[f"async_c{concurrency}"])
+    results["stream"] = await stream_ttft(url, texts[:5], args.max_input_tokens)
+    stub.shutdown()
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
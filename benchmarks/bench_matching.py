@@ -0,0 +1,86 @@
+# benchmarks/bench_matching.py
+"""CV-to-job ranking over a synthetic corpus, in memory (no database).
+
+Builds a hashed TF-IDF index for --jobs synthetic jobs, saves it and loads it
+back memory-mapped, just as the API does. It then times ranking single CVs
+(one matrix-vector product plus top-k) and a --batch of CVs in one matrix
+product. Each "CV" is a job's own text with a third of its sentences dropped,
+so the job it came from should rank first; the hit rate is reported as a
+sanity check on the hashing.
+
+    python -m benchmarks.bench_matching --jobs 100000 --queries 200
+"""
+import argparse, random, resource, tempfile, time, uuid
+from pathlib import Path
+import numpy as np
+from backend.matching import MatchIndex, build_index, top_k, MATCH_DIM, MATCH_TOP_K
+from benchmarks.synthetic import synthetic_jobs
+
+def cv_text(rng: random.Random, row: dict) -> str:
+    sentences = [s for items in row["description_sections"].values() for s in items]
+    kept = [s for s in sentences if rng.random() > 0.33] or sentences
+    return " ".join([row["title"], *kept])
+
+def percentile(values: list[float], p: float) -> float:
+    return float(np.percentile(values, p)) * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--dim", type=int, default=MATCH_DIM)
+    parser.add_argument("--top", type=int, default=MATCH_TOP_K)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rows = [(uuid.UUID(int=rng.getrandbits(128)), r) for r in synthetic_jobs(args.jobs, seed=1)]
+
+    started = time.perf_counter()
+    built = build_index(((job_id, r["title"], r["description_snippet"], r["description_sections"])
+                         for job_id, r in rows), dim=args.dim)
+    build_seconds = time.perf_counter() - started
+    print(f"Built {len(built)} x {built.dim} index in {build_seconds:.1f}s "
+          f"({len(built) / build_seconds:,.0f} jobs/sec, {built.vectors.nbytes / 2**20:.0f} MB)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        built.save(Path(tmp))
+        index = MatchIndex.load(Path(tmp))
+        print(f"Saved and mmap-loaded in {time.perf_counter() - started:.2f}s")
+        index.scores(index.vectorize(["warm up"]))  # fault the pages in
+
+        picks = [rng.randrange(len(rows)) for _ in range(args.queries)]
+        texts = [cv_text(rng, rows[i][1]) for i in picks]
+
+        vectorize, score, hits, in_top = [], [], 0, 0
+        for i, text in zip(picks, texts):
+            t0 = time.perf_counter()
+            query = index.vectorize([text])
+            t1 = time.perf_counter()
+            best = top_k(index.scores(query)[:, 0], args.top)
+            t2 = time.perf_counter()
+            vectorize.append(t1 - t0)
+            score.append(t2 - t1)
+            hits += index.job_id(best[0]) == rows[i][0]
+            in_top += rows[i][0] in {index.job_id(j) for j in best[:10]}
+
+        batches = []
+        for start in range(0, len(texts) - args.batch + 1, args.batch):
+            t0 = time.perf_counter()
+            scores = index.scores(index.vectorize(texts[start:start + args.batch]))
+            for column in scores.T:
+                top_k(column, args.top)
+            batches.append(time.perf_counter() - t0)
+
+    print(f"Vectorise CV: p50 {percentile(vectorize, 50):.2f}ms, p95 {percentile(vectorize, 95):.2f}ms")
+    print(f"Score {len(index):,} jobs + top-{args.top}: p50 {percentile(score, 50):.1f}ms, "
+          f"p95 {percentile(score, 95):.1f}ms, p99 {percentile(score, 99):.1f}ms")
+    if batches:
+        print(f"Batch of {args.batch} CVs: p50 {percentile(batches, 50):.1f}ms "
+              f"({percentile(batches, 50) / args.batch:.1f}ms per CV)")
+    print(f"Source job ranked first for {hits}/{len(picks)} CVs, in the top 10 for {in_top}")
+    print(f"Peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+if __name__ == "__main__":
+    main()
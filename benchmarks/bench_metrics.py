@@ -0,0 +1,73 @@
+# benchmarks/bench_metrics.py
+"""Overhead of backend/metrics.py instrumentation (no database, no network).
+
+  observe        one Histogram.observe() call
+  middleware     GET /healthz through the full app (httpx ASGI transport),
+                 with METRICS_ENABLED toggled off and on
+  sql            `select 1` on an in-memory SQLite engine, with and without
+                 instrument_engine's cursor events (most of the difference is
+                 SQLAlchemy's event dispatch itself)
+  render         GET /metrics text for --series label sets
+
+    python -m benchmarks.bench_metrics --requests 5000
+"""
+import argparse, asyncio, json, time
+import httpx
+from sqlalchemy import create_engine, text
+from backend import metrics
+from backend.main import app
+
+def per_call_us(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+async def healthz_us(client: httpx.AsyncClient, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await client.get("/healthz")
+    return (time.perf_counter() - t0) / n * 1e6
+
+def sql_us(instrumented: bool, n: int) -> float:
+    engine = create_engine("sqlite://")
+    if instrumented:
+        metrics.instrument_engine(engine, slow_query_ms=10_000)
+    with engine.connect() as conn:
+        stmt = text("select 1")
+        run = lambda: conn.execute(stmt).scalar()
+        per_call_us(run, 1000)  # warm up the compiled cache
+        return min(per_call_us(run, n) for _ in range(3))
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--series", type=int, default=200)
+    args = parser.parse_args()
+
+    histogram = metrics.register(metrics.Histogram("bench_seconds", "bench", ("route",)))
+    results = {"observe_us": round(per_call_us(lambda: histogram.observe(0.042, "/jobs"), 200_000), 3)}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await healthz_us(client, 200)  # warm up
+        timings = {}
+        for enabled in (False, True, False, True):  # interleaved to even out drift
+            metrics.METRICS_ENABLED = enabled
+            timings.setdefault(enabled, []).append(await healthz_us(client, args.requests))
+        off, on = min(timings[False]), min(timings[True])
+    results["request_us"] = {"metrics_off": round(off, 1), "metrics_on": round(on, 1),
+                             "overhead_us": round(on - off, 1), "overhead_pct": round((on - off) / off * 100, 1)}
+
+    plain, timed = sql_us(False, args.queries), sql_us(True, args.queries)
+    results["sql_us"] = {"plain": round(plain, 1), "instrumented": round(timed, 1),
+                         "overhead_us": round(timed - plain, 1)}
+
+    for i in range(args.series):
+        histogram.observe(0.01 * (i % 7), f"/route/{i}")
+    results["render_ms"] = round(per_call_us(metrics.render, 50) / 1000, 2)
+    results["render_bytes"] = len(metrics.render())
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
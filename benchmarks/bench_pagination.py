@@ -0,0 +1,62 @@
+# benchmarks/bench_pagination.py
+"""Page 1 vs page N latency for GET /jobs with OFFSET paging and cursor paging.
+
+Calls main._list_jobs directly (no HTTP, no response cache) against
+DATABASE_URL after seeding --rows synthetic jobs (source 'bench_pagination').
+
+    python -m benchmarks.bench_pagination --rows 200000 --deep-page 1000
+"""
+import argparse, asyncio, json, statistics, time
+from backend.db import async_sessionmaker
+from backend.main import _list_jobs
+from benchmarks.synthetic import seed_jobs, delete_source
+
+BENCH_SOURCE = "bench_pagination"
+
+async def list_jobs(session, q=None, search="substring", source=None, sort=None,
+                    page=1, limit=10, after=None, include_inactive=False):
+    return await _list_jobs(session, q, search, source, sort, page, limit, after, include_inactive)
+
+async def timed(repeat: int, **params) -> dict:
+    samples = []
+    async with async_sessionmaker() as session:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            await list_jobs(session, **params)
+            samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {"p50_ms": round(statistics.median(samples), 2), "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2)}
+
+async def cursor_for_page(page: int, limit: int, sort: str) -> str:
+    # The cursor a client holds after reading page-1 pages
+    async with async_sessionmaker() as session:
+        _, headers = await list_jobs(session, page=page - 1, limit=limit, sort=sort)
+    return headers["X-Next-Cursor"]
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--deep-page", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+    assert args.rows >= args.deep_page * args.limit, "not enough rows for the deep page"
+
+    await seed_jobs(args.rows, BENCH_SOURCE)
+    results = {}
+    for sort in ("posted_at_desc", "posted_at_asc"):
+        deep_cursor = await cursor_for_page(args.deep_page, args.limit, sort)
+        results[sort] = {
+            "offset_page_1": await timed(args.repeat, page=1, limit=args.limit, sort=sort),
+            f"offset_page_{args.deep_page}": await timed(args.repeat, page=args.deep_page, limit=args.limit, sort=sort),
+            "cursor_page_1": await timed(args.repeat, limit=args.limit, sort=sort),
+            f"cursor_page_{args.deep_page}": await timed(args.repeat, after=deep_cursor, limit=args.limit, sort=sort),
+        }
+    print(json.dumps({"rows": args.rows, "limit": args.limit, **results}, indent=2))
+
+    if args.cleanup:
+        await delete_source(BENCH_SOURCE)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+# benchmarks/bench_pdf_extract.py
+"""PDF extraction throughput over a synthetic CV corpus.
+
+Compares the old whole-file PyPDF2 loop (cv_to_keywords before
+backend/extract_cv_text.py) with extract_many() at several pool sizes, and
+reports pages/sec and peak RSS of this process and its pool workers.
+
+    python -m benchmarks.bench_pdf_extract --files 200 --pages 3 --workers 1 4
+"""
+import argparse, os, resource, tempfile, time
+from pathlib import Path
+import PyPDF2
+from backend.extract_cv_text import extract_many
+from benchmarks.synthetic import synthetic_pdf
+
+def legacy_extract(path: Path) -> str:
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return "".join(page.extract_text() for page in reader.pages)
+
+def peak_rss_mb() -> tuple[float, float]:
+    # ru_maxrss is KiB on Linux; children is the largest pool worker
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(own / 1024, 1), round(children / 1024, 1)
+
+def report(label: str, pages: int, elapsed: float):
+    own, children = peak_rss_mb()
+    print(f"{label:<24} {pages:>7} pages  {elapsed:7.2f}s  {pages / elapsed:9.1f} pages/sec"
+          f"  peak RSS {own} MB (workers {children} MB)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_pdf_") as tmp:
+        paths = []
+        for i in range(args.files):
+            path = Path(tmp) / f"cv_{i:05d}.pdf"
+            path.write_bytes(synthetic_pdf(args.pages, seed=i))
+            paths.append(path)
+        total_pages = args.files * args.pages
+        print(f"corpus: {args.files} PDFs x {args.pages} pages")
+
+        t0 = time.perf_counter()
+        for path in paths:
+            legacy_extract(path)
+        report("legacy sequential", total_pages, time.perf_counter() - t0)
+
+        for workers in args.workers:
+            t0 = time.perf_counter()
+            pages = sum(n for _, _, error, n in extract_many(paths, workers=workers) if not error)
+            report(f"extract_many workers={workers}", pages, time.perf_counter() - t0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_scheduler.py
+"""JSearch requests spent on overlapping saved queries: one search_jobs()
+per query (the old way) vs one scheduler tick that dedupes job_ids across
+queries before fetching details.
+
+Runs against the JSearch stub (benchmarks/stubs.py, where half of every
+results page is shared by all queries) with the scheduler on a fake clock,
+so --hours of simulated schedule run in a moment. Needs DATABASE_URL.
+
+    python -m benchmarks.bench_scheduler --queries 12 --pages 2 --hours 6
+"""
+import argparse, asyncio, os
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("RAPIDAPI_KEY", "bench")
+
+from sqlalchemy import text
+from backend.db import async_sessionmaker
+from backend import repo
+from backend.rapidapi_jobs import JSearchClient, RateLimiter, make_client, search_jobs
+from backend.scheduler import Scheduler
+from benchmarks.stubs import serve
+
+QUERY_PREFIX = "bench scheduler"
+
+class FakeClock:
+    """Wall clock for the scheduler that only moves when it sleeps."""
+
+    def __init__(self, start: datetime, until: datetime, on_end):
+        self.now = start
+        self.until = until
+        self.on_end = on_end
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.now += timedelta(seconds=seconds)
+        if self.now >= self.until:
+            self.on_end()
+        await asyncio.sleep(0)
+
+async def cleanup():
+    async with async_sessionmaker() as session:
+        await session.execute(text("delete from saved_query where query like :p"), {"p": f"{QUERY_PREFIX}%"})
+        await session.execute(text("delete from job_post where source = 'JSearch' and title like 'Stub job stub-%'"))
+        await session.commit()
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=12)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--jobs-per-page", type=int, default=10)
+    parser.add_argument("--hours", type=float, default=6)
+    args = parser.parse_args()
+
+    stub = serve(jobs_per_page=args.jobs_per_page)
+    base_url = f"http://127.0.0.1:{stub.server_address[1]}"
+    queries = [f"{QUERY_PREFIX} {i}" for i in range(args.queries)]
+    await cleanup()
+    try:
+        requests = 0
+        async with make_client(base_url) as client:
+            api = JSearchClient(client, limiter=RateLimiter(10_000))
+            for query in queries:
+                await search_jobs(query, args.pages, api=api)
+            requests = api.stats.requests
+        print(f"search_jobs per query:  {requests:>6} requests for {args.queries} queries (one pass)")
+        await cleanup()
+
+        async with async_sessionmaker() as session:
+            for i, query in enumerate(queries):
+                # a mix of hourly and two-hourly queries
+                await repo.save_query(session, query, args.pages, 3600 * (1 + i % 2))
+        start = datetime.now(timezone.utc)
+        async with make_client(base_url) as client:
+            api = JSearchClient(client, limiter=RateLimiter(10_000))
+            ticks = []
+            scheduler = Scheduler(api, poll_interval=600)
+            clock = FakeClock(start, start + timedelta(hours=args.hours), scheduler.stop)
+            scheduler.clock, scheduler.sleep = clock, clock.sleep
+            first = await scheduler.tick()
+            print(f"scheduler, first tick:  {api.stats.requests:>6} requests for {first.queries} queries "
+                  f"({first.duplicates} duplicate job_ids skipped)")
+
+            original_tick = scheduler.tick
+            async def counting_tick():
+                result = await original_tick()
+                if result:
+                    ticks.append(api.stats.requests)
+                return result
+            scheduler.tick = counting_tick
+            await scheduler.run_forever()
+        print(f"scheduler, {args.hours:g}h simulated: {len(ticks)} more ticks, {sum(ticks)} requests")
+    finally:
+        stub.shutdown()
+        await cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+# benchmarks/bench_search.py
+"""Latency comparison for GET /jobs search modes.
+
+Seeds --rows synthetic jobs (source 'bench_search') and reports p50/p95 for
+the substring (ILIKE) and fulltext filters, with the indexes each fulltext
+query was planned through. Needs the 0001_job_post_search migration applied;
+backend/tests/test_search_plan.py checks that the GIN index is usable.
+
+    python -m benchmarks.bench_search --rows 100000
+"""
+import argparse, asyncio, json, statistics, time
+from sqlalchemy import select, desc, func
+from backend.db import async_sessionmaker
+from backend.models import JobPost
+from backend.main import filter_jobs
+from benchmarks.synthetic import seed_jobs, delete_source
+
+BENCH_SOURCE = "bench_search"
+QUERIES = ["python", "senior data", "engineer new york", "recept", "kubernetes remote"]
+
+def build(q, search):
+    stmt, tsquery = filter_jobs(select(JobPost.id), q, search)
+    if tsquery is not None:
+        stmt = stmt.order_by(desc(func.ts_rank(JobPost.search_vector, tsquery)))
+    else:
+        stmt = stmt.order_by(desc(JobPost.posted_at))
+    return stmt.limit(10)
+
+def index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+async def explain(session, stmt) -> dict:
+    # Run EXPLAIN on exactly the SQL SQLAlchemy generates ($n params for asyncpg)
+    compiled = stmt.compile(dialect=session.bind.dialect)
+    params = [compiled.params[name] for name in compiled.positiontup]
+    conn = await session.connection()
+    raw = (await conn.get_raw_connection()).driver_connection
+    plan = await raw.fetchval("explain (format json) " + str(compiled), *params)
+    return json.loads(plan)[0]["Plan"]
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    await seed_jobs(args.rows, BENCH_SOURCE)
+    async with async_sessionmaker() as session:
+        for q in QUERIES:
+            used = index_names(await explain(session, build(q, "fulltext")))
+            print(f"EXPLAIN fulltext {q!r}: {', '.join(sorted(used)) or 'no index'}")
+
+        results = {}
+        for search in ("substring", "fulltext"):
+            samples = []
+            for _ in range(args.repeat):
+                for q in QUERIES:
+                    t0 = time.perf_counter()
+                    await session.execute(build(q, search))
+                    samples.append((time.perf_counter() - t0) * 1000)
+            samples.sort()
+            results[search] = {
+                "p50_ms": round(statistics.median(samples), 2),
+                "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+            }
+        print(json.dumps({"rows": args.rows, **results}, indent=2))
+
+    if args.cleanup:
+        await delete_source(BENCH_SOURCE)
+
+if __name__ == "__main__":
+    asyncio.run(main())
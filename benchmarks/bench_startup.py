@@ -0,0 +1,104 @@
+# benchmarks/bench_startup.py
+"""Cold-start cost of the API and each CLI entry point.
+
+Each module is imported in a fresh `python -X importtime` process, --repeat
+times. Reported per module: median wall time of the whole process, the
+import time of the module itself (cumulative, from importtime), and the
+heaviest top-level dependencies it pulled in. `python -c pass` is the floor.
+
+By default DATABASE_URL and RAPIDAPI_KEY are removed from the child's
+environment (and backend/.env is ignored), which also checks that nothing
+needs them just to import.
+
+    python -m benchmarks.bench_startup --repeat 5 [--keep-env] [--modules backend.main backend.scheduler]
+"""
+import argparse, json, os, statistics, subprocess, sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = [
+    "backend.main",                 # uvicorn backend.main:app
+    "backend.scheduler",
+    "backend.cv_to_keywords",
+    "backend.gmail_ingest",
+    "backend.extract_cv_text",
+    "backend.import_descriptions",
+    "backend.dedup",
+    "backend.matching",
+    "backend.migrate",
+    "backend.db",
+    "backend.utils_normalize",
+]
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, list]]:
+    """module -> (cumulative us, [(cumulative us, child)...]) for each top-level
+    import in -X importtime output; children are listed before their parent."""
+    modules, children = {}, []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            cumulative = int(cumulative)
+        except ValueError:  # the header line
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0:
+            modules[name.strip()] = (cumulative, children)
+            children = []
+        elif depth == 1:
+            children.append((cumulative, name.strip()))
+    return modules
+
+def run_once(module: str, env: dict) -> tuple[float, dict, str]:
+    code = f"import {module}" if module else "pass"
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    error = ""
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+    return wall, parse_importtime(proc.stderr), error
+
+def measure(module: str, env: dict, repeat: int) -> dict:
+    walls, cumulative, error, children = [], [], "", []
+    for _ in range(repeat):
+        wall, modules, error = run_once(module, env)
+        walls.append(wall)
+        if module in modules:
+            cumulative.append(modules[module][0])
+            children = modules[module][1]
+    result = {"wall_ms": round(statistics.median(walls) * 1000, 1)}
+    if cumulative:
+        result["import_ms"] = round(statistics.median(cumulative) / 1000, 1)
+        # the module's direct imports, heaviest first
+        result["heaviest"] = {name: round(us / 1000, 1) for us, name in sorted(children, reverse=True)[:5]}
+    if error:
+        result["error"] = error
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=ENTRY_POINTS)
+    parser.add_argument("--keep-env", action="store_true",
+                        help="keep DATABASE_URL/RAPIDAPI_KEY and load backend/.env")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE="1")
+    if not args.keep_env:
+        for name in ("DATABASE_URL", "RAPIDAPI_KEY"):
+            env.pop(name, None)
+        env["PYTHON_DOTENV_DISABLED"] = "1"
+
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "backend"], cwd=ROOT)  # time imports, not compiles
+    results = {"python -c pass": measure("", env, args.repeat)}
+    for module in args.modules:
+        results[module] = measure(module, env, args.repeat)
+        print(module, results[module], file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
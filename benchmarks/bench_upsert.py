@@ -0,0 +1,74 @@
+# benchmarks/bench_upsert.py
+"""Compare rows/sec of the old per-row UPSERT loop with chunked repo.upsert_jobs.
+
+Runs against DATABASE_URL (backend/.env) and cleans up after itself.
+
+    python -m benchmarks.bench_upsert --rows 5000 --chunk-size 500
+"""
+import argparse, asyncio, time
+from sqlalchemy import text
+from backend.db import async_sessionmaker
+from backend import repo
+from benchmarks.synthetic import synthetic_jobs, delete_source
+
+BENCH_SOURCE = "bench_upsert"
+
+# The pre-batching implementation: one statement (one round trip) per row
+LEGACY_UPSERT_SQL = text("""
+insert into job_post (hash_key, source, title, company, location,
+                      description_snippet, posted_at, canonical_url, salary_text,
+                      first_seen, last_seen, is_active)
+values
+  (:hash_key, :source, :title, :company, :location,
+   :description_snippet, :posted_at, :canonical_url, :salary_text,
+   now(), now(), true)
+on conflict (hash_key) do update
+set title               = excluded.title,
+    company             = excluded.company,
+    location            = excluded.location,
+    description_snippet = excluded.description_snippet,
+    posted_at           = excluded.posted_at,
+    canonical_url       = excluded.canonical_url,
+    salary_text         = excluded.salary_text,
+    last_seen           = now(),
+    is_active           = true
+""")
+
+async def legacy_upsert(session, rows):
+    for r in rows:
+        params = {k: v for k, v in r.items() if k != "description_sections"}
+        await session.execute(LEGACY_UPSERT_SQL, params)
+    await session.commit()
+
+async def cleanup():
+    await delete_source(BENCH_SOURCE)
+
+async def timed(label, fn, rows, fresh=True):
+    if fresh:
+        await cleanup()
+    async with async_sessionmaker() as session:
+        t0 = time.perf_counter()
+        await fn(session, rows)
+        elapsed = time.perf_counter() - t0
+    print(f"{label:<28} {len(rows):>7} rows  {elapsed:8.2f}s  {len(rows) / elapsed:10.0f} rows/sec")
+    return elapsed
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, nargs="+", default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    rows = list(synthetic_jobs(args.rows, source=BENCH_SOURCE))
+    try:
+        await timed("legacy per-row loop", legacy_upsert, rows)
+        for size in args.chunk_size:
+            await timed(f"upsert_jobs chunk={size}",
+                        lambda s, r, size=size: repo.upsert_jobs(s, r, chunk_size=size), rows)
+        # second pass over the same rows exercises the ON CONFLICT update path
+        await timed("upsert_jobs (all conflicts)", repo.upsert_jobs, rows, fresh=False)
+    finally:
+        await cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+# benchmarks/loadgen.py
+"""Closed-loop async load generator for the read API.
+
+--concurrency workers each pick a weighted scenario, send one request, record
+its latency and repeat until --duration is up. Every scenario randomises its
+parameters (search words, pages, ids) from a seeded RNG, so runs are
+repeatable without simply replaying the response cache. Start the server
+with RESPONSE_CACHE_SIZE=0 to measure the uncached paths.
+
+Targets a running server (--base-url) or, by default, the app in-process
+through httpx's ASGI transport. Needs the fixtures from `fixtures()`, which
+reads a few real ids from the database the app is using.
+
+    python -m benchmarks.loadgen --duration 20 --concurrency 16 [--base-url http://127.0.0.1:8000]
+"""
+import argparse, asyncio, json, random, time
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urlencode
+import httpx
+from benchmarks.synthetic import TITLES, WORDS, LOCATIONS
+
+@dataclass
+class Scenario:
+    name: str
+    weight: int
+    path: Callable[[random.Random], str]
+
+def scenarios(fx: dict) -> list[Scenario]:
+    """The request mix; `fx` holds real ids and cursors from fixtures()."""
+    def jobs(**params) -> str:
+        return "/jobs?" + urlencode({k: v for k, v in params.items() if v is not None})
+
+    return [
+        Scenario("jobs_first_page", 20, lambda r: jobs(limit=20, view=r.choice(["full", "card"]))),
+        Scenario("jobs_fulltext", 15, lambda r: jobs(q=r.choice(WORDS + TITLES), search="fulltext", limit=20)),
+        Scenario("jobs_substring", 10, lambda r: jobs(q=r.choice(LOCATIONS), limit=20)),
+        Scenario("jobs_sort_asc", 5, lambda r: jobs(sort="posted_at_asc", page=r.randint(1, 50), limit=20)),
+        Scenario("jobs_deep_offset", 5, lambda r: jobs(page=r.randint(fx["deep_page"] // 2, fx["deep_page"]), limit=20)),
+        Scenario("jobs_deep_cursor", 5, lambda r: jobs(after=r.choice(fx["deep_cursors"]), limit=20)),
+        Scenario("jobs_source", 5, lambda r: jobs(source=fx["source"], page=r.randint(1, 20), limit=20)),
+        Scenario("job_by_id", 20, lambda r: f"/jobs/{r.choice(fx['job_ids'])}"),
+        Scenario("stats", 5, lambda r: "/stats"),
+        Scenario("facets", 5, lambda r: f"/facets?source={fx['source']}"),
+        Scenario("facets_fulltext", 5, lambda r: "/facets?" + urlencode({"q": r.choice(WORDS + TITLES), "search": "fulltext"})),
+        Scenario("job_descriptions", 5, lambda r: f"/job-descriptions?page={r.randint(1, 3)}&limit=20"),
+        Scenario("job_description", 5, lambda r: f"/job-descriptions/{r.choice(fx['filenames'])}"),
+    ]
+
+async def fixtures(source: str, deep_page: int = 500, limit: int = 20) -> dict:
+    """Sample job ids, deep keyset cursors and description filenames to request."""
+    from sqlalchemy import text
+    from backend.db import async_sessionmaker
+    from backend.main import encode_cursor
+    from backend.description_store import description_store
+
+    async with async_sessionmaker() as session:
+        job_ids = (await session.execute(
+            text("select id from job_post where source = :s order by hash_key limit 1000"), {"s": source})).scalars().all()
+        active = await session.scalar(text("select count(*) from job_post where is_active"))
+        deep_page = max(1, min(deep_page, active // limit))
+        rows = (await session.execute(
+            text("""
+                select posted_at, id from job_post where is_active
+                 order by posted_at desc, id desc offset :offset limit 10
+            """),
+            {"offset": (deep_page - 1) * limit},
+        )).all()
+    _, items = await description_store.list(0, 100, ("filename",))
+    return {
+        "source": source,
+        "job_ids": [str(i) for i in job_ids],
+        "deep_page": deep_page,
+        "deep_cursors": [encode_cursor(r.posted_at, r.id) for r in rows] or [""],
+        "filenames": [i["filename"] for i in items] or ["missing.json"],
+    }
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    samples = sorted(latencies)
+
+    def pct(p: float) -> float:
+        return round(samples[min(len(samples) - 1, int(len(samples) * p))] * 1000, 2) if samples else 0.0
+
+    return {"requests": len(samples), "errors": errors, "rps": round(len(samples) / elapsed, 1),
+            "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99),
+            "max_ms": round(samples[-1] * 1000, 2) if samples else 0.0}
+
+async def run_load(client: httpx.AsyncClient, mix: list[Scenario], duration: float,
+                   concurrency: int, seed: int = 0) -> dict:
+    """Drive `mix` for `duration` seconds; returns per-scenario and overall summaries."""
+    latencies = {s.name: [] for s in mix}
+    errors = {s.name: 0 for s in mix}
+    weights = [s.weight for s in mix]
+    deadline = time.perf_counter() + duration
+
+    async def worker(rng: random.Random):
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(mix, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                response = await client.get(scenario.path(rng))
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[scenario.name].append(time.perf_counter() - t0)
+            else:
+                errors[scenario.name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(random.Random(seed * 1000 + i)) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    result = {name: summarize(latencies[name], errors[name], elapsed) for name in latencies}
+    result["_all"] = summarize([x for v in latencies.values() for x in v], sum(errors.values()), elapsed)
+    return result
+
+def make_client(base_url: str | None, concurrency: int) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+    from backend.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=60)
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="running server; default is the app in-process")
+    parser.add_argument("--source", default="bench", help="seeded source to sample job ids from")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mix = scenarios(await fixtures(args.source))
+    async with make_client(args.base_url, args.concurrency) as client:
+        print(json.dumps(await run_load(client, mix, args.duration, args.concurrency, args.seed), indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+# benchmarks/run_suite.py
+"""End-to-end read-path benchmark: seed each scale, drive the API, record results.
+
+For every --scales entry the bench source is topped up to that many rows
+(seed.py; incremental, so 10k -> 100k -> 1M only inserts the difference),
+ANALYZEd, and loadgen.py runs its request mix against it. Results go to
+benchmarks/results/<git sha>.json with sorted keys, so two runs diff cleanly:
+
+    python -m benchmarks.run_suite run --scales 10000,100000,1000000 --duration 30
+    python -m benchmarks.run_suite compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+
+Only point this at a local, disposable database: it writes to job_post.
+"""
+import argparse, asyncio, json, os, platform, subprocess, time
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+def git_commit() -> str:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+async def run(args) -> Path:
+    from sqlalchemy import text
+    from backend.db import get_engine
+    from backend.cache import response_cache
+    from benchmarks import loadgen
+    from benchmarks.seed import seed
+
+    if args.no_cache:
+        response_cache.maxsize = 0
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "target": args.base_url or "in-process",
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "response_cache": not args.no_cache,
+        },
+        "scales": {},
+    }
+    for rows in args.scales:
+        seeded = await seed(rows, args.source)
+        async with get_engine().begin() as conn:
+            await conn.execute(text("ANALYZE job_post"))
+        print(f"seeded {seeded}")
+
+        mix = loadgen.scenarios(await loadgen.fixtures(args.source))
+        async with loadgen.make_client(args.base_url, args.concurrency) as client:
+            await loadgen.run_load(client, mix, args.warmup, args.concurrency, seed=args.seed + 1)
+            t0 = time.perf_counter()
+            result = await loadgen.run_load(client, mix, args.duration, args.concurrency, seed=args.seed)
+        print(f"{rows} rows: {result['_all']} ({time.perf_counter() - t0:.0f}s)")
+        report["scales"][str(rows)] = {"table_rows": seeded["table_rows"], "seed_seconds": seeded["seconds"],
+                                       "endpoints": result}
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{report['meta']['commit']}.json"
+    out.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    print(f"wrote {out}")
+    return out
+
+def compare(a: Path, b: Path):
+    """Print p50/p95/p99 and RPS per scale and endpoint, b relative to a."""
+    before, after = json.loads(a.read_text()), json.loads(b.read_text())
+    print(f"{before['meta']['commit']} -> {after['meta']['commit']}")
+    for scale in sorted(set(before["scales"]) & set(after["scales"]), key=int):
+        print(f"\n{scale} rows")
+        old, new = before["scales"][scale]["endpoints"], after["scales"][scale]["endpoints"]
+        for name in sorted(set(old) & set(new)):
+            cells = []
+            for metric in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+                x, y = old[name][metric], new[name][metric]
+                change = f"{(y - x) / x * 100:+.0f}%" if x else "n/a"
+                cells.append(f"{metric} {x:>8} -> {y:<8} {change:>5}")
+            print(f"  {name:<18} " + "  ".join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run")
+    p.add_argument("--scales", type=lambda s: [int(x) for x in s.split(",")], default=[10_000, 100_000])
+    p.add_argument("--source", default="bench")
+    p.add_argument("--base-url", help="running server; default is the app in-process")
+    p.add_argument("--duration", type=float, default=30)
+    p.add_argument("--warmup", type=float, default=5)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--no-cache", action="store_true", help="disable the in-process response cache")
+    p.add_argument("--out", help="results file (default benchmarks/results/<commit>.json)")
+    c = sub.add_parser("compare")
+    c.add_argument("before", type=Path)
+    c.add_argument("after", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        asyncio.run(run(args))
+    else:
+        compare(args.before, args.after)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# benchmarks/seed.py
+"""Seed job_post with synthetic jobs shaped like backend/job_descriptions/*.json.
+
+Idempotent and incremental: rows are deterministic per index, so seeding
+100k after 10k only inserts the missing 90k (see synthetic.seed_jobs).
+
+    python -m benchmarks.seed --rows 100000 [--source bench] [--reset]
+"""
+import argparse, asyncio, time
+from sqlalchemy import text
+from backend.db import async_sessionmaker
+from benchmarks.synthetic import seed_jobs, delete_source
+
+DEFAULT_SOURCE = "bench"
+
+async def seed(rows: int, source: str = DEFAULT_SOURCE) -> dict:
+    """Make sure `rows` synthetic jobs exist; returns counts and the time it took."""
+    t0 = time.perf_counter()
+    await seed_jobs(rows, source)
+    async with async_sessionmaker() as session:
+        seeded = await session.scalar(text("select count(*) from job_post where source = :s"), {"s": source})
+        total = await session.scalar(text("select count(*) from job_post"))
+    return {"source": source, "rows": seeded, "table_rows": total, "seconds": round(time.perf_counter() - t0, 1)}
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--source", default=DEFAULT_SOURCE)
+    parser.add_argument("--reset", action="store_true", help="delete the source's rows first")
+    args = parser.parse_args()
+    if args.reset:
+        await delete_source(args.source)
+    print(await seed(args.rows, args.source))
+
+if __name__ == "__main__":
+    asyncio.run(main())
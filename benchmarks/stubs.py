@@ -0,0 +1,150 @@
+# benchmarks/stubs.py
+"""Tiny local stand-ins for LM Studio, JSearch and the Gmail API, served from a thread."""
+import json, re, zlib, base64, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+GMAIL_PATH = re.compile(r"^/gmail/v1/users/[^/]+(/.*)$")
+FIRST_HISTORY_ID = 1000
+LLM_REPLY = ["Software", " Engineer"]  # one token per item
+
+class _Handler(BaseHTTPRequestHandler):
+    llm_delay = 0.0
+    jobs_per_page = 0
+    jobs_per_message = 5
+    mailbox: list = []  # fake Gmail messages; a message's history id is FIRST_HISTORY_ID + index
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.path == "/batch/gmail/v1":
+            return self._gmail_batch(body)
+        # OpenAI-compatible chat completion
+        request = json.loads(body or b"{}")
+        prompt_tokens = sum(len(m.get("content", "")) for m in request.get("messages", [])) // 4
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(LLM_REPLY)}
+        if request.get("stream"):
+            return self._llm_stream(usage)
+        time.sleep(self.llm_delay)
+        self._json({"choices": [{"message": {"content": "".join(LLM_REPLY)}}], "usage": usage})
+
+    def _llm_stream(self, usage: dict):
+        """Server-sent events, one delta per token, spread over llm_delay."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for token in LLM_REPLY:
+            time.sleep(self.llm_delay / len(LLM_REPLY))
+            self.wfile.write(b"data: " + json.dumps({"choices": [{"delta": {"content": token}}]}).encode() + b"\n\n")
+            self.wfile.flush()
+        self.wfile.write(b"data: " + json.dumps({"choices": [], "usage": usage}).encode() + b"\n\ndata: [DONE]\n\n")
+        self.close_connection = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path == "/search":
+            page = params.get("page", ["1"])[0]
+            # even slots are shared by every query, odd ones are specific to this query
+            tag = zlib.crc32(params.get("query", [""])[0].encode())
+            data = [{"job_id": f"stub-{page}-{i}" if i % 2 == 0 else f"stub-{tag}-{page}-{i}"}
+                    for i in range(self.jobs_per_page)]
+            self._json({"status": "OK", "data": data})
+        elif url.path == "/job-details":
+            job_id = params.get("job_id", [""])[0]
+            self._json({"status": "OK", "data": [{
+                "job_title": f"Stub job {job_id}", "employer_name": "Stub Co", "job_city": "Nowhere",
+                "job_description": "Build things.\n\nShip things.", "job_apply_link": f"https://example.com/{job_id}",
+            }]})
+        elif m := GMAIL_PATH.match(url.path):
+            self._gmail(m.group(1), params)
+        else:
+            self._json({"status": "ERROR"}, status=404)
+
+    # ---- Gmail ----
+
+    def _history_id(self) -> int:
+        return FIRST_HISTORY_ID + len(self.mailbox) - 1
+
+    def _gmail(self, path: str, params: dict):
+        if path == "/profile":
+            self._json({"emailAddress": "me@example.com", "historyId": str(self._history_id())})
+        elif path == "/messages":
+            start = int(params.get("pageToken", ["0"])[0])
+            end = start + int(params.get("maxResults", ["100"])[0])
+            page = {"messages": [{"id": m["id"], "threadId": m["id"]} for m in self.mailbox[start:end]]}
+            if end < len(self.mailbox):
+                page["nextPageToken"] = str(end)
+            self._json(page)
+        elif path == "/history":
+            start = int(params["startHistoryId"][0])
+            if start < FIRST_HISTORY_ID:
+                return self._json({"error": {"code": 404, "message": "Requested entity was not found."}}, 404)
+            added = self.mailbox[start - FIRST_HISTORY_ID + 1:]
+            history = [{"id": m["historyId"], "messagesAdded": [{"message": {"id": m["id"]}}]} for m in added]
+            self._json({"history": history, "historyId": str(self._history_id())})
+        else:
+            self._json({"error": {"code": 404}}, 404)
+
+    def _gmail_batch(self, body: bytes):
+        by_id = {m["id"]: m for m in self.mailbox}
+        boundary = "batch_stub"
+        out = []
+        for content_id, message_id in re.findall(rb"Content-ID: <([^>]+)>\s+GET \S+/messages/([^?\s]+)", body):
+            message = by_id.get(message_id.decode())
+            status, payload = ("200 OK", json.dumps(message)) if message else ("404 Not Found", "{}")
+            out.append(f"--{boundary}\r\nContent-Type: application/http\r\n"
+                       f"Content-ID: <response-{content_id.decode()}>\r\n\r\n"
+                       f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n\r\n{payload}\r\n")
+        data = ("".join(out) + f"--{boundary}--\r\n").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/mixed; boundary={boundary}")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def fake_alert_message(index: int, jobs: int) -> dict:
+    """A LinkedIn-style job alert email in Gmail's messages.get(format=full) shape."""
+    cards = "".join(
+        f'<tr><td><a href="https://www.linkedin.com/comm/jobs/view/{index * 1000 + j}/?trk=eml-alert">'
+        f'<img src="logo.png"></a><a href="https://www.linkedin.com/comm/jobs/view/{index * 1000 + j}/?trk=eml-title">'
+        f'Stub Engineer {index}-{j}</a><p>Stub Co {j}</p><p>Remote</p></td></tr>'
+        for j in range(jobs)
+    )
+    html = f"<html><body><h1>Your job alert</h1><table>{cards}</table></body></html>"
+    return {
+        "id": f"msg{index:08d}",
+        "historyId": str(FIRST_HISTORY_ID + index),
+        "internalDate": str(1_700_000_000_000 + index * 60_000),
+        "payload": {"mimeType": "multipart/alternative", "parts": [
+            {"mimeType": "text/plain", "body": {"data": base64.urlsafe_b64encode(b"Your job alert").decode()}},
+            {"mimeType": "text/html", "body": {"data": base64.urlsafe_b64encode(html.encode()).decode()}},
+        ]},
+    }
+
+def add_gmail_messages(server: ThreadingHTTPServer, n: int):
+    """Deliver n new job-alert emails to the stub's fake mailbox."""
+    mailbox = server.RequestHandlerClass.mailbox
+    for _ in range(n):
+        mailbox.append(fake_alert_message(len(mailbox), server.RequestHandlerClass.jobs_per_message))
+
+def serve(port: int = 0, llm_delay: float = 0.0, jobs_per_page: int = 0,
+          gmail_messages: int = 0, jobs_per_message: int = 5) -> ThreadingHTTPServer:
+    """Start the stub server in a daemon thread; returns it (see .server_address)."""
+    handler = type("StubHandler", (_Handler,), {"llm_delay": llm_delay, "jobs_per_page": jobs_per_page,
+                                                "jobs_per_message": jobs_per_message, "mailbox": []})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    add_gmail_messages(server, gmail_messages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
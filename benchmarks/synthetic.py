@@ -0,0 +1,109 @@
+# benchmarks/synthetic.py
+"""Deterministic synthetic job rows shaped like backend/job_descriptions/*.json."""
+import random
+from datetime import datetime, timedelta, timezone
+from backend.utils_normalize import make_hash_key
+
+TITLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Frontend Developer",
+          "Python Developer", "DevOps Engineer", "Medical Receptionist", "Product Manager",
+          "QA Analyst", "Machine Learning Engineer", "Site Reliability Engineer", "Data Analyst"]
+SENIORITY = ["", "Junior ", "Senior ", "Lead ", "Staff "]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries",
+             "Wayne Enterprises", "Vandelay", "Soylent", "Cyberdyne", "Tyrell", "Wonka"]
+LOCATIONS = ["New York", "San Francisco", "Austin", "Seattle", "Boston", "Chicago",
+             "Sydney", "Melbourne", "London", "Remote", "Denver", "Toronto"]
+SOURCES = ["JSearch", "seek", "linkedin", "indeed", "gmail"]
+WORDS = ("build maintain design scalable services python sql postgres api cloud aws team "
+         "customers patients schedule data pipelines testing reliability dashboards metrics "
+         "communication ownership mentoring kubernetes docker react typescript analytics").split()
+
+
+def _sentence(rng: random.Random, n: int = 10) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def description_sections(rng: random.Random) -> dict:
+    return {
+        "Responsibilities": [_sentence(rng) for _ in range(rng.randint(3, 9))],
+        "Requirements": [_sentence(rng) for _ in range(rng.randint(2, 6))],
+        "NiceToHaves": [_sentence(rng) for _ in range(rng.randint(0, 7))],
+        "Benefits": [_sentence(rng, 6) for _ in range(rng.randint(0, 3))],
+    }
+
+
+def synthetic_jobs(n: int, seed: int = 0, source: str | None = None, start: int = 0):
+    """Yields n job rows in the shape `repo.upsert_jobs` expects."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    for i in range(start, start + n):
+        src = source or rng.choice(SOURCES)
+        title = rng.choice(SENIORITY) + rng.choice(TITLES)
+        company = rng.choice(COMPANIES)
+        location = rng.choice(LOCATIONS)
+        url = f"https://jobs.example.com/{src}/{i}"
+        sections = description_sections(rng)
+        yield {
+            "hash_key": make_hash_key(src, title, company, location, url),
+            "source": src,
+            "title": title,
+            "company": company,
+            "location": location,
+            "description_snippet": " ".join(sections["Responsibilities"])[:250] + "...",
+            "description_sections": sections,
+            "posted_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+            "canonical_url": url,
+            "salary_text": rng.choice([None, "$90k-$120k", "$120k-$160k", "$40/hr"]),
+        }
+
+
+async def seed_jobs(n: int, source: str, batch: int = 5000):
+    """Make sure at least n synthetic rows with `source` exist in job_post."""
+    from sqlalchemy import text
+    from backend.db import async_sessionmaker
+    from backend import repo
+
+    async with async_sessionmaker() as session:
+        have = await session.scalar(text("select count(*) from job_post where source = :s"), {"s": source})
+        for start in range(have, n, batch):
+            rows = list(synthetic_jobs(min(batch, n - start), seed=start, source=source, start=start))
+            await repo.upsert_jobs(session, rows)
+        await session.execute(text("analyze job_post"))
+        await session.commit()
+
+
+async def delete_source(source: str):
+    from sqlalchemy import text
+    from backend.db import async_sessionmaker
+
+    async with async_sessionmaker() as session:
+        await session.execute(text("delete from job_post where source = :s"), {"s": source})
+        await session.commit()
+
+
+def synthetic_pdf(pages: int, seed: int = 0, lines_per_page: int = 40) -> bytes:
+    """A minimal valid PDF with `pages` pages of Helvetica text, built without a PDF library."""
+    rng = random.Random(seed)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(pages):
+        lines = [rng.choice(TITLES)] + [_sentence(rng) for _ in range(lines_per_page - 1)]
+        text = " T* ".join(f"({line})Tj" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td {text} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref)
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -1,4 +1,4 @@
-import { listJobs, getStats } from "@/lib/api";
+import { listJobs, getStats, getFacets, type JobSort } from "@/lib/api";
 import JobList from "@/components/JobList";
 import JobsToolbar from "@/components/JobsToolbar";
 import Link from "next/link";
@@ -11,16 +11,18 @@ type SP = { [key: string]: string | string[] | undefined };
 export default async function Page({ searchParams }: { searchParams: SP }) {
   const q       = typeof searchParams.q === "string" ? searchParams.q : undefined;
   const source  = typeof searchParams.source === "string" ? searchParams.source : undefined;
-  const sort    = (typeof searchParams.sort === "string" ? searchParams.sort : "posted_at_desc") as "posted_at_desc" | "posted_at_asc";
+  // unset: the API ranks searches by relevance and everything else by date
+  const sort    = typeof searchParams.sort === "string" ? searchParams.sort as JobSort : undefined;
   const pageStr = typeof searchParams.page === "string" ? searchParams.page : "1";
   const limitStr= typeof searchParams.limit === "string" ? searchParams.limit : "10";
 
   const page  = Math.max(1, parseInt(pageStr || "1", 10));
   const limit = Math.min(100, Math.max(1, parseInt(limitStr || "10", 10)));
 
-  const [jobs, stats] = await Promise.all([
-  listJobs({ q, source, sort, page, limit }),
-  getStats()
+  const [jobs, stats, facets] = await Promise.all([
+  listJobs({ q, search: "fulltext", source, sort, page, limit, view: "card" }),
+  getStats(),
+  getFacets({ q, search: "fulltext", source })
   ]);
 
   // server action to refresh after create
@@ -50,13 +52,14 @@ export default async function Page({ searchParams }: { searchParams: SP }) {
         initialSource={source || ""}
         initialSort={sort}
         limit={limit}
+        facets={facets}
       />
       <div className="rounded-lg border bg-white p-3 text-sm text-slate-700">
         <div>Active jobs: <b>{stats.total_active}</b></div>
         <div className="mt-1 flex gap-4 flex-wrap">
           {stats.per_source.map(s => (
             <span key={s.source}>
-              {s.source ?? "(unknown)"}: {s.active_count} • last: {s.last_seen ? new Date(s.last_seen).toLocaleString() : "—"}
+              {s.source || "(unknown)"}: {s.active_count} • last: {s.last_seen ? new Date(s.last_seen).toLocaleString() : "—"}
             </span>
           ))}
         </div>
@@ -1,6 +1,16 @@
 'use client';
 import { useState } from "react";
 import Link from 'next/link';
+import { getCvJob } from "@/lib/api";
+
+const POLL_MS = 1000;
+const STATUS_TEXT: Record<string, string> = {
+  queued: "Queued...",
+  extracting: "Reading your CV...",
+  inferring: "Finding the best job title...",
+  searching: "Searching for jobs...",
+  matching: "Ranking jobs against your CV...",
+};
 
 export default function UploadCV() {
   const [file, setFile] = useState<File | null>(null);
@@ -51,12 +61,34 @@ export default function UploadCV() {
 
     const data = await res.json();
 
-    if (res.ok && data.success) {
-      setStatus("Complete!");
-      setMessage(data.message || "Job search completed successfully.");
-    } else {
+    if (!res.ok || !data.success) {
       setStatus("Failed");
       setError(data.error || "An unknown error occurred.");
+      return;
+    }
+
+    // The backend worker processes the CV in the background; poll until it finishes
+    while (true) {
+      await new Promise((r) => setTimeout(r, POLL_MS));
+      let job;
+      try {
+        job = await getCvJob(data.job_id);
+      } catch (e) {
+        setStatus("Failed");
+        setError("Lost track of the CV job.");
+        return;
+      }
+      if (job.status === "done") {
+        setStatus("Complete!");
+        setMessage(job.message || "Job search completed successfully.");
+        return;
+      }
+      if (job.status === "failed") {
+        setStatus("Failed");
+        setError(job.error || "An unknown error occurred.");
+        return;
+      }
+      setMessage(STATUS_TEXT[job.status] ?? "");
     }
   };
 
@@ -91,7 +123,7 @@ export default function UploadCV() {
               : 'bg-gray-300 text-gray-500 cursor-not-allowed'
           }`}
         >
-          {status === "Processing..." ? "Processing..." : "Upload and Search"}
+          {status === "Processing..." ? (message || "Processing...") : "Upload and Search"}
         </button>
       </div>
 
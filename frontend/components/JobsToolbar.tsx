@@ -2,19 +2,22 @@
 
 import { usePathname, useRouter, useSearchParams } from "next/navigation";
 import { useEffect, useState } from "react";
+import type { FacetsOut, JobSort } from "@/lib/api";
 
 type Props = {
   initialQ?: string;
   initialSource?: string;
-  initialSort?: "posted_at_desc" | "posted_at_asc";
+  initialSort?: JobSort;
   limit?: number;
+  facets?: FacetsOut;
 };
 
 export default function JobsToolbar({
   initialQ = "",
   initialSource = "",
-  initialSort = "posted_at_desc",
+  initialSort,
   limit = 10,
+  facets,
 }: Props) {
   const searchParams = useSearchParams();
   const router = useRouter();
@@ -22,7 +25,7 @@ export default function JobsToolbar({
 
   const [q, setQ] = useState(initialQ);
   const [source, setSource] = useState(initialSource);
-  const [sort, setSort] = useState(initialSort);
+  const [sort, setSort] = useState<JobSort | undefined>(initialSort);
 
   // Debounce search input (400ms)
   useEffect(() => {
@@ -93,26 +96,30 @@ export default function JobsToolbar({
           }}
         >
           <option value="">All sources</option>
-          <option value="seek">seek</option>
-          <option value="linkedin">linkedin</option>
-          <option value="indeed">indeed</option>
+          {(facets?.source ?? []).map((f) => (
+            <option key={f.value} value={f.value}>{f.value} ({f.count})</option>
+          ))}
+          {source && !facets?.source.some((f) => f.value === source) && (
+            <option value={source}>{source} (0)</option>
+          )}
         </select>
         <select
           className="rounded border px-3 py-2 text-sm"
-          value={sort}
+          value={sort ?? (q ? "relevance" : "posted_at_desc")}
           onChange={(e) => {
-            setSort(e.target.value as any);
+            setSort(e.target.value as JobSort);
             updateQuery({ sort: e.target.value, page: "1" });
           }}
         >
+          <option value="relevance" disabled={!q}>Relevance</option>
           <option value="posted_at_desc">Newest</option>
           <option value="posted_at_asc">Oldest</option>
         </select>
         <button
           className="rounded bg-slate-900 px-4 py-2 text-sm text-white"
           onClick={() => {
-            setQ(""); setSource(""); setSort("posted_at_desc");
-            updateQuery({ q: undefined, source: undefined, sort: "posted_at_desc", page: "1" });
+            setQ(""); setSource(""); setSort(undefined);
+            updateQuery({ q: undefined, source: undefined, sort: undefined, page: "1" });
           }}
         >
           Clear
@@ -124,6 +131,19 @@ export default function JobsToolbar({
           Upload CV
         </button>
       </div>
+      {facets && (facets.location.length > 0 || facets.company.length > 0) && (
+        <div className="mt-3 flex flex-wrap gap-2 text-xs text-slate-600">
+          {[...facets.location.slice(0, 5), ...facets.company.slice(0, 5)].map((f, i) => (
+            <button
+              key={`${i}-${f.value}`}
+              className="rounded-full border px-2 py-0.5 hover:bg-slate-100"
+              onClick={() => setQ((cur) => (cur.includes(f.value) ? cur : `${cur} ${f.value}`.trim()))}
+            >
+              {f.value} <span className="text-slate-400">{f.count}</span>
+            </button>
+          ))}
+        </div>
+      )}
       {showUpload && (
         <div className="fixed inset-0 z-50 flex items-center justify-center bg-black bg-opacity-30">
           <div className="bg-white rounded-lg shadow-lg p-6 w-full max-w-md relative">
@@ -9,6 +9,25 @@ export async function getStats(): Promise<StatsOut> {
   return res.json();
 }
 
+export type FacetCount = { value: string; count: number };
+
+export type FacetsOut = {
+  total: number;
+  source: FacetCount[];
+  location: FacetCount[];
+  company: FacetCount[];
+};
+
+export async function getFacets(params: { q?: string; search?: "substring" | "fulltext"; source?: string } = {}): Promise<FacetsOut> {
+  const qs = new URLSearchParams();
+  if (params.q) qs.set("q", params.q);
+  if (params.search) qs.set("search", params.search);
+  if (params.source) qs.set("source", params.source);
+  const res = await fetch(`${API}/facets?${qs.toString()}`, { cache: "no-store" });
+  if (!res.ok) throw new Error("Failed to fetch facets");
+  return res.json();
+}
+
 export type JobPost = {
   id: string;
   source: string;
@@ -22,23 +41,30 @@ export type JobPost = {
   description_sections?: Record<string, string[] | string>;
 };
 
+// relevance only applies to fulltext searches; leave sort unset to get it by default
+export type JobSort = "relevance" | "posted_at_desc" | "posted_at_asc";
+
 const API = process.env.NEXT_PUBLIC_API_URL ?? "http://localhost:8000";
 
 type ListParams = {
   q?: string;
+  search?: "substring" | "fulltext";
   source?: string;
-  sort?: "posted_at_desc" | "posted_at_asc";
+  sort?: JobSort;
   page?: number;
   limit?: number;
+  view?: "full" | "card";
 };
 
 export async function listJobs(params: ListParams = {}): Promise<JobPost[]> {
   const qs = new URLSearchParams();
   if (params.q) qs.set("q", params.q);
+  if (params.search) qs.set("search", params.search);
   if (params.source) qs.set("source", params.source);
   if (params.sort) qs.set("sort", params.sort);
   if (params.page) qs.set("page", String(params.page));
   if (params.limit) qs.set("limit", String(params.limit));
+  if (params.view) qs.set("view", params.view);
 
   const res = await fetch(`${API}/jobs?${qs.toString()}`, { cache: "no-store" });
   if (!res.ok) throw new Error(`Failed to fetch jobs (${res.status})`);
@@ -60,3 +86,18 @@ export async function getJob(id: string): Promise<JobPost> {
   if (!res.ok) throw new Error("Failed to fetch job");
   return res.json();
 }
+
+export type CvJob = {
+  job_id: string;
+  status: "queued" | "extracting" | "inferring" | "searching" | "matching" | "done" | "failed";
+  job_title: string | null;
+  cv_id: string | null;
+  message: string | null;
+  error: string | null;
+};
+
+export async function getCvJob(id: string): Promise<CvJob> {
+  const res = await fetch(`${API}/cv/jobs/${id}`, { cache: "no-store" });
+  if (!res.ok) throw new Error("Failed to fetch CV job");
+  return res.json();
+}